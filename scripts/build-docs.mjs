@@ -11,6 +11,10 @@
  *
  * Uses `make html` which builds all subprojects first, then master docs,
  * ensuring consistent theming via the sphinx-theme submodule.
+ *
+ * With --json it also runs `make json`, whose output in
+ * technical-docs/build/json the PDF generator can read instead of the
+ * rendered HTML (docs_source = "json" in scripts/generate-pdf/config.py).
  */
 
 import { execSync } from 'child_process';
@@ -21,6 +25,7 @@ import { dirname, join } from 'path';
 // Parse command line arguments
 const args = process.argv.slice(2);
 const shouldClean = args.includes('--clean');
+const shouldBuildJson = args.includes('--json');
 
 // Version flag: --version <version> (defaults to 'dev')
 const versionIndex = args.indexOf('--version');
@@ -208,6 +213,27 @@ function buildDocs() {
   return true;
 }
 
+function buildJson() {
+  log('\n🧾 Building Sphinx JSON output for the PDF generator...', colors.blue);
+
+  const sphinxBuild = join(venvBinDir, 'sphinx-build');
+
+  const result = exec(
+    `make json SPHINXBUILD="${sphinxBuild}"`,
+    technicalDocsDir,
+    false,
+    { DOCS_VERSION: docsVersion }
+  );
+
+  if (!result.success) {
+    log('❌ Sphinx JSON build failed', colors.red);
+    return false;
+  }
+
+  log('✓ JSON output written to technical-docs/build/json', colors.green);
+  return true;
+}
+
 function copyOutput() {
   log('\n📋 Copying output to public/docs...', colors.blue);
   
@@ -248,6 +274,7 @@ async function main() {
     { name: 'Install dependencies', fn: installDependencies },
     ...(shouldClean ? [{ name: 'Clean build', fn: cleanBuild }] : []),
     { name: 'Build documentation', fn: buildDocs },
+    ...(shouldBuildJson ? [{ name: 'Build JSON output', fn: buildJson }] : []),
     { name: 'Copy output', fn: copyOutput },
   ];
   
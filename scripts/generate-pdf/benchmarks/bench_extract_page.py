@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark for SphinxExtractor._extract_page.
+
+Compares the single-parse pipeline against the previous three-parse flow
+(parse page, re-parse the content before link rewriting, re-parse again in
+clean_html) on a synthetic Sphinx page, then times the single-parse pipeline
+with every installed HTML parser (lxml, html5lib, html.parser) and the
+tree-free streaming engine (html_engine = "stream").
+
+Usage:
+    python scripts/generate-pdf/benchmarks/bench_extract_page.py [--sections N] [--repeat N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_sphinx_page
+from config import Config
+from extractors.base import HTML_PARSERS, available_html_parsers
+from extractors.sphinx import SphinxExtractor
+
+
+def legacy_extract_html(extractor: SphinxExtractor, html_file: Path) -> str:
+    """Reference implementation of the previous three-parse pipeline."""
+    html = html_file.read_text(encoding="utf-8")
+
+    soup = BeautifulSoup(html, "html.parser")
+    extractor.strip_elements(soup)
+    content = extractor.extract_main_content(soup)
+    extractor._extract_title(soup, content)
+
+    content_soup = BeautifulSoup(str(content), "html.parser")
+    extractor.transform_links(content_soup, html_file)
+
+    return extractor.clean_html(str(content_soup))
+
+
+def _best_of(func, repeat: int) -> float:
+    """Return the fastest of `repeat` timed calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sections", type=int, default=500, help="Sections per page (default: 500)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions (default: 5)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docs_dir = Path(tmp) / "docs"
+        page = docs_dir / "bench" / "page.html"
+        page.parent.mkdir(parents=True)
+        page.write_text(make_sphinx_page(args.sections), encoding="utf-8")
+
+        config = Config()
+        config.paths.docs_dir = docs_dir
+        config.cache.enabled = False
+        config.html_parser = "html.parser"
+        extractor = SphinxExtractor(config)
+
+        single = extractor._extract_page(page, "bench")
+        if single.html_content != legacy_extract_html(extractor, page):
+            print("Error: single-parse output differs from the legacy pipeline")
+            return 1
+
+        legacy_time = _best_of(lambda: legacy_extract_html(extractor, page), args.repeat)
+        single_time = _best_of(lambda: extractor._extract_page(page, "bench"), args.repeat)
+
+        html = page.read_text(encoding="utf-8")
+        parser_times = {}
+        parse_times = {}
+        for name in available_html_parsers():
+            config.html_parser = name
+            parser_extractor = SphinxExtractor(config)
+            if parser_extractor._extract_page(page, "bench").html_content != single.html_content:
+                print(f"Error: {name} output differs from html.parser")
+                return 1
+            parser_times[name] = _best_of(
+                lambda: parser_extractor._extract_page(page, "bench"), args.repeat
+            )
+            parse_times[name] = _best_of(lambda: parser_extractor.parse_html(html), args.repeat)
+
+        config.html_engine = "stream"
+        stream_extractor = SphinxExtractor(config)
+        if stream_extractor._extract_page(page, "bench").html_content != single.html_content:
+            print("Error: stream engine output differs from the DOM engine")
+            return 1
+        stream_time = _best_of(lambda: stream_extractor._extract_page(page, "bench"), args.repeat)
+
+    print(f"Page: {args.sections} sections")
+    print(f"  three-parse pipeline:  {legacy_time * 1000:8.1f} ms")
+    print(f"  single-parse pipeline: {single_time * 1000:8.1f} ms")
+    print(f"  speedup: {legacy_time / single_time:.2f}x")
+
+    print("HTML parsers:          parse only        whole page")
+    for name, elapsed in parser_times.items():
+        parse = parse_times[name]
+        print(
+            f"  {name:<12} {parse * 1000:8.1f} ms {parse_times['html.parser'] / parse:5.2f}x"
+            f"  {elapsed * 1000:8.1f} ms {parser_times['html.parser'] / elapsed:5.2f}x"
+        )
+    missing = [name for name in HTML_PARSERS if name not in parser_times]
+    if missing:
+        print(f"  Not installed: {', '.join(missing)}")
+
+    print("HTML engines:")
+    print(f"  dom (html.parser)  {parser_times['html.parser'] * 1000:8.1f} ms")
+    print(f"  stream             {stream_time * 1000:8.1f} ms "
+          f"{parser_times['html.parser'] / stream_time:5.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark Markdown backends for blog post conversion.
+
+Converts the posts in content/blog (plus synthetic posts, to reach
+--posts) with every installed backend and reports throughput.
+
+Usage:
+    python scripts/generate-pdf/benchmarks/bench_markdown.py [--posts N] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import frontmatter
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import make_blog_post
+from config import Config
+from extractors.markdown_backends import BACKENDS, available_backends, get_backend
+
+
+def load_posts(count: int) -> list[str]:
+    """Markdown bodies of the real blog posts, topped up with synthetic ones."""
+    blog_dir = Config().paths.blog_dir
+    texts = [
+        frontmatter.loads(path.read_text(encoding="utf-8")).content
+        for path in sorted(blog_dir.glob("*.mdx"))
+    ]
+    for index in range(len(texts), count):
+        texts.append(frontmatter.loads(make_blog_post(index, 8, date(2026, 1, 1))).content)
+    return texts[:count] if count else texts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=200, help="Posts to convert per run (default: 200)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions (default: 3)")
+    args = parser.parse_args()
+
+    texts = load_posts(args.posts)
+    size = sum(len(text) for text in texts)
+    print(f"{len(texts)} posts, {size / 1024:.0f} KiB of Markdown")
+
+    missing = [name for name in BACKENDS if name not in available_backends()]
+    if missing:
+        print(f"Not installed: {', '.join(missing)}")
+
+    baseline = None
+    for name in available_backends():
+        backend = get_backend(name)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for text in texts:
+                backend.convert(text)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        baseline = baseline or best
+        print(
+            f"  {name:<16} {best * 1000:8.1f} ms  {len(texts) / best:8.0f} posts/s  "
+            f"{baseline / best:5.2f}x"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark the PDF pipeline on synthetic doc trees of increasing size.
+
+For each scale, generates that many Sphinx pages and MDX blog posts in a
+temporary directory and times SphinxExtractor.extract, BlogExtractor.extract,
+PDFBuilder._build_complete_document and (with WeasyPrint installed, up to
+--pdf-max-scale) PDFBuilder.build. Results are saved as JSON under
+output/benchmarks/ and compared with the previous run (or --baseline);
+stages that got slower than --threshold are flagged and the exit status
+is 1. Runs fully offline with the extraction cache disabled.
+
+Usage:
+    python scripts/generate-pdf/benchmarks/bench_pipeline.py [--scales 10,100,1000,5000]
+        [--repeat N] [--jobs N] [--pdf-max-scale N] [--baseline PATH] [--threshold RATIO]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import generate_blog_dir, generate_docs_tree
+from config import Config
+from extractors.blog import BlogExtractor
+from extractors.sphinx import SphinxExtractor
+from images import ImageOptimizer
+from pdf_builder import WEASYPRINT_AVAILABLE, PDFBuilder
+
+DEFAULT_SCALES = (10, 100, 1000, 5000)
+
+# Timings below this are too noisy to flag as regressions
+MIN_COMPARABLE_SECONDS = 0.01
+
+
+def make_config(root: Path, jobs: int = 1) -> Config:
+    """Config pointing every input and output path at `root`."""
+    config = Config()
+    config.paths.docs_dir = root / "docs"
+    config.paths.blog_dir = root / "blog"
+    config.paths.output_dir = root / "output"
+    config.paths.screenshots_dir = root / "output" / "screenshots"
+    config.paths.cache_dir = root / "output" / "cache"
+    config.cache.enabled = False
+    config.jobs = jobs
+    return config
+
+
+def _best_of(func, repeat: int) -> tuple[float, object]:
+    """Return the fastest of `repeat` timed calls and the last result."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run_scale(scale: int, repeat: int, jobs: int = 1, render_pdf: bool = False) -> dict[str, float]:
+    """Time each pipeline stage on a synthetic tree of `scale` pages and posts."""
+    timings = {}
+    with tempfile.TemporaryDirectory(prefix="bench-pdf-") as tmp:
+        root = Path(tmp)
+        config = make_config(root, jobs)
+        generate_docs_tree(config.paths.docs_dir, scale)
+        generate_blog_dir(config.paths.blog_dir, scale)
+
+        timings["extract_docs"], docs = _best_of(SphinxExtractor(config).extract, repeat)
+        timings["extract_blog"], blog = _best_of(BlogExtractor(config).extract, repeat)
+
+        if WEASYPRINT_AVAILABLE:
+            builder = PDFBuilder(config)
+        else:
+            # HTML assembly needs no WeasyPrint, only the builder's config
+            builder = object.__new__(PDFBuilder)
+            builder.config = config
+            builder.draft = False
+            builder.images = ImageOptimizer(config)
+
+        timings["build_document"], _ = _best_of(
+            lambda: builder._build_complete_document(blog, docs, {}), repeat
+        )
+
+        if render_pdf:
+            timings["build_pdf"], _ = _best_of(
+                lambda: builder.build(blog, docs, {}, config.paths.output_path), 1
+            )
+
+    return timings
+
+
+def compare_results(
+    baseline: dict,
+    current: dict,
+    threshold: float,
+    min_seconds: float = MIN_COMPARABLE_SECONDS,
+) -> list[str]:
+    """Describe every stage that is more than `threshold` times slower."""
+    regressions = []
+    for scale, stages in current["timings"].items():
+        previous = baseline.get("timings", {}).get(scale, {})
+        for stage, seconds in stages.items():
+            before = previous.get(stage)
+            if before is None or max(before, seconds) < min_seconds:
+                continue
+            if seconds > before * threshold:
+                regressions.append(
+                    f"{stage} @ {scale} pages: {before:.3f}s -> {seconds:.3f}s "
+                    f"({seconds / before:.2f}x)"
+                )
+    return regressions
+
+
+def find_previous_result(results_dir: Path) -> Optional[Path]:
+    """Return the most recent saved result, if any."""
+    results = sorted(results_dir.glob("pipeline-*.json"))
+    return results[-1] if results else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        default=",".join(str(scale) for scale in DEFAULT_SCALES),
+        help="Comma-separated page counts (default: 10,100,1000,5000)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions (default: 3)")
+    parser.add_argument("--jobs", type=int, default=1, help="Extraction worker processes (default: 1)")
+    parser.add_argument(
+        "--pdf-max-scale",
+        type=int,
+        default=100,
+        help="Largest scale to render to PDF, 0 to skip (default: 100)",
+    )
+    parser.add_argument("--baseline", type=Path, help="Result to compare against (default: previous run)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Flag stages slower than this ratio of the baseline (default: 1.25)",
+    )
+    parser.add_argument("--results-dir", type=Path, help="Where to save results (default: output/benchmarks)")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    results_dir = args.results_dir or Config().paths.output_dir / "benchmarks"
+    baseline_path = args.baseline or find_previous_result(results_dir)
+
+    if not WEASYPRINT_AVAILABLE:
+        print("WeasyPrint not installed; skipping build_pdf timings")
+
+    timings = {}
+    for scale in scales:
+        render_pdf = WEASYPRINT_AVAILABLE and scale <= args.pdf_max_scale
+        print(f"Scale {scale}...")
+        timings[str(scale)] = run_scale(scale, args.repeat, args.jobs, render_pdf)
+        for stage, seconds in timings[str(scale)].items():
+            print(f"  {stage:<16} {seconds * 1000:10.1f} ms")
+
+    created = datetime.now(timezone.utc)
+    result = {
+        "created": created.isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "jobs": args.jobs,
+        "repeat": args.repeat,
+        "timings": timings,
+    }
+
+    results_dir.mkdir(parents=True, exist_ok=True)
+    result_path = results_dir / f"pipeline-{created.strftime('%Y%m%dT%H%M%SZ')}.json"
+    result_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"\nSaved results: {result_path}")
+
+    if not baseline_path:
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare_results(baseline, result, args.threshold)
+    print(f"Compared with: {baseline_path}")
+    if not regressions:
+        print("  No slowdowns")
+        return 0
+
+    for regression in regressions:
+        print(f"  SLOWER: {regression}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
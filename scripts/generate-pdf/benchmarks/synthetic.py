@@ -0,0 +1,118 @@
+"""
+Synthetic Sphinx HTML trees and MDX blog directories for benchmarks.
+
+Generated content mirrors what the extractors see in the real build
+(Read the Docs navigation, header links, cross references, code blocks,
+frontmatter) so timings scale the way real docs would. Everything is
+deterministic and written locally; nothing is fetched.
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+
+# Subdirectories SphinxExtractor walks, in its processing order
+DOC_SUBDIRS = ("readme", "requirements", "design", "use-cases", "testing", "api", "roadmap")
+
+# Projects to spread pages across; "meta" is left out because only its
+# fixed file list is extracted
+DEFAULT_PROJECTS = ("transfer", "deploy", "whisper")
+
+
+def make_sphinx_page(sections: int, title: str = "Benchmark Page") -> str:
+    """Build a Sphinx-like HTML page with the given number of sections."""
+    body = []
+    for i in range(sections):
+        body.append(f"""
+        <section id="section-{i}">
+          <h2>Section {i}<a class="headerlink" href="#section-{i}">&para;</a></h2>
+          <p>Paragraph   with   <em>inline</em> markup and a
+             <a href="../design/page-{i}.html">cross reference</a>.</p>
+          <p>External <a href="https://example.com/{i}">link</a>.</p>
+          <p>   </p>
+          <pre><code>  fn main() {{
+      println!("{i}");
+  }}</code></pre>
+          <table><tbody><tr><th>Key</th><td>Value {i}</td></tr></tbody></table>
+        </section>""")
+
+    return f"""<!DOCTYPE html>
+<html><head><title>{title} &mdash; Technical Documentation</title></head>
+<body>
+  <nav class="wy-nav-side"><div class="wy-side-nav-search">Nav</div></nav>
+  <div class="wy-breadcrumbs"><a href="#">Home</a></div>
+  <div role="main" class="document"><div itemprop="articleBody">
+    <h1>{title}<a class="headerlink" href="#">&para;</a></h1>
+    {"".join(body)}
+  </div></div>
+  <footer>Footer</footer>
+  <script>var x = 1;</script>
+</body></html>"""
+
+
+def make_blog_post(index: int, paragraphs: int, post_date: date) -> str:
+    """Build an MDX blog post with frontmatter and mixed markdown."""
+    body = []
+    for i in range(paragraphs):
+        body.append(f"""## Part {i}
+
+Paragraph with **bold**, `inline code` and a [link](https://example.com/{index}/{i}).
+
+- First point
+- Second point
+
+```python
+def step_{i}():
+    return {i}
+```
+""")
+
+    return f"""---
+title: "Synthetic Post {index}"
+date: "{post_date.isoformat()}"
+author: "Benchmark Author"
+tags: ["benchmark", "synthetic"]
+excerpt: "Synthetic blog post {index} for benchmarks."
+slug: "synthetic-post-{index}"
+---
+
+{"".join(body)}"""
+
+
+def generate_docs_tree(
+    docs_dir: Path,
+    pages: int,
+    sections_per_page: int = 5,
+    projects: tuple = DEFAULT_PROJECTS,
+) -> list[Path]:
+    """Write `pages` Sphinx pages spread across projects; return their paths."""
+    written = []
+    for i in range(pages):
+        project = projects[i % len(projects)]
+        project_index = i // len(projects)
+        if project_index == 0:
+            page = docs_dir / project / "index.html"
+        else:
+            subdir = DOC_SUBDIRS[project_index % len(DOC_SUBDIRS)]
+            page = docs_dir / project / subdir / f"page-{project_index:05d}.html"
+
+        page.parent.mkdir(parents=True, exist_ok=True)
+        page.write_text(
+            make_sphinx_page(sections_per_page, title=f"{project.title()} Page {project_index}"),
+            encoding="utf-8",
+        )
+        written.append(page)
+    return written
+
+
+def generate_blog_dir(blog_dir: Path, posts: int, paragraphs_per_post: int = 5) -> list[Path]:
+    """Write `posts` dated MDX posts; return their paths."""
+    blog_dir.mkdir(parents=True, exist_ok=True)
+    start = date(2026, 1, 1)
+
+    written = []
+    for i in range(posts):
+        post_date = start - timedelta(days=i)
+        post = blog_dir / f"{post_date.isoformat()}-synthetic-post-{i}.mdx"
+        post.write_text(make_blog_post(i, paragraphs_per_post, post_date), encoding="utf-8")
+        written.append(post)
+    return written
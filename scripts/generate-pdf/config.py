@@ -14,11 +14,18 @@ class Paths:
     """Path configuration for PDF generation."""
     # Input paths (relative to repo root)
     docs_dir: Path = field(default_factory=lambda: Path("public/docs/dev"))
+    # Sphinx json builder output, read when Config.docs_source is "json"
+    # (npm run build-docs -- --json)
+    docs_json_dir: Path = field(default_factory=lambda: Path("technical-docs/build/json"))
     blog_dir: Path = field(default_factory=lambda: Path("content/blog"))
 
     # Output paths
     output_dir: Path = field(default_factory=lambda: Path("output"))
     screenshots_dir: Path = field(default_factory=lambda: Path("output/screenshots"))
+    cache_dir: Path = field(default_factory=lambda: Path("output/cache"))
+
+    # Unix socket of the render daemon (--serve / --daemon)
+    daemon_socket: Path = field(default_factory=lambda: Path("output/pdf-daemon.sock"))
 
     # Default output filename
     output_filename: str = "cleanroom-labs.pdf"
@@ -73,6 +80,17 @@ class Fonts:
     sans: str = "Inter, system-ui, -apple-system, sans-serif"
     mono: str = "Monaco, Menlo, 'Ubuntu Mono', Consolas, monospace"
 
+    # Bundled font files, loaded with @font-face instead of Google Fonts
+    font_dir: Path = field(default_factory=lambda: Path(__file__).resolve().parent / "fonts")
+
+    # (weight, file stem) for each bundled Inter face
+    inter_faces: tuple = (
+        (400, "Inter-Regular"),
+        (500, "Inter-Medium"),
+        (600, "Inter-SemiBold"),
+        (700, "Inter-Bold"),
+    )
+
 
 @dataclass
 class PageLayout:
@@ -121,20 +139,64 @@ class DocOrder:
     )
 
 
+@dataclass
+class ScreenshotTarget:
+    """An element to capture, saved as <name>.png in the screenshots dir."""
+    name: str
+    selector: str  # First match is captured
+    path: str = "/"  # Page to load, relative to the server URL
+    scroll_into_view: bool = False  # Trigger scroll-in animations first
+
+
 @dataclass
 class ScreenshotConfig:
     """Screenshot capture configuration."""
     viewport_width: int = 1440
     viewport_height: int = 900
 
-    # CSS selectors for screenshot targets
-    hero_selector: str = "section"  # First section is hero
-    products_selector: str = "#products"  # Products section
+    # Elements to capture; each gets its own browser context and page
+    targets: tuple = (
+        ScreenshotTarget("hero", "section"),  # First section is hero
+        ScreenshotTarget("products", "#products", scroll_into_view=True),
+    )
+
+    # Names of the targets the PDF templates embed; only these are captured,
+    # and the browser is not started when it is empty
+    embedded: tuple[str, ...] = ()
+
+    # Maximum pages capturing at the same time (all share one browser)
+    concurrency: int = 4
+
+    # Navigation and element wait timeouts
+    timeout_ms: int = 30000
 
     # Default server URL
     server_url: str = "http://localhost:3000"
 
 
+@dataclass
+class CacheConfig:
+    """On-disk cache configuration."""
+    enabled: bool = True
+
+    # Least recently used entries are evicted once the cache exceeds this
+    # size; applies separately to extractions and to optimized images
+    max_bytes: int = 256 * 1024 * 1024
+
+
+@dataclass
+class ImageConfig:
+    """Downsampling of page images before rendering (see images.py)."""
+    enabled: bool = True
+
+    # Resolution of an image printed across the full content width; wider
+    # images are downsampled to it (at least 96, the CSS pixel density)
+    dpi: int = 150
+
+    # Re-encoding quality for JPEG photos
+    jpeg_quality: int = 85
+
+
 @dataclass
 class Config:
     """Main configuration container."""
@@ -145,17 +207,53 @@ class Config:
     selectors: Selectors = field(default_factory=Selectors)
     doc_order: DocOrder = field(default_factory=DocOrder)
     screenshot: ScreenshotConfig = field(default_factory=ScreenshotConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    images: ImageConfig = field(default_factory=ImageConfig)
 
     # Verbose output
     verbose: bool = False
 
+    # Worker processes for page extraction (1 = sequential, 0 = one per CPU)
+    jobs: int = 1
+
+    # Worker processes for laying out PDF chunks in incremental builds
+    # (1 = sequential, 0 = one per CPU; see incremental.py). Ignored, with
+    # a warning, by single-pass builds
+    render_jobs: int = 1
+
+    # Builds the render daemon runs at once (0 = one per CPU)
+    daemon_workers: int = 2
+
+    # Markdown engine for blog posts: "python-markdown", "markdown-it"
+    # (markdown-it-py) or "mistune". Their HTML is equivalent except that
+    # python-markdown only nests lists indented by 4 spaces, while the
+    # CommonMark engines (like the website) also nest 3-space indents
+    markdown_backend: str = "python-markdown"
+
+    # BeautifulSoup parser for docs pages: "auto" (lxml if installed, else
+    # html.parser), "lxml", "html5lib" or "html.parser"
+    html_parser: str = "auto"
+
+    # How docs pages are cleaned: "dom" (parse into a BeautifulSoup tree) or
+    # "stream" (one pass over html.parser events, no tree; same output as
+    # the dom engine with html.parser)
+    html_engine: str = "dom"
+
+    # What docs pages are read from: "html" (the rendered site in docs_dir,
+    # ordered by DocOrder and SphinxExtractor's lists) or "json" (Sphinx's
+    # json builder output in docs_json_dir, ordered by the toctree)
+    docs_source: str = "html"
+
     def __post_init__(self):
         """Resolve paths relative to repo root."""
         self.repo_root = self._find_repo_root()
         self.paths.docs_dir = self.repo_root / self.paths.docs_dir
+        self.paths.docs_json_dir = self.repo_root / self.paths.docs_json_dir
         self.paths.blog_dir = self.repo_root / self.paths.blog_dir
         self.paths.output_dir = self.repo_root / self.paths.output_dir
         self.paths.screenshots_dir = self.repo_root / self.paths.screenshots_dir
+        self.paths.cache_dir = self.repo_root / self.paths.cache_dir
+        self.paths.daemon_socket = self.repo_root / self.paths.daemon_socket
 
     def _find_repo_root(self) -> Path:
         """Find the repository root by looking for CLAUDE.md or .git."""
@@ -0,0 +1,223 @@
+"""
+Render daemon: keep WeasyPrint and the fonts loaded between builds.
+
+`--serve` starts a daemon listening on a Unix socket (Paths.daemon_socket).
+It owns a pool of Config.daemon_workers worker processes. Each worker
+imports WeasyPrint and the extractors, loads the bundled fonts and parses
+the document stylesheet once, when it starts. Builds then run in a warm worker, so they skip the interpreter
+start-up, import and font discovery cost. Requests beyond the pool size
+wait for a free worker. Builds that would write the same output PDF or
+cache directory (which holds the incremental chunks and their state.json)
+run one after another; other builds run side by side.
+
+`--daemon` turns the CLI into a thin client that sends its other arguments
+and working directory to the daemon, prints the build's output and exits
+with its status. Without a running daemon it builds locally instead.
+
+The protocol is one JSON object per line: the client sends
+{"command": "build", "argv": [...], "cwd": "..."} (or "ping"/"stop") and
+the daemon answers {"exit": N, "output": "..."}.
+
+Workers import config.py once; restart the daemon after editing it.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from config import Config, Paths
+
+
+# Client flags that only make sense locally and are not forwarded
+CLIENT_FLAGS = ("--daemon",)
+
+
+def _warm_worker() -> None:
+    """Import the pipeline, load fonts and parse CSS once per worker process."""
+    # main.py imports the stage modules lazily; load them all up front here
+    import extractors.blog  # noqa: F401
+    import extractors.sphinx  # noqa: F401
+    import main  # noqa: F401
+    from pdf_builder import WEASYPRINT_AVAILABLE, PDFBuilder
+
+    if WEASYPRINT_AVAILABLE:
+        # Fills the process-wide font and stylesheet caches later builders reuse
+        PDFBuilder(Config())
+
+
+def run_build(argv: list[str], cwd: str) -> tuple[int, str]:
+    """Run one CLI build inside a worker and return its exit code and output."""
+    import main
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            os.chdir(cwd)
+            code = main.main(argv)
+        except SystemExit as e:  # argparse errors and --help
+            code = e.code if isinstance(e.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    return code, output.getvalue()
+
+
+class RenderDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server that hands build requests to a worker pool."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: Path,
+        executor: Executor,
+        runner: Callable[[list[str], str], tuple[int, str]] = run_build,
+        paths: Optional[Paths] = None,
+    ):
+        self.socket_path = socket_path
+        self.executor = executor
+        self.runner = runner
+        self.paths = paths or Paths()
+        # One lock per output PDF / cache directory a build writes to
+        self._path_locks: dict[Path, threading.Lock] = {}
+        self._path_locks_guard = threading.Lock()
+
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            if is_running(socket_path):
+                raise RuntimeError(f"A daemon is already listening on {socket_path}")
+            socket_path.unlink()  # Left behind by a daemon that was killed
+
+        super().__init__(str(socket_path), _RequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+    def handle_request_message(self, message: dict) -> dict:
+        """Answer one decoded request."""
+        command = message.get("command")
+        if command == "ping":
+            return {"exit": 0, "output": f"PDF daemon running (pid {os.getpid()})\n"}
+        if command == "stop":
+            # shutdown() waits for serve_forever(), so it can't run on this thread
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"exit": 0, "output": "PDF daemon stopping\n"}
+        if command == "build":
+            argv = list(message.get("argv", []))
+            cwd = message.get("cwd") or os.getcwd()
+            with contextlib.ExitStack() as held:
+                for lock in self._locks_for(self.build_paths(argv, cwd)):
+                    held.enter_context(lock)
+                future = self.executor.submit(self.runner, argv, cwd)
+                try:
+                    code, output = future.result()
+                except Exception as e:  # A worker died
+                    return {"exit": 1, "output": f"Error building PDF: {e}\n"}
+            return {"exit": code, "output": output}
+        return {"exit": 2, "output": f"Unknown daemon command: {command}\n"}
+
+    def build_paths(self, argv: list[str], cwd: str) -> list[Path]:
+        """The output PDF and cache directory a build request writes to."""
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--output", type=Path)
+        args, _ = parser.parse_known_args(argv)
+        output_path = args.output or self.paths.output_path
+        return [
+            (Path(cwd) / output_path).resolve(),
+            (Path(cwd) / self.paths.cache_dir).resolve(),
+        ]
+
+    def _locks_for(self, paths: list[Path]) -> list[threading.Lock]:
+        # Sorted, so two builds sharing several paths can't deadlock
+        with self._path_locks_guard:
+            return [self._path_locks.setdefault(path, threading.Lock()) for path in sorted(set(paths))]
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        try:
+            message = json.loads(line)
+        except ValueError:
+            reply = {"exit": 2, "output": "Malformed daemon request\n"}
+        else:
+            reply = self.server.handle_request_message(message)
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+def send_request(socket_path: Path, message: dict, timeout: Optional[float] = None) -> dict:
+    """Send one request to the daemon and return its reply.
+
+    Raises OSError if no daemon is listening.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reply:
+            line = reply.readline()
+    if not line:
+        raise ConnectionError("PDF daemon closed the connection without replying")
+    return json.loads(line)
+
+
+def is_running(socket_path: Path) -> bool:
+    """Whether a daemon answers on the socket."""
+    try:
+        send_request(socket_path, {"command": "ping"}, timeout=5)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def serve(config: Config) -> int:
+    """Run the daemon until interrupted or sent a stop request."""
+    workers = config.daemon_workers if config.daemon_workers > 0 else (os.cpu_count() or 1)
+    socket_path = config.paths.daemon_socket
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as executor:
+        try:
+            server = RenderDaemon(socket_path, executor, paths=config.paths)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return 1
+
+        print(f"PDF daemon listening on {socket_path} with {workers} worker(s)")
+        print("Build with: python -m scripts.generate-pdf --daemon [options]. Press Ctrl+C to stop.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    print("PDF daemon stopped.")
+    return 0
+
+
+def run_client(config: Config, argv: list[str]) -> Optional[int]:
+    """Send a build to the daemon and relay its output.
+
+    Returns None when no daemon is running, so the caller builds locally.
+    """
+    forwarded = [arg for arg in argv if arg not in CLIENT_FLAGS]
+    message = {"command": "build", "argv": forwarded, "cwd": os.getcwd()}
+    try:
+        reply = send_request(config.paths.daemon_socket, message)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+
+    sys.stdout.write(reply.get("output", ""))
+    return int(reply.get("exit", 1))
@@ -1,7 +1,15 @@
 """Content extractors for PDF generation."""
 
-from .base import BaseExtractor, ContentSection
+from .base import BaseExtractor, ContentSection, PostMetadata
 from .blog import BlogExtractor
+from .cache import ExtractionCache
 from .sphinx import SphinxExtractor
 
-__all__ = ["BaseExtractor", "ContentSection", "BlogExtractor", "SphinxExtractor"]
+__all__ = [
+    "BaseExtractor",
+    "ContentSection",
+    "PostMetadata",
+    "BlogExtractor",
+    "SphinxExtractor",
+    "ExtractionCache",
+]
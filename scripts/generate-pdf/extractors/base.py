@@ -2,17 +2,90 @@
 Base extractor class with common functionality.
 """
 
+import importlib
+import os
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from importlib.util import find_spec
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup, Tag
 
+# Parser libraries are imported by resolve_html_parser() once one is chosen
+LXML_AVAILABLE = find_spec("lxml") is not None
+HTML5LIB_AVAILABLE = find_spec("html5lib") is not None
+
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import Config, config as default_config
+from extractors.cache import ExtractionCache
+from extractors.selectors import compile_strip_selectors
+from profiling import NULL_PROFILER, Profiler
+
+
+# BeautifulSoup tree builders that Config.html_parser may name, fastest first
+HTML_PARSERS = ("lxml", "html5lib", "html.parser")
+
+# Tasks BaseExtractor.iter_jobs() keeps submitted per worker process; this
+# bounds how many finished sections wait in memory for a slow consumer
+IN_FLIGHT_PER_WORKER = 4
+
+
+def available_html_parsers() -> list[str]:
+    """Names of the parsers whose library is installed."""
+    installed = {
+        "lxml": LXML_AVAILABLE,
+        "html5lib": HTML5LIB_AVAILABLE,
+        "html.parser": True,
+    }
+    return [name for name in HTML_PARSERS if installed[name]]
+
+
+def resolve_html_parser(name: str) -> str:
+    """Return the parser to use for Config.html_parser.
+
+    "auto" picks lxml when it is installed and html.parser otherwise.
+    """
+    if name == "auto":
+        name = "lxml" if LXML_AVAILABLE else "html.parser"
+    elif name not in HTML_PARSERS:
+        raise ValueError(
+            f"Unknown HTML parser: {name} (choose from auto, {', '.join(HTML_PARSERS)})"
+        )
+    if name == "html.parser":
+        return name
+
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        raise ImportError(
+            f"{name} is required for the {name} HTML parser. "
+            f"Install with: pip install {name}"
+        ) from None
+    return name
+
+
+@dataclass
+class PostMetadata:
+    """Blog post frontmatter, parsed once at extraction time."""
+    date: str = ""  # ISO "YYYY-MM-DD", or "" if missing
+    author: str = ""
+    tags: list[str] = field(default_factory=list)
+    slug: str = ""
+    excerpt: str = ""
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PostMetadata":
+        return cls(**data)
 
 
 @dataclass
@@ -25,6 +98,8 @@ class ContentSection:
     source_path: Optional[Path] = None
     anchor: Optional[str] = None
     children: list["ContentSection"] = field(default_factory=list)
+    metadata: Optional[PostMetadata] = None  # Set for blog posts
+    images: list[Path] = field(default_factory=list)  # Local images the HTML references
 
     @property
     def anchor_id(self) -> str:
@@ -34,23 +109,183 @@ class ContentSection:
         # Convert title to anchor-friendly format
         return self.id.replace("/", "-").replace(".", "-").lower()
 
+    def to_dict(self) -> dict:
+        """Serialize to a JSON-compatible dict (used by the extraction cache)."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "html_content": self.html_content,
+            "level": self.level,
+            "source_path": str(self.source_path) if self.source_path else None,
+            "anchor": self.anchor,
+            "children": [child.to_dict() for child in self.children],
+            "metadata": self.metadata.to_dict() if self.metadata else None,
+            "images": [str(image) for image in self.images],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ContentSection":
+        """Rebuild a section serialized with to_dict()."""
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            html_content=data["html_content"],
+            level=data["level"],
+            source_path=Path(data["source_path"]) if data["source_path"] else None,
+            anchor=data["anchor"],
+            children=[cls.from_dict(child) for child in data["children"]],
+            metadata=PostMetadata.from_dict(data["metadata"]) if data.get("metadata") else None,
+            images=[Path(image) for image in data.get("images", [])],
+        )
+
+
+# Per-process extractor used by worker processes in BaseExtractor.map_jobs()
+_worker_extractor: Optional["BaseExtractor"] = None
+
+
+def _init_worker(extractor_cls: type, config: Config, state: Any = None) -> None:
+    """Create the extractor a worker process reuses for all its tasks.
+
+    `state` is the parent extractor's worker_state(), if it has any.
+    """
+    global _worker_extractor
+    _worker_extractor = extractor_cls(config)
+    if state is not None:
+        _worker_extractor.restore_worker_state(state)
+
+
+def _run_in_worker(method_name: str, args: tuple) -> Any:
+    """Call an extractor method inside a worker process."""
+    return getattr(_worker_extractor, method_name)(*args)
+
 
 class BaseExtractor(ABC):
     """Base class for content extractors."""
 
-    def __init__(self, config: Optional[Config] = None):
+    # Bump when a change alters extracted output, invalidating cached sections
+    VERSION = "1"
+
+    def __init__(self, config: Optional[Config] = None, profiler: Optional[Profiler] = None):
         self.config = config or default_config
+        self.profiler = profiler or NULL_PROFILER
+        self.html_parser = resolve_html_parser(self.config.html_parser)
+        self.cache = ExtractionCache(
+            self.config, type(self).__name__, self.VERSION, self.cache_salt()
+        )
+        # Local images referenced since the last reset (see image_source())
+        self.page_images: list[Path] = []
+
+    def cache_salt(self) -> tuple[str, ...]:
+        """Settings besides selectors that change this extractor's output."""
+        return ()
+
+    def worker_state(self) -> Any:
+        """State built in this process that worker processes reuse, or None.
+
+        Passed to restore_worker_state() in each worker of map_jobs() and
+        iter_jobs(), so workers don't rebuild it. Must be picklable.
+        """
+        return None
+
+    def restore_worker_state(self, state: Any) -> None:
+        """Adopt the parent's worker_state() in a worker process."""
+
+    def parse_html(self, html: str) -> BeautifulSoup:
+        """Parse an HTML document with the configured parser."""
+        return BeautifulSoup(html, self.html_parser)
 
     @abstractmethod
     def extract(self) -> list[ContentSection]:
         """Extract content and return list of sections."""
         pass
 
+    def iter_extract(self) -> Iterator[ContentSection]:
+        """Yield the sections of extract() in order, as they are extracted.
+
+        The default extracts everything first; extractors that know their
+        order up front override it, so consumers can start on the first
+        sections while later ones are still being extracted.
+        """
+        yield from self.extract()
+
+    @property
+    def jobs(self) -> int:
+        """Number of worker processes to use (resolves 0 to the CPU count)."""
+        jobs = self.config.jobs
+        if jobs <= 0:
+            return os.cpu_count() or 1
+        return jobs
+
+    def map_jobs(self, method_name: str, arg_tuples: list[tuple]) -> list[Any]:
+        """Call a method once per argument tuple, fanning out to a process pool.
+
+        Results are returned in the same order as arg_tuples regardless of
+        which worker finishes first. Falls back to a plain loop when only
+        one job is configured or there is at most one task.
+        """
+        jobs = min(self.jobs, len(arg_tuples))
+        if jobs <= 1:
+            method = getattr(self, method_name)
+            return [method(*args) for args in arg_tuples]
+
+        if self.config.verbose:
+            print(f"  Using {jobs} worker processes")
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(type(self), self.config, self.worker_state()),
+        ) as executor:
+            chunksize = max(1, len(arg_tuples) // (jobs * 4))
+            return list(executor.map(
+                partial(_run_in_worker, method_name), arg_tuples, chunksize=chunksize
+            ))
+
+    def iter_jobs(self, method_name: str, arg_tuples: list[tuple]) -> Iterator[Any]:
+        """Like map_jobs(), but yield each result as soon as it is next in order.
+
+        With a process pool, only IN_FLIGHT_PER_WORKER tasks per worker are
+        submitted ahead of the consumer, so a consumer that stops early or
+        falls behind never has the whole list of results in memory.
+        """
+        jobs = min(self.jobs, len(arg_tuples))
+        if jobs <= 1:
+            method = getattr(self, method_name)
+            for args in arg_tuples:
+                yield method(*args)
+            return
+
+        if self.config.verbose:
+            print(f"  Using {jobs} worker processes")
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(type(self), self.config, self.worker_state()),
+        ) as executor:
+            tasks = iter(arg_tuples)
+            pending = deque(
+                executor.submit(_run_in_worker, method_name, args)
+                for args in islice(tasks, jobs * IN_FLIGHT_PER_WORKER)
+            )
+            try:
+                while pending:
+                    result = pending.popleft().result()
+                    for args in islice(tasks, 1):
+                        pending.append(executor.submit(_run_in_worker, method_name, args))
+                    yield result
+            finally:
+                # Abandoned early: don't run tasks nobody will read
+                for future in pending:
+                    future.cancel()
+
     def strip_elements(self, soup: BeautifulSoup) -> BeautifulSoup:
-        """Remove navigation and non-content elements from HTML."""
-        for selector in self.config.selectors.strip:
-            for element in soup.select(selector):
-                element.decompose()
+        """Remove navigation and non-content elements from HTML.
+
+        The strip selectors are compiled once and matched in a single walk
+        over the tree (see extractors/selectors.py).
+        """
+        compile_strip_selectors(tuple(self.config.selectors.strip)).strip(soup)
         return soup
 
     def extract_main_content(self, soup: BeautifulSoup) -> Optional[Tag]:
@@ -67,54 +302,76 @@ class BaseExtractor(ABC):
 
         return None
 
-    def transform_links(self, soup: BeautifulSoup, base_path: Path) -> BeautifulSoup:
-        """Transform internal links to PDF anchors and fix image paths."""
+    def transform_links(self, soup: Tag, base_path: Path) -> Tag:
+        """Transform internal links to PDF anchors and fix image paths.
+
+        Works on a whole document or on any subtree, modifying it in place.
+        """
         # Transform internal links to anchors
         for link in soup.find_all("a", href=True):
             href = link["href"]
 
-            # Skip external links and anchors
-            if href.startswith(("http://", "https://", "mailto:", "#")):
-                # Mark external links with arrow
-                if href.startswith(("http://", "https://")):
-                    if not link.string or "↗" not in link.get_text():
-                        link.append(" ↗")
-                continue
-
-            # Transform internal links to PDF anchors
-            # Remove .html extension and convert path to anchor
-            clean_href = href.replace(".html", "").replace("/", "-").replace("..", "")
-            if clean_href.startswith("-"):
-                clean_href = clean_href[1:]
-            link["href"] = f"#{clean_href}"
+            # Mark external links with arrow
+            if href.startswith(("http://", "https://")):
+                if not link.string or "↗" not in link.get_text():
+                    link.append(" ↗")
+
+            link["href"] = self.link_target(href)
 
         # Fix image paths to absolute file:// URLs
         for img in soup.find_all("img", src=True):
-            src = img["src"]
-
-            # Skip data URIs and absolute URLs
-            if src.startswith(("data:", "http://", "https://")):
-                continue
-
-            # Resolve relative path
-            if src.startswith("/"):
-                # Absolute path from docs root
-                abs_path = self.config.paths.docs_dir / src.lstrip("/")
-            else:
-                # Relative path from current file
-                abs_path = (base_path.parent / src).resolve()
-
-            # Convert to file:// URL
-            if abs_path.exists():
-                img["src"] = f"file://{abs_path}"
-            elif self.config.verbose:
-                print(f"  Warning: Image not found: {abs_path}")
+            img["src"] = self.image_source(img["src"], base_path)
 
         return soup
 
-    def clean_html(self, html: str) -> str:
-        """Clean and normalize HTML content."""
-        soup = BeautifulSoup(html, "html.parser")
+    def link_target(self, href: str) -> str:
+        """Return the PDF anchor for an internal link; other links are unchanged."""
+        # Skip external links and anchors
+        if href.startswith(("http://", "https://", "mailto:", "#")):
+            return href
+
+        # Remove .html extension and convert path to anchor
+        clean_href = href.replace(".html", "").replace("/", "-").replace("..", "")
+        if clean_href.startswith("-"):
+            clean_href = clean_href[1:]
+        return f"#{clean_href}"
+
+    def image_source(self, src: str, base_path: Path) -> str:
+        """Return the file:// URL of a local image; other sources are unchanged."""
+        # Skip data URIs and absolute URLs
+        if src.startswith(("data:", "http://", "https://")):
+            return src
+
+        # Resolve relative path
+        if src.startswith("/"):
+            # Absolute path from docs root
+            abs_path = self.config.paths.docs_dir / src.lstrip("/")
+        else:
+            # Relative path from current file
+            abs_path = self.resolve_local(base_path.parent / src)
+        self.page_images.append(abs_path)
+
+        # Convert to file:// URL
+        if self.local_file_exists(abs_path):
+            return f"file://{abs_path}"
+        if self.config.verbose:
+            print(f"  Warning: Image not found: {abs_path}")
+        return src
+
+    def resolve_local(self, path: Path) -> Path:
+        """Make a local file path absolute, following symlinks."""
+        return path.resolve()
+
+    def local_file_exists(self, path: Path) -> bool:
+        """Whether a local file referenced by a page exists."""
+        return path.exists()
+
+    def clean_tree(self, soup: Tag) -> Tag:
+        """Remove empty paragraphs and excessive whitespace in place."""
+        # Merge adjacent text nodes left behind by earlier passes (decomposed
+        # elements, appended link arrows) so whitespace is collapsed exactly
+        # as it would be after re-parsing the serialized HTML.
+        soup.smooth()
 
         # Remove empty paragraphs
         for p in soup.find_all("p"):
@@ -128,4 +385,18 @@ class BaseExtractor(ABC):
                 if cleaned != text:
                     text.replace_with(cleaned)
 
-        return str(soup)
+        return soup
+
+    def clean_html(self, html: str) -> str:
+        """Clean and normalize an HTML string.
+
+        Convenience wrapper around clean_tree() for callers that only have
+        serialized HTML. Extractors that already hold a parsed tree should
+        call clean_tree() directly to avoid a second parse.
+        """
+        soup = self.parse_html(html)
+
+        # lxml and html5lib wrap fragments in <html><body>; html.parser doesn't
+        root = soup.body if soup.body is not None and "<body" not in html else soup
+        self.clean_tree(root)
+        return root.decode_contents() if root is not soup else str(soup)
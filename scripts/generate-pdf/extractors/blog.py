@@ -2,39 +2,31 @@
 Blog post extractor for MDX files.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from typing import Optional
 
 import frontmatter
-import markdown
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import Config, config as default_config
-from extractors.base import BaseExtractor, ContentSection
+from extractors.base import BaseExtractor, ContentSection, PostMetadata
+from extractors.markdown_backends import get_backend
+from profiling import Profiler
 
 
 class BlogExtractor(BaseExtractor):
     """Extract blog posts from MDX files."""
 
-    def __init__(self, config: Optional[Config] = None):
-        super().__init__(config)
-        self.md = markdown.Markdown(
-            extensions=[
-                "fenced_code",
-                "tables",
-                "toc",
-                "codehilite",
-                "nl2br",
-            ],
-            extension_configs={
-                "codehilite": {
-                    "css_class": "highlight",
-                    "guess_lang": False,
-                }
-            },
-        )
+    VERSION = "2"  # Sections carry PostMetadata
+
+    def __init__(self, config: Optional[Config] = None, profiler: Optional[Profiler] = None):
+        super().__init__(config, profiler)
+        self.markdown = get_backend(self.config.markdown_backend)
+
+    def cache_salt(self) -> tuple[str, ...]:
+        return (self.config.markdown_backend,)
 
     def extract(self) -> list[ContentSection]:
         """Extract all blog posts, sorted by date (newest first)."""
@@ -45,73 +37,95 @@ class BlogExtractor(BaseExtractor):
                 print(f"Blog directory not found: {self.config.paths.blog_dir}")
             return posts
 
-        for mdx_file in sorted(self.config.paths.blog_dir.glob("*.mdx")):
-            section = self._extract_post(mdx_file)
+        # Posts are independent, so they can be extracted in parallel
+        for section in self.map_jobs("_extract_post", [(path,) for path in self.list_posts()]):
             if section:
                 posts.append(section)
 
-        # Sort by date (newest first) - date is stored in metadata
-        posts.sort(key=lambda p: p.source_path.stem if p.source_path else "", reverse=True)
+        self.cache.evict()
+
+        return self.sort_posts(posts)
 
-        # Re-sort by actual date from frontmatter
-        posts_with_dates = []
-        for post in posts:
-            date_str = self._get_post_date(post)
-            posts_with_dates.append((date_str, post))
+    def list_posts(self) -> list[Path]:
+        """Return the MDX files in the blog directory."""
+        return sorted(self.config.paths.blog_dir.glob("*.mdx"))
 
-        posts_with_dates.sort(key=lambda x: x[0], reverse=True)
-        return [post for _, post in posts_with_dates]
+    def sort_posts(self, posts: list[ContentSection]) -> list[ContentSection]:
+        """Sort posts by date, newest first, using the metadata parsed at extraction."""
+        # Filename order breaks ties between posts with the same date
+        posts = sorted(posts, key=lambda p: p.source_path.stem if p.source_path else "", reverse=True)
+        return sorted(posts, key=self._get_post_date, reverse=True)
 
     def _get_post_date(self, post: ContentSection) -> str:
-        """Extract date from post for sorting."""
-        # Parse the original file to get date
-        if post.source_path and post.source_path.exists():
-            try:
-                with open(post.source_path, "r", encoding="utf-8") as f:
-                    fm = frontmatter.load(f)
-                    return fm.get("date", "1970-01-01")
-            except Exception:
-                pass
+        """Return the post's date for sorting."""
+        if post.metadata and post.metadata.date:
+            return post.metadata.date
         return "1970-01-01"
 
     def _extract_post(self, mdx_file: Path) -> Optional[ContentSection]:
         """Extract a single blog post from an MDX file."""
         try:
-            with open(mdx_file, "r", encoding="utf-8") as f:
-                post = frontmatter.load(f)
+            data = mdx_file.read_bytes()
+        except Exception as e:
+            if self.config.verbose:
+                print(f"Error reading {mdx_file}: {e}")
+            return None
+
+        cache_key = self.cache.key(mdx_file, data)
+        cached = self.cache.get(cache_key, mdx_file)
+        if cached:
+            return ContentSection.from_dict(cached)
+
+        try:
+            post = frontmatter.loads(data.decode("utf-8"))
         except Exception as e:
             if self.config.verbose:
                 print(f"Error parsing {mdx_file}: {e}")
             return None
 
         title = post.get("title", mdx_file.stem)
-        date = post.get("date", "")
-        author = post.get("author", "")
-        tags = post.get("tags", [])
-        slug = post.get("slug", mdx_file.stem)
-        excerpt = post.get("excerpt", "")
-
-        # Reset markdown instance for clean conversion
-        self.md.reset()
+        metadata = PostMetadata(
+            date=self._normalize_date(post.get("date", "")),
+            author=post.get("author", ""),
+            tags=list(post.get("tags") or []),
+            slug=post.get("slug", mdx_file.stem),
+            excerpt=post.get("excerpt", ""),
+        )
 
         # Convert markdown content to HTML
-        html_content = self.md.convert(post.content)
+        html_content = self.markdown.convert(post.content)
 
         # Build the full HTML with metadata header
-        metadata_html = self._build_metadata_html(title, date, author, tags, excerpt)
+        metadata_html = self._build_metadata_html(
+            title, metadata.date, metadata.author, metadata.tags, metadata.excerpt
+        )
         full_html = f"{metadata_html}\n{html_content}"
 
         if self.config.verbose:
             print(f"  Extracted blog post: {title}")
 
-        return ContentSection(
-            id=f"blog-{slug}",
+        section = ContentSection(
+            id=f"blog-{metadata.slug}",
             title=title,
             html_content=full_html,
             level=1,
             source_path=mdx_file,
-            anchor=f"blog-{slug}",
+            anchor=f"blog-{metadata.slug}",
+            metadata=metadata,
         )
+        self.cache.put(cache_key, section.to_dict())
+        return section
+
+    @staticmethod
+    def _normalize_date(value) -> str:
+        """Return a frontmatter date as "YYYY-MM-DD" text.
+
+        YAML turns unquoted dates into date/datetime objects while quoted
+        ones stay strings; both must sort and format the same way.
+        """
+        if isinstance(value, (date, datetime)):
+            return value.strftime("%Y-%m-%d")
+        return str(value) if value else ""
 
     def _build_metadata_html(
         self,
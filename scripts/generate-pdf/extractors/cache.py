@@ -0,0 +1,142 @@
+"""
+Persistent content-addressed cache for extracted sections.
+
+Entries are keyed by a hash of the source file contents together with
+everything else that influences the extracted output (extractor name and
+version, strip/content selectors, source location), so a changed file,
+a changed selector or a bumped extractor version all produce a miss.
+Extractors add their own output-affecting settings through `extra`.
+
+Keys do not cover the images a page references, so SphinxExtractor does
+not store pages whose images are missing, and re-extracts a cached page
+whose images have been removed since.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import astuple
+from pathlib import Path
+from typing import Optional
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import Config
+
+
+def evict_lru(directory: Path, pattern: str, max_bytes: int) -> int:
+    """Remove the least recently modified files matching `pattern` until
+    the rest fit in `max_bytes`. Returns the number of files removed.
+
+    Callers mark entries as used by touching them (os.utime).
+    """
+    entries = []
+    total = 0
+    for path in directory.glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+class ExtractionCache:
+    """On-disk cache of extracted sections, stored as JSON under output/."""
+
+    def __init__(self, config: Config, namespace: str, version: str, extra: tuple = ()):
+        self.config = config
+        self.namespace = namespace
+        self.version = version
+        self.enabled = config.cache.enabled
+        self.cache_dir = config.paths.cache_dir / "extract"
+
+        # Everything except the file itself that affects extraction output
+        self._salt = "\n".join([
+            namespace,
+            version,
+            repr(astuple(config.selectors)),
+            str(config.paths.docs_dir),
+            *extra,
+        ]).encode("utf-8")
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of everything besides the source file that goes into keys."""
+        return hashlib.sha256(self._salt).hexdigest()
+
+    def key(self, source_path: Path, data: bytes) -> str:
+        """Return the cache key for a source file's contents."""
+        digest = hashlib.sha256(self._salt)
+        digest.update(b"\0")
+        digest.update(str(source_path).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str, source_path: Path) -> Optional[dict]:
+        """Load a cached entry, or return None on a miss."""
+        if not self.enabled:
+            return None
+
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            if self.config.verbose:
+                print(f"    Cache miss: {source_path.name}")
+            return None
+
+        # Mark as recently used so eviction drops colder entries first
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        if self.config.verbose:
+            print(f"    Cache hit: {source_path.name}")
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """Store an entry, writing atomically so concurrent workers are safe."""
+        if not self.enabled:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(key)
+        temp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            if self.config.verbose:
+                print(f"    Warning: Could not write cache entry: {e}")
+            temp_path.unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """Remove least recently used entries until under the size cap.
+
+        Returns the number of entries removed.
+        """
+        if not self.enabled:
+            return 0
+
+        removed = evict_lru(self.cache_dir, "*.json", self.config.cache.max_bytes)
+        if removed and self.config.verbose:
+            print(f"  Evicted {removed} cache entr{'y' if removed == 1 else 'ies'}")
+
+        return removed
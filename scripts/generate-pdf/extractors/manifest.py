@@ -0,0 +1,205 @@
+"""
+Manifest of the docs tree, built with one os.scandir walk.
+
+SphinxExtractor asks the manifest which pages, directories and images
+exist instead of calling exists()/is_dir()/glob() for every candidate,
+which costs thousands of stat calls per build on a large docs tree.
+
+The manifest is saved in output/cache between runs together with the
+extraction cache key of every page and the images it references, so a page
+whose size and mtime are unchanged, like those of its images, is served
+from the extraction cache without being read or hashed.
+
+Lookups are lexical, so they only agree with the filesystem when there are
+no symlinks in the tree. With symlinks, and for paths outside the root,
+they fall back to asking the filesystem.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+# Bump when the saved format changes
+MANIFEST_VERSION = "2"
+
+
+class DocsManifest:
+    """Every file and directory under a root, with (mtime_ns, size) per file."""
+
+    def __init__(
+        self,
+        root: Path,
+        files: dict[str, tuple[int, int]],
+        dirs: set[str],
+        symlinks: bool = False,
+        keys: Optional[dict[str, str]] = None,
+        images: Optional[dict[str, list[str]]] = None,
+    ):
+        self.root = root
+        # Paths relative to root, "/"-separated; the root itself is ""
+        self.files = files
+        self.dirs = dirs
+        self.symlinks = symlinks
+        # Page -> extraction cache key, for the pages extracted last run
+        self.keys = keys if keys is not None else {}
+        # Page -> the images it referenced then, for pages that have any
+        self.images = images if images is not None else {}
+
+        self._root_str = os.path.normpath(root)
+        self._children: Optional[dict[str, list[str]]] = None
+
+    @classmethod
+    def scan(cls, root: Path) -> "DocsManifest":
+        """Walk the tree under `root` once; a missing root gives an empty manifest."""
+        files = {}
+        dirs = set()
+        symlinks = Path(os.path.realpath(root)) != Path(os.path.abspath(root))
+
+        pending = [("", os.fspath(root))]
+        while pending:
+            prefix, directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    dirs.add(prefix.rstrip("/"))
+                    for entry in entries:
+                        name = prefix + entry.name
+                        if entry.is_symlink():
+                            # Not followed, like os.walk; lookups fall back to the filesystem
+                            symlinks = True
+                        elif entry.is_dir():
+                            pending.append((name + "/", entry.path))
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files[name] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+
+        return cls(root, files, dirs, symlinks)
+
+    @classmethod
+    def load(cls, path: Path, root: Path, fingerprint: str) -> Optional["DocsManifest"]:
+        """Load a saved manifest of `root`.
+
+        Returns None if there is none, or it was saved for another root or
+        another extraction cache fingerprint (whose keys would not match).
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            data.get("version") != MANIFEST_VERSION
+            or data.get("root") != str(root)
+            or data.get("fingerprint") != fingerprint
+        ):
+            return None
+
+        files = {name: (mtime, size) for name, (mtime, size) in data["files"].items()}
+        return cls(
+            root, files, set(data["dirs"]), data["symlinks"], data["keys"], data["images"]
+        )
+
+    def save(self, path: Path, fingerprint: str) -> None:
+        """Write the manifest atomically."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "root": str(self.root),
+            "fingerprint": fingerprint,
+            "symlinks": self.symlinks,
+            "dirs": sorted(self.dirs),
+            "files": self.files,
+            "keys": self.keys,
+            "images": self.images,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    def relative(self, path: Path) -> Optional[str]:
+        """The manifest name of `path`, or None if it is outside the root."""
+        normalized = os.path.normpath(path)
+        if normalized == self._root_str:
+            return ""
+        if normalized.startswith(self._root_str + os.sep):
+            return normalized[len(self._root_str) + 1:].replace(os.sep, "/")
+        return None
+
+    def _lookup(self, path: Path) -> Optional[str]:
+        """Like relative(), but None whenever the filesystem must be asked instead."""
+        return None if self.symlinks else self.relative(path)
+
+    def is_file(self, path: Path) -> bool:
+        name = self._lookup(path)
+        return path.is_file() if name is None else name in self.files
+
+    def is_dir(self, path: Path) -> bool:
+        name = self._lookup(path)
+        return path.is_dir() if name is None else name in self.dirs
+
+    def resolve(self, path: Path) -> Path:
+        """Path.resolve(), without touching the filesystem inside the root."""
+        if self._lookup(path) is None:
+            return path.resolve()
+        return Path(os.path.normpath(path))
+
+    def files_in(self, directory: Path, suffix: str) -> list[Path]:
+        """Files directly inside `directory` ending with `suffix`, sorted by name."""
+        name = self._lookup(directory)
+        if name is None:
+            return sorted(path for path in directory.glob(f"*{suffix}") if path.is_file())
+
+        if self._children is None:
+            self._children = {}
+            for file_name in self.files:
+                parent, _, filename = file_name.rpartition("/")
+                self._children.setdefault(parent, []).append(filename)
+
+        return [
+            directory / filename
+            for filename in sorted(self._children.get(name, ()))
+            if filename.endswith(suffix)
+        ]
+
+    def record_key(self, path: Path, key: str, images: Iterable[Path] = ()) -> None:
+        """Remember the cache key a page was extracted under, and its images."""
+        name = self.relative(path)
+        if name is None:
+            return
+        self.keys[name] = key
+        image_paths = [str(image) for image in images]
+        if image_paths:
+            self.images[name] = image_paths
+        else:
+            self.images.pop(name, None)
+
+    def cached_key(self, path: Path, current: "DocsManifest") -> Optional[str]:
+        """The cache key recorded for a page, if it and its images are unchanged in `current`."""
+        name = self.relative(path)
+        signature = self.files.get(name)
+        if signature is None or signature != current.files.get(name):
+            return None
+
+        for image in self.images.get(name, ()):
+            image_name = current._lookup(Path(image))
+            if image_name is None:
+                # Outside the tree: only its existence is known
+                if not os.path.isfile(image):
+                    return None
+            elif self.files.get(image_name) != current.files.get(image_name):
+                return None
+
+        return self.keys.get(name)
+
+    def changes(self, previous: "DocsManifest") -> set[Path]:
+        """Files added, removed or modified since `previous`."""
+        return {
+            self.root / name
+            for name in self.files.keys() | previous.files.keys()
+            if self.files.get(name) != previous.files.get(name)
+        }
@@ -0,0 +1,208 @@
+"""
+Markdown engines for blog post conversion.
+
+Each backend renders the same dialect the blog has always used with
+python-markdown (fenced code, tables, heading ids, newlines as <br>) and
+produces equivalent HTML, so the engine can be chosen in Config purely for
+speed. The CommonMark engines (markdown-it-py, mistune) are optional.
+"""
+
+import html
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import markdown
+
+try:
+    from markdown_it import MarkdownIt
+    MARKDOWN_IT_AVAILABLE = True
+except ImportError:
+    MARKDOWN_IT_AVAILABLE = False
+
+try:
+    import mistune
+    from mistune.renderers.html import HTMLRenderer
+    MISTUNE_AVAILABLE = True
+except ImportError:
+    MISTUNE_AVAILABLE = False
+
+try:
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import TextLexer, get_lexer_by_name
+    from pygments.util import ClassNotFound
+    PYGMENTS_AVAILABLE = True
+except ImportError:
+    PYGMENTS_AVAILABLE = False
+
+
+# CSS class of highlighted code blocks (styled in PDFBuilder)
+CODE_CSS_CLASS = "highlight"
+
+_TAG_PATTERN = re.compile(r"<[^>]*>")
+_ID_COUNT_PATTERN = re.compile(r"^(.*)_([0-9]+)$")
+
+
+def heading_id(inner_html: str, used_ids: set[str]) -> str:
+    """Return a unique heading id, matching python-markdown's toc extension."""
+    text = html.unescape(_TAG_PATTERN.sub("", inner_html))
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^\w\s-]", "", text).strip().lower()
+    slug = re.sub(r"[-\s]+", "-", text)
+
+    while slug in used_ids or not slug:
+        match = _ID_COUNT_PATTERN.match(slug)
+        slug = f"{match.group(1)}_{int(match.group(2)) + 1}" if match else f"{slug}_1"
+    used_ids.add(slug)
+    return slug
+
+
+def highlight_code(code: str, info: Optional[str] = None) -> str:
+    """Render a fenced code block the way codehilite does (no language guessing)."""
+    lang = info.split(None, 1)[0] if info and info.strip() else ""
+
+    if not PYGMENTS_AVAILABLE:
+        class_attr = f' class="language-{html.escape(lang)}"' if lang else ""
+        return f'<pre class="{CODE_CSS_CLASS}"><code{class_attr}>{html.escape(code, quote=False)}</code></pre>\n'
+
+    try:
+        lexer = get_lexer_by_name(lang) if lang else TextLexer()
+    except ClassNotFound:
+        lexer = TextLexer()
+    return highlight(code, lexer, HtmlFormatter(cssclass=CODE_CSS_CLASS, wrapcode=True))
+
+
+class MarkdownBackend(ABC):
+    """Converts the Markdown body of a blog post to HTML."""
+
+    name: str = ""
+
+    @abstractmethod
+    def convert(self, text: str) -> str:
+        """Render Markdown text to an HTML fragment."""
+
+
+class PythonMarkdownBackend(MarkdownBackend):
+    """The reference engine: python-markdown with its standard extensions."""
+
+    name = "python-markdown"
+
+    def __init__(self):
+        self.md = markdown.Markdown(
+            extensions=[
+                "fenced_code",
+                "tables",
+                "toc",
+                "codehilite",
+                "nl2br",
+            ],
+            extension_configs={
+                "codehilite": {
+                    "css_class": CODE_CSS_CLASS,
+                    "guess_lang": False,
+                }
+            },
+        )
+
+    def convert(self, text: str) -> str:
+        # Reset markdown instance for clean conversion
+        self.md.reset()
+        return self.md.convert(text)
+
+
+class MarkdownItBackend(MarkdownBackend):
+    """markdown-it-py, a fast CommonMark engine."""
+
+    name = "markdown-it"
+
+    def __init__(self):
+        if not MARKDOWN_IT_AVAILABLE:
+            raise ImportError(
+                "markdown-it-py is required for the markdown-it backend. "
+                "Install with: pip install markdown-it-py"
+            )
+        self.md = MarkdownIt("commonmark", {"breaks": True}).enable("table")
+
+        # Fenced and indented code blocks, like codehilite
+        def render_code(renderer, tokens, index, options, env):
+            token = tokens[index]
+            return highlight_code(token.content, token.info)
+
+        self.md.add_render_rule("fence", render_code)
+        self.md.add_render_rule("code_block", render_code)
+
+    def convert(self, text: str) -> str:
+        env: dict = {}
+        tokens = self.md.parse(text, env)
+
+        used_ids: set[str] = set()
+        for index, token in enumerate(tokens):
+            if token.type == "heading_open":
+                inline = tokens[index + 1]
+                inner_html = self.md.renderer.renderInline(inline.children or [], self.md.options, env)
+                token.attrSet("id", heading_id(inner_html, used_ids))
+
+        return self.md.renderer.render(tokens, self.md.options, env)
+
+
+if MISTUNE_AVAILABLE:
+    class _MistuneRenderer(HTMLRenderer):
+        """HTML renderer adding heading ids and highlighted code blocks."""
+
+        def __init__(self):
+            super().__init__(escape=False)
+            self.used_ids: set[str] = set()
+
+        def heading(self, text: str, level: int, **attrs) -> str:
+            return f'<h{level} id="{heading_id(text, self.used_ids)}">{text}</h{level}>\n'
+
+        def block_code(self, code: str, info: Optional[str] = None) -> str:
+            return highlight_code(code, info)
+
+
+class MistuneBackend(MarkdownBackend):
+    """mistune, a fast pure-Python CommonMark-style engine."""
+
+    name = "mistune"
+
+    def __init__(self):
+        if not MISTUNE_AVAILABLE:
+            raise ImportError(
+                "mistune is required for the mistune backend. "
+                "Install with: pip install mistune"
+            )
+        self.renderer = _MistuneRenderer()
+        self.md = mistune.create_markdown(renderer=self.renderer, plugins=["table"], hard_wrap=True)
+
+    def convert(self, text: str) -> str:
+        self.renderer.used_ids = set()
+        return self.md(text)
+
+
+BACKENDS: dict[str, type[MarkdownBackend]] = {
+    backend.name: backend
+    for backend in (PythonMarkdownBackend, MarkdownItBackend, MistuneBackend)
+}
+
+
+def available_backends() -> list[str]:
+    """Names of the backends whose engine is installed."""
+    installed = {
+        PythonMarkdownBackend.name: True,
+        MarkdownItBackend.name: MARKDOWN_IT_AVAILABLE,
+        MistuneBackend.name: MISTUNE_AVAILABLE,
+    }
+    return [name for name in BACKENDS if installed[name]]
+
+
+def get_backend(name: str) -> MarkdownBackend:
+    """Create the backend configured as `name`."""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown markdown backend: {name} (choose from {', '.join(BACKENDS)})"
+        ) from None
+    return backend_class()
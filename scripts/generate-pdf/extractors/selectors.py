@@ -0,0 +1,179 @@
+"""
+Compiled matcher for the strip selectors.
+
+Selectors.strip is a list of CSS selectors whose matches are removed from
+every page. Matching them one `soup.select()` at a time walks the whole
+tree once per selector. StripMatcher compiles the list once and removes
+every match in a single walk.
+
+Simple selectors (`tag`, `.class`, `#id`, `tag.class`, `tag#id`) are
+answered by set lookups on each element. Anything more complex (attribute
+selectors, combinators, pseudo-classes) is compiled into one soupsieve
+selector group and matched in one extra `select()` pass, only when such
+selectors are configured.
+
+SimpleSelector matches one selector against a tag name and its attributes
+alone, for the streaming page cleaner, which never has a tree to match on.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+import soupsieve
+from bs4 import Tag
+
+_SIMPLE_SELECTOR = re.compile(r"([a-zA-Z][\w-]*)?(?:([.#])(-?[_a-zA-Z][\w-]*))?")
+
+# tag[attr], [attr=value], [attr="value"], [attr='value']
+_ATTRIBUTE_SELECTOR = re.compile(
+    r"""([a-zA-Z][\w-]*)?\[\s*([a-zA-Z_][\w-]*)\s*"""
+    r"""(?:=\s*(?:"([^"]*)"|'([^']*)'|([\w-]+))\s*)?\]"""
+)
+
+
+class StripMatcher:
+    """Finds the elements matched by any of a list of CSS selectors."""
+
+    def __init__(self, selectors: tuple[str, ...]):
+        self.names: set[str] = set()
+        self.classes: set[str] = set()
+        self.ids: set[str] = set()
+        # (tag name, class or None, id or None) for compound selectors
+        self.compounds: list[tuple[str, Optional[str], Optional[str]]] = []
+
+        complex_selectors = []
+        for selector in selectors:
+            selector = selector.strip()
+            match = _SIMPLE_SELECTOR.fullmatch(selector)
+            if not selector or not match:
+                complex_selectors.append(selector)
+                continue
+
+            name, kind, value = match.groups()
+            # Type selectors are case-insensitive in HTML; parsers lowercase tags
+            name = name.lower() if name else None
+            if kind is None:
+                self.names.add(name)
+            elif name is None:
+                (self.classes if kind == "." else self.ids).add(value)
+            elif kind == ".":
+                self.compounds.append((name, value, None))
+            else:
+                self.compounds.append((name, None, value))
+
+        self.fallback: Optional[soupsieve.SoupSieve] = (
+            soupsieve.compile(", ".join(complex_selectors)) if complex_selectors else None
+        )
+
+    def matches(self, element: Tag) -> bool:
+        """Whether a simple selector matches the element."""
+        return self.matches_tag(element.name, element.attrs)
+
+    def matches_tag(self, name: str, attrs: dict) -> bool:
+        """Whether a simple selector matches a tag name and its attributes.
+
+        `attrs` is shaped like Tag.attrs, with "class" as a list of names.
+        """
+        if name in self.names:
+            return True
+
+        classes = attrs.get("class") or ()
+        if self.classes and not self.classes.isdisjoint(classes):
+            return True
+        if self.ids and attrs.get("id") in self.ids:
+            return True
+
+        for compound_name, class_name, element_id in self.compounds:
+            if name != compound_name:
+                continue
+            if class_name is not None and class_name in classes:
+                return True
+            if element_id is not None and attrs.get("id") == element_id:
+                return True
+        return False
+
+    def select(self, root: Tag) -> list[Tag]:
+        """Return the outermost matching descendants of root, in no particular order.
+
+        Descendants of a match are not visited, since removing the match
+        removes them too.
+        """
+        found = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for child in node.contents:
+                if not isinstance(child, Tag):
+                    continue
+                if self.matches(child):
+                    found.append(child)
+                else:
+                    stack.append(child)
+        return found
+
+    def strip(self, root: Tag) -> None:
+        """Remove every element matched by any selector from root, in place."""
+        for element in self.select(root):
+            element.decompose()
+
+        if self.fallback is not None:
+            for element in self.fallback.select(root):
+                if not element.decomposed:
+                    element.decompose()
+
+
+class SimpleSelector:
+    """A selector decided by one element's tag name and attributes.
+
+    Supports `tag`, `.class`, `#id`, `tag.class`, `tag#id`, `[attr]` and
+    `[attr=value]` (optionally prefixed with a tag name). Raises ValueError
+    for anything else, since combinators and pseudo-classes need a tree.
+    """
+
+    def __init__(self, selector: str):
+        self.selector = selector.strip()
+        self.name: Optional[str] = None
+        self.class_name: Optional[str] = None
+        self.element_id: Optional[str] = None
+        self.attribute: Optional[str] = None
+        self.value: Optional[str] = None
+
+        simple = _SIMPLE_SELECTOR.fullmatch(self.selector)
+        attribute = _ATTRIBUTE_SELECTOR.fullmatch(self.selector)
+        if self.selector and simple:
+            name, kind, value = simple.groups()
+            if kind == ".":
+                self.class_name = value
+            elif kind == "#":
+                self.element_id = value
+        elif attribute:
+            name, self.attribute, *values = attribute.groups()
+            self.value = next((value for value in values if value is not None), None)
+        else:
+            raise ValueError(f"Selector needs a document tree: {selector!r}")
+        self.name = name.lower() if name else None
+
+    def matches_tag(self, name: str, attrs: dict) -> bool:
+        """Whether the selector matches a tag name and attributes shaped like Tag.attrs."""
+        if self.name is not None and name != self.name:
+            return False
+        if self.class_name is not None:
+            return self.class_name in (attrs.get("class") or ())
+        if self.element_id is not None:
+            return attrs.get("id") == self.element_id
+        if self.attribute is None:
+            return True
+
+        value = attrs.get(self.attribute)
+        if value is None or self.value is None:
+            return value is not None
+        if isinstance(value, list):
+            value = " ".join(value)
+        return value == self.value
+
+
+@lru_cache(maxsize=None)
+def compile_strip_selectors(selectors: tuple[str, ...]) -> StripMatcher:
+    """Return the matcher for a list of selectors, compiling it once."""
+    return StripMatcher(selectors)
@@ -1,9 +1,18 @@
 """
 Sphinx documentation extractor for HTML files.
+
+With Config.docs_source = "json" it reads the output of Sphinx's json
+builder (one .fjson file per page) instead: the page body comes without the
+theme around it, and pages are ordered by following each page's "next" link
+through the toctree.
 """
 
+import json
+import posixpath
+from contextlib import closing
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional
+from urllib.parse import urlsplit
 
 from bs4 import BeautifulSoup
 
@@ -11,11 +20,68 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import Config, config as default_config
 from extractors.base import BaseExtractor, ContentSection
+from extractors.manifest import DocsManifest
+from extractors.streaming import StreamingCleaner
+from profiling import Profiler
+
+
+# Values for Config.html_engine
+HTML_ENGINES = ("dom", "stream")
+
+# Values for Config.docs_source
+DOCS_SOURCES = ("html", "json")
+
+# Page suffix of Sphinx's json builder
+FJSON_SUFFIX = ".fjson"
+
+# Manifest of the docs tree from the last run, in Paths.cache_dir
+MANIFEST_FILENAME = "docs-manifest.json"
+
+
+def page_uri(page: Path, root: Path) -> str:
+    """URI the json builder gives a page: "a/b/" for a/b.fjson, "a/" for a/index.fjson."""
+    docname = page.relative_to(root).with_suffix("").as_posix()
+    if docname == "index":
+        return ""
+    if docname.endswith("/index"):
+        return docname[:-len("index")]
+    return docname + "/"
+
+
+def resolve_page_link(
+    page: Path, href: str, root: Path, is_file: Callable[[Path], bool] = Path.is_file
+) -> Optional[Path]:
+    """Return the .fjson file a relative link on a json builder page points to.
+
+    Returns None for external links, anchors and links to anything that
+    is not a page under `root` (downloads, images, other sites).
+    `is_file` checks whether a candidate exists (DocsManifest.is_file).
+    """
+    parts = urlsplit(href)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+
+    target = posixpath.normpath(posixpath.join(page_uri(page, root), parts.path))
+    if target == ".":
+        target = ""
+    elif target.startswith(".."):
+        return None
+
+    # "a/b/" is either the page a/b or the index of the directory a/b
+    candidates = [root / target / f"index{FJSON_SUFFIX}"]
+    if target:
+        candidates.insert(0, root / f"{target}{FJSON_SUFFIX}")
+    for candidate in candidates:
+        if is_file(candidate):
+            return candidate
+    return None
 
 
 class SphinxExtractor(BaseExtractor):
     """Extract Sphinx documentation from HTML files."""
 
+    VERSION = "2"  # Sections list their images
+
     # Files to skip (navigation, search, etc.)
     SKIP_FILES = {
         "search.html",
@@ -23,29 +89,157 @@ class SphinxExtractor(BaseExtractor):
         "permalink.html",
     }
 
-    def __init__(self, config: Optional[Config] = None):
-        super().__init__(config)
+    def __init__(self, config: Optional[Config] = None, profiler: Optional[Profiler] = None):
+        super().__init__(config, profiler)
+
+        engine = self.config.html_engine
+        if engine not in HTML_ENGINES:
+            raise ValueError(
+                f"Unknown HTML engine: {engine} (choose from {', '.join(HTML_ENGINES)})"
+            )
+        source = self.config.docs_source
+        if source not in DOCS_SOURCES:
+            raise ValueError(
+                f"Unknown docs source: {source} (choose from {', '.join(DOCS_SOURCES)})"
+            )
+        self.json_source = source == "json"
+        self._manifest: Optional[DocsManifest] = None
+        # Page -> the page its "next" link points to, read once per list_pages()
+        self._next_pages: dict[Path, Optional[Path]] = {}
+
+        # The json builder's bodies have no theme to stream past; they always use the tree
+        self.streaming = (
+            StreamingCleaner(self) if engine == "stream" and not self.json_source else None
+        )
+
+    @property
+    def source_dir(self) -> Path:
+        """Directory the pages are read from."""
+        if self.json_source:
+            return self.config.paths.docs_json_dir
+        return self.config.paths.docs_dir
+
+    @property
+    def manifest(self) -> DocsManifest:
+        """Files under source_dir, scanned once per list_pages() (or on first use).
+
+        Worker processes get the parent's scan (see worker_state()).
+        """
+        if self._manifest is None:
+            self._manifest = DocsManifest.scan(self.source_dir)
+        return self._manifest
+
+    def worker_state(self) -> DocsManifest:
+        # Workers look files up in the parent's scan rather than rescanning
+        return self.manifest
+
+    def restore_worker_state(self, state: DocsManifest) -> None:
+        self._manifest = state
+
+    def resolve_local(self, path: Path) -> Path:
+        return self.manifest.resolve(path)
+
+    def local_file_exists(self, path: Path) -> bool:
+        return self.manifest.is_file(path)
+
+    @property
+    def source_suffix(self) -> str:
+        """Suffix of the page files in source_dir."""
+        return FJSON_SUFFIX if self.json_source else ".html"
+
+    def cache_salt(self) -> tuple[str, ...]:
+        # Parsers agree on Sphinx's HTML, but may repair malformed markup differently
+        if self.config.docs_source == "json":
+            return ("json", self.html_parser)
+        if self.config.html_engine == "stream":
+            return ("stream",)
+        return (self.html_parser,)
 
     def extract(self) -> list[ContentSection]:
         """Extract all Sphinx documentation in order."""
-        sections = []
+        return list(self.iter_extract())
 
-        if not self.config.paths.docs_dir.exists():
+    def iter_extract(self) -> Iterator[ContentSection]:
+        """Yield the documentation sections in order as they are extracted.
+
+        Profiler stages stay open while the consumer works on the yielded
+        sections, so profile with extract() to time extraction alone.
+        """
+        if not self.source_dir.exists():
             if self.config.verbose:
-                print(f"Docs directory not found: {self.config.paths.docs_dir}")
-            return sections
+                print(f"Docs directory not found: {self.source_dir}")
+            return
 
-        # Process in defined order
-        for project in self.config.doc_order.projects:
-            project_sections = self._extract_project(project)
-            sections.extend(project_sections)
+        # Collect pages in defined order, then extract them (possibly in
+        # parallel); iter_jobs() preserves this order in its results
+        pages = self.list_pages()
 
-        return sections
+        # Profile each project separately unless pages go to one shared pool
+        if self.jobs > 1:
+            batches = [(f"pages ({self.jobs} workers)", pages)]
+        else:
+            batches = [
+                (project, [page for page in pages if page[1] == project])
+                for project in self.config.doc_order.projects
+            ]
 
-    def _extract_project(self, project: str) -> list[ContentSection]:
-        """Extract all pages for a project."""
-        sections = []
+        # Pages unchanged since the last run are served from the cache unread
+        manifest_path = self.config.paths.cache_dir / MANIFEST_FILENAME
+        previous = None
+        if self.cache.enabled:
+            previous = DocsManifest.load(manifest_path, self.source_dir, self.cache.fingerprint)
+            if previous is not None and self.config.verbose:
+                changed = len(self.manifest.changes(previous))
+                print(f"  {changed} file(s) changed since the last build")
+
+        for name, batch in batches:
+            with self.profiler.stage(name):
+                for section in self._iter_batch(batch, previous):
+                    if section:
+                        yield section
+
+        if self.cache.enabled:
+            self.manifest.save(manifest_path, self.cache.fingerprint)
+        self.cache.evict()
+
+    def _iter_batch(
+        self, batch: list[tuple[Path, str]], previous: Optional[DocsManifest]
+    ) -> Iterator[Optional[ContentSection]]:
+        """Extract pages in order, recording their cache keys in the manifest."""
+        keys = [
+            previous.cached_key(page, self.manifest) if previous is not None else None
+            for page, _ in batch
+        ]
+        stale = [item for item, key in zip(batch, keys) if key is None]
+
+        # closing() shuts the worker pool down even if the consumer stops early
+        with closing(self.iter_jobs("_extract_keyed", stale)) as fresh:
+            for (page, project), key in zip(batch, keys):
+                if key is None:
+                    key, section = next(fresh)
+                else:
+                    cached = self.cache.get(key, page)
+                    if cached:
+                        section = ContentSection.from_dict(cached)
+                    else:  # Evicted since the last run
+                        key, section = self._extract_keyed(page, project)
+
+                if key and section:
+                    self.manifest.record_key(page, key, section.images)
+                yield section
+
+    def list_pages(self) -> list[tuple[Path, str]]:
+        """Return (page_file, project) for every page to extract, in document order."""
+        self._manifest = DocsManifest.scan(self.source_dir)
+        self._next_pages = {}
+        get_files = self._get_toctree_files if self.json_source else self._get_project_files
+        pages = []
+        for project in self.config.doc_order.projects:
+            pages.extend((page_file, project) for page_file in get_files(project))
+        return pages
 
+    def _get_project_files(self, project: str) -> list[Path]:
+        """Get the ordered HTML files for a project."""
         if project == "meta":
             # Meta docs are in the root docs/meta/ directory
             project_dir = self.config.paths.docs_dir / "meta"
@@ -53,31 +247,24 @@ class SphinxExtractor(BaseExtractor):
             # Project-specific docs
             project_dir = self.config.paths.docs_dir / project
 
-        if not project_dir.exists():
+        if not self.manifest.is_dir(project_dir):
             if self.config.verbose:
                 print(f"  Project directory not found: {project_dir}")
-            return sections
+            return []
 
         if self.config.verbose:
             print(f"  Processing project: {project}")
 
-        # Get all HTML files in the project directory
-        html_files = self._get_ordered_files(project_dir, project)
-
-        for html_file in html_files:
-            section = self._extract_page(html_file, project)
-            if section:
-                sections.append(section)
-
-        return sections
+        return self._get_ordered_files(project_dir, project)
 
     def _get_ordered_files(self, project_dir: Path, project: str) -> list[Path]:
         """Get HTML files in a logical order."""
+        manifest = self.manifest
         files = []
 
         # First, check for index.html
         index_file = project_dir / "index.html"
-        if index_file.exists() and index_file.name not in self.SKIP_FILES:
+        if manifest.is_file(index_file) and index_file.name not in self.SKIP_FILES:
             files.append(index_file)
 
         # Define subdirectory order for projects
@@ -86,13 +273,13 @@ class SphinxExtractor(BaseExtractor):
         # Process subdirectories in order
         for subdir in subdirs_order:
             subdir_path = project_dir / subdir
-            if subdir_path.exists() and subdir_path.is_dir():
-                for html_file in sorted(subdir_path.glob("*.html")):
+            if manifest.is_dir(subdir_path):
+                for html_file in manifest.files_in(subdir_path, ".html"):
                     if html_file.name not in self.SKIP_FILES:
                         files.append(html_file)
 
         # Add remaining files in project_dir (not in subdirs)
-        for html_file in sorted(project_dir.glob("*.html")):
+        for html_file in manifest.files_in(project_dir, ".html"):
             if html_file not in files and html_file.name not in self.SKIP_FILES:
                 # Skip if it's just a redirect/index to subproject
                 if html_file.name not in ["index.html"]:
@@ -115,27 +302,130 @@ class SphinxExtractor(BaseExtractor):
             ordered_files = []
             for filename in direct_files:
                 filepath = project_dir / filename
-                if filepath.exists():
+                if manifest.is_file(filepath):
                     ordered_files.append(filepath)
             # No fallback - only include explicitly listed files
             files = ordered_files
 
         return files
 
+    def _get_toctree_files(self, project: str) -> list[Path]:
+        """Get a project's .fjson pages in toctree order.
+
+        Starts at the project's index page, or at the master index for
+        directories without one (meta), and follows the "next" links until
+        they leave the project's directory.
+        """
+        json_dir = self.config.paths.docs_json_dir
+        project_dir = json_dir / project
+        manifest = self.manifest
+        if not manifest.is_dir(project_dir):
+            if self.config.verbose:
+                print(f"  Project directory not found: {project_dir}")
+            return []
+
+        if self.config.verbose:
+            print(f"  Processing project: {project}")
+
+        page = project_dir / f"index{FJSON_SUFFIX}"
+        if not manifest.is_file(page):
+            page = json_dir / f"index{FJSON_SUFFIX}"
+
+        files = []
+        seen = set()
+        while page is not None and page not in seen and manifest.is_file(page):
+            seen.add(page)
+            if project_dir in page.parents:
+                if page.name not in self.SKIP_FILES:
+                    files.append(page)
+            elif files:
+                # The project's pages are contiguous in the toctree
+                break
+            page = self._next_page(page)
+
+        return files
+
+    def _next_page(self, page: Path) -> Optional[Path]:
+        """Return the page a page's "next" link points to.
+
+        Only the link is kept, and it is remembered until the next
+        list_pages(), so walking several projects reads each page once.
+        """
+        if page not in self._next_pages:
+            context = self._read_context(page) or {}
+            next_link = context.get("next") or {}
+            self._next_pages[page] = resolve_page_link(
+                page, next_link.get("link") or "", self.config.paths.docs_json_dir,
+                self.manifest.is_file,
+            )
+        return self._next_pages[page]
+
+    def _read_context(self, page: Path) -> Optional[dict]:
+        """Load the template context the json builder wrote for a page."""
+        try:
+            return json.loads(page.read_bytes())
+        except (OSError, ValueError) as e:
+            if self.config.verbose:
+                print(f"    Error reading {page}: {e}")
+            return None
+
     def _extract_page(self, html_file: Path, project: str) -> Optional[ContentSection]:
         """Extract content from a single HTML page."""
+        return self._extract_keyed(html_file, project)[1]
+
+    def _extract_keyed(
+        self, html_file: Path, project: str
+    ) -> tuple[Optional[str], Optional[ContentSection]]:
+        """Extract a page and return its cache key (None if unreadable) with the section."""
         try:
-            with open(html_file, "r", encoding="utf-8") as f:
-                html = f.read()
+            data = html_file.read_bytes()
+            html = data.decode("utf-8")
         except Exception as e:
             if self.config.verbose:
                 print(f"    Error reading {html_file}: {e}")
-            return None
-
-        soup = BeautifulSoup(html, "html.parser")
+            return None, None
+
+        cache_key = self.cache.key(html_file, data)
+        return cache_key, self._extract_source(cache_key, html_file, project, html)
+
+    def _extract_source(
+        self, cache_key: str, html_file: Path, project: str, html: str
+    ) -> Optional[ContentSection]:
+        """Extract a page's section from its source, or from the cache.
+
+        The page is parsed exactly once; stripping, content selection, link
+        rewriting and cleanup all run as passes over the same tree, and the
+        content is only serialized at the end.
+        With the stream engine, all of that happens in one pass over the
+        tokenizer events instead (see extractors/streaming.py). Pages from
+        the json builder are handled by _extract_json_page.
+        """
+        cached = self.cache.get(cache_key, html_file)
+        if cached:
+            section = ContentSection.from_dict(cached)
+            # The key covers the page, not its images; one removed since needs re-extracting
+            if all(self.local_file_exists(image) for image in section.images):
+                return section
+
+        self.page_images = []
+        if self.json_source:
+            return self._extract_json_page(cache_key, html_file, project, html)
+
+        if self.streaming is not None:
+            page = self.streaming.clean_page(html, html_file)
+            if page is None:
+                if self.config.verbose:
+                    print(f"    No main content found in {html_file}")
+                return None
+            title = page.h1_title if page.h1_title is not None else self._page_title(page.page_title)
+            # Only the images in the content element, not in discarded candidates
+            self.page_images = page.images
+            return self._make_section(cache_key, html_file, project, title, page.html)
+
+        soup = self.parse_html(html)
 
         # Strip navigation elements
-        soup = self.strip_elements(soup)
+        self.strip_elements(soup)
 
         # Extract main content
         content = self.extract_main_content(soup)
@@ -148,15 +438,73 @@ class SphinxExtractor(BaseExtractor):
         title = self._extract_title(soup, content)
 
         # Transform links and image paths
-        content_soup = BeautifulSoup(str(content), "html.parser")
-        content_soup = self.transform_links(content_soup, html_file)
+        self.transform_links(content, html_file)
+
+        # Remove empty paragraphs and excessive whitespace
+        self.clean_tree(content)
 
-        # Clean HTML to remove empty paragraphs and excessive whitespace
-        cleaned_html = self.clean_html(str(content_soup))
+        return self._make_section(cache_key, html_file, project, title, str(content))
 
+    def _extract_json_page(
+        self, cache_key: str, page: Path, project: str, text: str
+    ) -> Optional[ContentSection]:
+        """Extract a page from the json builder's context for it."""
+        try:
+            context = json.loads(text)
+        except ValueError as e:
+            if self.config.verbose:
+                print(f"    Error reading {page}: {e}")
+            return None
+
+        body = context.get("body")
+        if not body:
+            if self.config.verbose:
+                print(f"    No main content found in {page}")
+            return None
+
+        # The same container the HTML theme puts around the body
+        soup = self.parse_html(f'<div role="main" class="document">{body}</div>')
+        content = soup.find("div")
+        self.strip_elements(content)
+
+        h1 = content.find("h1")
+        if h1:
+            title = h1.get_text(strip=True)
+        else:
+            title_html = context.get("title")
+            title = self._page_title(
+                self.parse_html(title_html).get_text().strip() if title_html else None
+            )
+
+        # Links and images are relative to the page's URI ("a/b/" for a/b.fjson);
+        # point page links at the .html files the HTML builder would have linked
+        json_dir = self.config.paths.docs_json_dir
+        page_dir = page.relative_to(json_dir).parent.as_posix()
+        for link in content.find_all("a", href=True):
+            target = resolve_page_link(page, link["href"], json_dir, self.manifest.is_file)
+            if target is not None:
+                target_html = target.relative_to(json_dir).with_suffix(".html").as_posix()
+                fragment = urlsplit(link["href"]).fragment
+                link["href"] = posixpath.relpath(target_html, page_dir) + (
+                    f"#{fragment}" if fragment else ""
+                )
+        self.transform_links(content, json_dir / page_uri(page, json_dir) / page.name)
+
+        self.clean_tree(content)
+
+        return self._make_section(cache_key, page, project, title, str(content))
+
+    def _make_section(
+        self, cache_key: str, html_file: Path, project: str, title: str, cleaned_html: str
+    ) -> ContentSection:
+        """Build the section for an extracted page and cache it.
+
+        Pages with images that are missing are not cached, so they are
+        extracted again (and their images resolved) once the images exist.
+        """
         # Generate unique ID based on file path
-        relative_path = html_file.relative_to(self.config.paths.docs_dir)
-        section_id = str(relative_path).replace("/", "-").replace(".html", "")
+        relative_path = html_file.relative_to(self.source_dir)
+        section_id = str(relative_path).replace("/", "-").replace(self.source_suffix, "")
 
         # Determine heading level based on structure
         level = 2 if project == "meta" else 2
@@ -164,14 +512,18 @@ class SphinxExtractor(BaseExtractor):
         if self.config.verbose:
             print(f"    Extracted: {title}")
 
-        return ContentSection(
+        section = ContentSection(
             id=section_id,
             title=title,
             html_content=cleaned_html,
             level=level,
             source_path=html_file,
             anchor=section_id,
+            images=list(dict.fromkeys(self.page_images)),
         )
+        if all(self.local_file_exists(image) for image in section.images):
+            self.cache.put(cache_key, section.to_dict())
+        return section
 
     def _extract_title(self, soup: BeautifulSoup, content) -> str:
         """Extract page title from content or page metadata."""
@@ -185,12 +537,15 @@ class SphinxExtractor(BaseExtractor):
 
         # Fall back to page title
         title_tag = soup.find("title")
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-            # Remove common suffixes
-            for suffix in [" — Technical Documentation", " - Technical Documentation"]:
-                if title.endswith(suffix):
-                    title = title[:-len(suffix)]
-            return title
-
-        return "Untitled"
+        return self._page_title(title_tag.get_text(strip=True) if title_tag else None)
+
+    def _page_title(self, title: Optional[str]) -> str:
+        """Turn the text of the page's <title> (if any) into a section title."""
+        if title is None:
+            return "Untitled"
+
+        # Remove common suffixes
+        for suffix in [" — Technical Documentation", " - Technical Documentation"]:
+            if title.endswith(suffix):
+                title = title[:-len(suffix)]
+        return title
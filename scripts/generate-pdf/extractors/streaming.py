@@ -0,0 +1,507 @@
+"""
+Streaming page cleaner: extract a docs page without building a tree.
+
+The DOM engine parses a page into a BeautifulSoup tree and walks it once
+per pass (strip, select the content, find the title, rewrite links, drop
+empty paragraphs, collapse whitespace) before serializing it. The
+streaming engine (html_engine = "stream") produces the same title and HTML
+from html.parser's tokenizer events in one pass: stripped subtrees are
+skipped as they are read, links and images are rewritten as their start
+tags go by, and the content is serialized as it streams. Nothing but the
+stack of open elements and the output is kept in memory.
+
+The output is identical to the DOM engine with the html.parser tree
+builder, including its quirks, which tests/test_streaming.py checks:
+
+- Text on both sides of a stripped element is one string (the DOM engine
+  merges it with smooth()), but text around a dropped empty <p> is not.
+- Whitespace is collapsed unless the text's own parent is <pre> or <code>.
+- External links get " ↗" unless their only content is text containing one.
+
+Selectors are matched on each start tag alone, so only the forms
+SimpleSelector and StripMatcher's set lookups support can be used; the
+extractor refuses the engine for any other configured selector.
+"""
+
+from dataclasses import dataclass
+from html import escape
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from extractors.selectors import SimpleSelector, compile_strip_selectors
+
+if TYPE_CHECKING:
+    from extractors.base import BaseExtractor
+
+
+# Elements BeautifulSoup closes as soon as they open (serialized as <br/>)
+VOID_ELEMENTS = frozenset({
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame",
+    "hr", "image", "img", "input", "isindex", "keygen", "link", "menuitem", "meta",
+    "nextid", "param", "source", "spacer", "track", "wbr",
+})
+
+# Attributes BeautifulSoup splits into lists and re-joins with single spaces,
+# on every element and per tag name
+GLOBAL_LIST_ATTRIBUTES = ("accesskey", "class", "dropzone")
+LIST_ATTRIBUTES = {
+    name: GLOBAL_LIST_ATTRIBUTES + extra
+    for name, extra in {
+        "a": ("rel", "rev"),
+        "area": ("rel",),
+        "form": ("accept-charset",),
+        "icon": ("sizes",),
+        "iframe": ("sandbox",),
+        "link": ("rel", "rev"),
+        "object": ("archive",),
+        "output": ("for",),
+        "td": ("headers",),
+        "th": ("headers",),
+    }.items()
+}
+
+# Elements whose text BeautifulSoup leaves out of get_text(); script and
+# style text is also written out unescaped
+STRING_CONTAINERS = frozenset({"rp", "rt", "script", "style", "template"})
+RAW_TEXT_ELEMENTS = frozenset({"script", "style"})
+
+# Whitespace-only text keeps its spaces inside these (BeautifulSoup)...
+PRESERVE_WHITESPACE = frozenset({"pre", "textarea"})
+
+# ...and clean_tree() doesn't collapse text whose parent is one of these
+UNCOLLAPSED_PARENTS = frozenset({"pre", "code"})
+
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+EXTERNAL_LINK = ("http://", "https://")
+
+
+@dataclass
+class StreamedPage:
+    """What the streaming engine extracted from one page."""
+    html: str  # The content element, cleaned and serialized
+    h1_title: Optional[str]  # Text of the content's first <h1>, if it has one
+    page_title: Optional[str]  # Text of the document's <title>, if it has one
+    images: list[Path]  # Local images the content references (see image_source())
+
+
+def _reduce_whitespace(text: str) -> str:
+    """BeautifulSoup stores whitespace-only strings as one space or newline."""
+    if text.strip(ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _attribute_html(attrs: dict) -> str:
+    """Serialize attributes the way BeautifulSoup does (sorted, minimal escaping)."""
+    parts = []
+    for key, value in sorted(attrs.items()):
+        if isinstance(value, list):
+            value = " ".join(value)
+        value = escape(value, quote=False)
+        if '"' in value:
+            if "'" in value:
+                value = value.replace('"', "&quot;")
+            else:
+                parts.append(f" {key}='{value}'")
+                continue
+        parts.append(f' {key}="{value}"')
+    return "".join(parts)
+
+
+class _Frame:
+    """An open element of the content being serialized."""
+
+    __slots__ = ("name", "container", "mark", "run", "count", "string", "has_text",
+                 "text", "external")
+
+    def __init__(self, name: str, container: Optional[str], mark: Optional[int] = None):
+        self.name = name
+        self.container = container  # Innermost enclosing STRING_CONTAINERS element
+        self.mark = mark  # Output index of a <p> start tag, to drop it if empty
+        self.run: list[str] = []  # Strings not yet written; merged like smooth()
+        self.count = 0  # Children after stripping, as in Tag.contents
+        self.string = False  # Whether Tag.string of the first child is truthy
+        self.has_text = False  # Whether get_text(strip=True) is non-empty
+        self.text: Optional[list[str]] = None  # get_text() pieces, when needed
+        self.external = False  # An external link that may get the arrow
+
+
+class _Fragment:
+    """Serializes one candidate content element as its events stream by."""
+
+    def __init__(self, name: str, attr_html: str, void: bool, container: Optional[str]):
+        if void:
+            self.out = [f"<{name}{attr_html}/>"]
+            self.frames: list[_Frame] = []
+        else:
+            self.out = [f"<{name}{attr_html}>"]
+            self.frames = [_Frame(name, container)]
+        self.title: Optional[str] = None  # Text of the first <h1>, once closed
+        self.h1: Optional[_Frame] = None  # The first <h1> while it is open
+        self.dropped = 0  # Depth inside a headerlink removed from the first <h1>
+        self.collectors: list[_Frame] = []  # Open frames that need get_text()
+        self.images: list[Path] = []  # Local images inside the element
+
+    def start(
+        self, name: str, attrs: dict, attr_html: str, void: bool, external: bool, images: list[Path]
+    ) -> None:
+        if self.dropped:
+            self.dropped += not void
+            return
+        if self.h1 is not None and name == "a" and "headerlink" in (attrs.get("class") or ()):
+            # The title is taken from the first <h1> without its headerlinks
+            self.dropped = int(not void)
+            return
+        self.images.extend(images)
+
+        parent = self.frames[-1]
+        self._flush(parent)
+        parent.count += 1
+        if void:
+            if parent.count == 1:
+                parent.string = False
+            self.out.append(f"<{name}{attr_html}/>")
+            return
+
+        container = name if name in STRING_CONTAINERS else parent.container
+        frame = _Frame(name, container, len(self.out) if name == "p" else None)
+        self.out.append(f"<{name}{attr_html}>")
+        if name == "h1" and self.h1 is None and self.title is None:
+            self.h1 = frame
+            frame.text = []
+            self.collectors.append(frame)
+        if external:
+            frame.external = True
+            frame.text = []
+            self.collectors.append(frame)
+        self.frames.append(frame)
+
+    def end(self) -> None:
+        if self.dropped:
+            self.dropped -= 1
+            return
+
+        frame = self.frames.pop()
+        string = frame.count == 1 and frame.string
+        if frame.text is not None:
+            self.collectors.remove(frame)
+        if frame.external and (not string or "↗" not in "".join(frame.text)):
+            frame.run.append(" ↗")
+            frame.has_text = True
+        self._flush(frame)
+        self.out.append(f"</{frame.name}>")
+
+        if frame is self.h1:
+            self.title = "".join(piece.strip() for piece in frame.text if piece.strip())
+            self.h1 = None
+        if frame.mark is not None and not frame.has_text:
+            del self.out[frame.mark:]
+
+        if self.frames:
+            parent = self.frames[-1]
+            parent.has_text = parent.has_text or frame.has_text
+            if parent.count == 1:
+                parent.string = string
+
+    def data(self, text: str) -> None:
+        if self.dropped:
+            return
+
+        frame = self.frames[-1]
+        frame.count += 1
+        if frame.count == 1:
+            frame.string = True
+        frame.run.append(text)
+        if frame.container is None:
+            for collector in self.collectors:
+                collector.text.append(text)
+
+    def special(self, text: str, start: str, end: str, cdata: bool) -> None:
+        """A comment, declaration, processing instruction or CDATA section."""
+        if self.dropped:
+            return
+
+        frame = self.frames[-1]
+        self._flush(frame)
+        frame.count += 1
+        if frame.count == 1:
+            frame.string = bool(text)
+        if cdata:
+            # get_text() includes CDATA sections
+            frame.has_text = frame.has_text or not text.isspace()
+            for collector in self.collectors:
+                collector.text.append(text)
+        # clean_tree() replaces it with plain text if collapsing changes it
+        if frame.name not in UNCOLLAPSED_PARENTS:
+            collapsed = " ".join(text.split())
+            if collapsed != text:
+                self.out.append(escape(collapsed, quote=False))
+                return
+        self.out.append(f"{start}{text}{end}")
+
+    def _flush(self, frame: _Frame) -> None:
+        """Write the strings merged since the last child element."""
+        run = frame.run
+        if not run:
+            return
+        text = run[0] if len(run) == 1 else "".join(run)
+        merged = len(run) > 1
+        run.clear()
+
+        # smooth() turns merged strings into plain text, which get_text() sees
+        if (frame.container is None or merged) and not text.isspace():
+            frame.has_text = True
+
+        if frame.name in UNCOLLAPSED_PARENTS:
+            cleaned = text
+        else:
+            cleaned = " ".join(text.split())
+        if not cleaned:
+            return
+        if frame.container in RAW_TEXT_ELEMENTS and cleaned == text and not merged:
+            self.out.append(text)
+        else:
+            self.out.append(escape(cleaned, quote=False))
+
+    def finish(self) -> str:
+        """Close anything left open at the end of the page and return the HTML."""
+        while self.frames:
+            self.end()
+        return "".join(self.out)
+
+
+class _PageParser(HTMLParser):
+    """Tokenizes one page and feeds the content to _Fragment."""
+
+    def __init__(self, cleaner: "StreamingCleaner", base_path: Path):
+        super().__init__(convert_charrefs=True)
+        self.cleaner = cleaner
+        self.base_path = base_path
+
+        self.stack: list[str] = []  # Every open element, as BeautifulSoup nests them
+        self.text: list[str] = []  # Consecutive data events form one string
+        self.skip: Optional[int] = None  # Stack depth of the stripped element we are in
+        self.preserve = 0  # Open <pre>/<textarea> elements
+        self.already_closed: list[str] = []  # Void elements whose end tag is ignored
+        self.containers: list[str] = []  # Open STRING_CONTAINERS elements
+
+        self.primary: Optional[_Fragment] = None
+        self.fallback: Optional[_Fragment] = None
+        self.active: list[tuple[int, _Fragment]] = []  # (stack depth, fragment)
+
+        self.page_title: Optional[list[str]] = None
+        self.title_depth: Optional[int] = None
+
+    def handle_starttag(self, name: str, attr_list: list) -> None:
+        self._start(name, attr_list)
+        if name in VOID_ELEMENTS:
+            # BeautifulSoup ignores one later </br> per <br> it closed itself
+            self.already_closed.append(name)
+
+    def handle_startendtag(self, name: str, attr_list: list) -> None:
+        self._start(name, attr_list)
+        if name not in VOID_ELEMENTS:
+            self._end_tag(name)
+
+    def _start(self, name: str, attr_list: list) -> None:
+        self._end_text()
+        void = name in VOID_ELEMENTS
+        if self.skip is not None:
+            if not void:
+                self.stack.append(name)
+            return
+
+        attrs = {}
+        for key, value in attr_list:
+            attrs[key] = "" if value is None else value
+        for key in LIST_ATTRIBUTES.get(name, GLOBAL_LIST_ATTRIBUTES):
+            if key in attrs:
+                attrs[key] = attrs[key].split()
+
+        cleaner = self.cleaner
+        if cleaner.strip.matches_tag(name, attrs):
+            if not void:
+                self.stack.append(name)
+                self.skip = len(self.stack)
+            return
+
+        if not void:
+            self.stack.append(name)
+            depth = len(self.stack)
+            if name in PRESERVE_WHITESPACE:
+                self.preserve += 1
+            if name in STRING_CONTAINERS:
+                self.containers.append(name)
+            if name == "title" and self.page_title is None:
+                self.page_title = []
+                self.title_depth = depth
+        else:
+            depth = None
+
+        # select_one(): the first match of the content selector, or of the
+        # fallback selector if the content selector matches nothing
+        root = None
+        if self.primary is None and cleaner.content.matches_tag(name, attrs):
+            root = self.primary = self._fragment(name, attrs, depth)
+            self.active = [(d, fragment) for d, fragment in self.active
+                           if fragment is not self.fallback]
+            self.fallback = None
+        elif (self.primary is None and self.fallback is None
+              and cleaner.fallback_content.matches_tag(name, attrs)):
+            root = self.fallback = self._fragment(name, attrs, depth)
+
+        if not self.active or (root is not None and len(self.active) == 1):
+            return
+
+        # Links and images below a content root are rewritten once for all
+        # candidates (the root itself is not, as in transform_links())
+        external = False
+        images = []
+        if name == "a" and "href" in attrs:
+            href = attrs["href"]
+            external = href.startswith(EXTERNAL_LINK)
+            attrs["href"] = cleaner.extractor.link_target(href)
+        elif name == "img" and "src" in attrs:
+            extractor = cleaner.extractor
+            seen = len(extractor.page_images)
+            attrs["src"] = extractor.image_source(attrs["src"], self.base_path)
+            images = extractor.page_images[seen:]
+        attr_html = _attribute_html(attrs)
+
+        for _, fragment in self.active:
+            if fragment is not root:
+                fragment.start(name, attrs, attr_html, void, external, images)
+
+    def _fragment(self, name: str, attrs: dict, depth: Optional[int]) -> _Fragment:
+        container = self.containers[-1] if self.containers else None
+        fragment = _Fragment(name, _attribute_html(attrs), depth is None, container)
+        if depth is not None:
+            self.active.append((depth, fragment))
+        return fragment
+
+    def handle_endtag(self, name: str) -> None:
+        if name in self.already_closed:
+            self.already_closed.remove(name)
+        else:
+            self._end_tag(name)
+
+    def _end_tag(self, name: str) -> None:
+        self._end_text()
+        # BeautifulSoup closes everything down to the most recent open element
+        # with this name, and ignores the tag if there is none
+        stack = self.stack
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index] == name:
+                break
+        else:
+            return
+        while len(stack) > index:
+            self._close()
+
+    def _close(self) -> None:
+        depth = len(self.stack)
+        name = self.stack.pop()
+        if self.skip is not None:
+            if depth == self.skip:
+                self.skip = None
+            return
+
+        if name in PRESERVE_WHITESPACE:
+            self.preserve -= 1
+        if name in STRING_CONTAINERS:
+            self.containers.pop()
+        if depth == self.title_depth:
+            self.title_depth = None
+        for _, fragment in self.active:
+            fragment.end()
+        if any(d == depth for d, _ in self.active):
+            self.active = [(d, fragment) for d, fragment in self.active if d != depth]
+
+    def handle_data(self, data: str) -> None:
+        self.text.append(data)
+
+    def _end_text(self) -> None:
+        """Deliver the text since the last tag as one string, like BeautifulSoup."""
+        if not self.text:
+            return
+        text = self.text[0] if len(self.text) == 1 else "".join(self.text)
+        self.text.clear()
+        if self.skip is not None:
+            return
+
+        if not self.preserve:
+            text = _reduce_whitespace(text)
+        if self.title_depth is not None and not self.containers:
+            self.page_title.append(text)
+        for _, fragment in self.active:
+            fragment.data(text)
+
+    def _special(self, text: str, start: str, end: str, cdata: bool = False) -> None:
+        self._end_text()
+        if not self.preserve:
+            text = _reduce_whitespace(text)
+        if self.skip is not None:
+            return
+        if cdata and self.title_depth is not None:
+            self.page_title.append(text)
+        for _, fragment in self.active:
+            fragment.special(text, start, end, cdata)
+
+    def handle_comment(self, data: str) -> None:
+        self._special(data, "<!--", "-->")
+
+    def handle_decl(self, decl: str) -> None:
+        self._special(decl[len("DOCTYPE "):], "<!DOCTYPE ", ">\n")
+
+    def handle_pi(self, data: str) -> None:
+        self._special(data, "<?", ">")
+
+    def unknown_decl(self, data: str) -> None:
+        if data.upper().startswith("CDATA["):
+            self._special(data[len("CDATA["):], "<![CDATA[", "]]>", cdata=True)
+        else:
+            self._special(data, "<?", "?>")
+
+    def close(self) -> None:
+        super().close()
+        self._end_text()
+        while self.stack:
+            self._close()
+
+
+class StreamingCleaner:
+    """Extracts the title and cleaned content of a page in a single pass.
+
+    Uses the extractor's selectors and its link_target() and image_source()
+    rewrites. Raises ValueError if a configured selector can't be matched
+    on a start tag alone.
+    """
+
+    def __init__(self, extractor: "BaseExtractor"):
+        selectors = extractor.config.selectors
+        self.extractor = extractor
+        self.strip = compile_strip_selectors(tuple(selectors.strip))
+        if self.strip.fallback is not None:
+            raise ValueError(
+                "The stream HTML engine only supports tag, class, id and compound "
+                f"strip selectors, not: {self.strip.fallback.pattern}"
+            )
+        self.content = SimpleSelector(selectors.content)
+        self.fallback_content = SimpleSelector(selectors.fallback_content)
+
+    def clean_page(self, html: str, base_path: Path) -> Optional[StreamedPage]:
+        """Extract a page's content and titles; None if it has no content element."""
+        parser = _PageParser(self, base_path)
+        parser.feed(html)
+        parser.close()
+
+        fragment = parser.primary or parser.fallback
+        if fragment is None:
+            return None
+
+        page_title = None
+        if parser.page_title is not None:
+            page_title = "".join(piece.strip() for piece in parser.page_title if piece.strip())
+        return StreamedPage(fragment.finish(), fragment.title, page_title, fragment.images)
@@ -0,0 +1,228 @@
+"""
+Image optimization before rendering.
+
+Extracted pages reference their images as file:// URLs to the originals
+(full-resolution PNG screenshots, Graphviz diagrams, photos), which
+WeasyPrint would decode and embed at full size. Before the document is
+handed to WeasyPrint, every such image wider than the page's content area
+at ImageConfig.dpi is downsampled to that width and re-encoded.
+
+Results are stored in output/cache/images under a hash of the source bytes
+and the settings, and the document points at the cached copy instead. The
+same image used on several pages (or saved under several names) therefore
+has one URL, which WeasyPrint embeds once. Unchanged images are never
+re-encoded, and a changed image gets a new URL, so incremental chunks that
+show it are re-rendered. Copies are touched whenever a build uses them, and
+evict() removes the least recently used ones once the directory exceeds
+CacheConfig.max_bytes, like the extraction cache.
+
+Images are only ever made narrower than the original and never narrower
+than the content area (dpi is at least 96, the CSS pixel density), so with
+`img { max-width: 100% }` they are laid out at exactly the same size.
+"""
+
+import hashlib
+import itertools
+import math
+import os
+import re
+from importlib.util import find_spec
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+# Pillow is imported on the first image that needs optimizing
+PIL_AVAILABLE = find_spec("PIL") is not None
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+from config import Config
+from extractors.cache import evict_lru
+
+
+# Bump to invalidate every cached image
+OPTIMIZER_VERSION = "1"
+
+# Page widths in millimetres for PageLayout.size
+PAGE_WIDTHS_MM = {
+    "A3": 297.0,
+    "A4": 210.0,
+    "A5": 148.0,
+    "LETTER": 215.9,
+    "LEGAL": 215.9,
+}
+
+LENGTH_UNITS_MM = {"mm": 1.0, "cm": 10.0, "in": 25.4, "pt": 25.4 / 72, "px": 25.4 / 96}
+
+# Pillow formats that are re-encoded; anything else (SVG, GIF, WebP) is left alone
+OPTIMIZED_FORMATS = {"PNG": ".png", "JPEG": ".jpg"}
+
+# Numbers temporary files apart within one process
+_temp_ids = itertools.count()
+
+# The src of <img> elements pointing at local files, as written by
+# BaseExtractor.transform_links (BeautifulSoup always uses double quotes)
+IMG_SRC_PATTERN = re.compile(r'(<img\b[^>]*?\ssrc=")file://([^"]+)(")')
+
+
+def length_to_mm(length: str) -> float:
+    """Convert a CSS length such as "20mm" or "1in" to millimetres."""
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([a-z]*)\s*", length)
+    if not match or match.group(2) not in LENGTH_UNITS_MM:
+        raise ValueError(f"Unsupported page length: {length!r}")
+    return float(match.group(1)) * LENGTH_UNITS_MM[match.group(2)]
+
+
+def content_width_px(config: Config) -> int:
+    """Pixels needed to fill the page's content width at ImageConfig.dpi."""
+    layout = config.page_layout
+    page_mm = PAGE_WIDTHS_MM.get(layout.size.split()[0].upper(), PAGE_WIDTHS_MM["A4"])
+    width_mm = page_mm - length_to_mm(layout.margin_left) - length_to_mm(layout.margin_right)
+    dpi = max(config.images.dpi, 96)
+    return math.ceil(width_mm / 25.4 * dpi)
+
+
+class ImageOptimizer:
+    """Downsample and re-encode local images into a content-addressed cache."""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.enabled = config.images.enabled and PIL_AVAILABLE
+        self.cache_dir = config.paths.cache_dir / "images"
+        self.max_width = content_width_px(config)
+
+        # Source file -> ((mtime_ns, size), optimized file), for repeat builds
+        self._optimized: dict[Path, tuple[tuple[int, int], Path]] = {}
+
+    def rewrite_html(self, html: str) -> str:
+        """Point every local <img> in an HTML fragment at its optimized copy."""
+        if not self.enabled or "file://" not in html:
+            return html
+
+        def replace(match: re.Match) -> str:
+            source = Path(match.group(2))
+            optimized = self.optimize(source)
+            if optimized == source:
+                return match.group(0)
+            return f"{match.group(1)}file://{optimized}{match.group(3)}"
+
+        return IMG_SRC_PATTERN.sub(replace, html)
+
+    def optimize(self, source: Path) -> Path:
+        """Return the path of the optimized copy of an image.
+
+        Returns `source` itself for missing files and formats that are not
+        re-encoded.
+        """
+        try:
+            stat = source.stat()
+        except OSError:
+            return source
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        known = self._optimized.get(source)
+        if known and known[0] == signature and self._touch(known[1]):
+            return known[1]
+
+        data = source.read_bytes()
+        result = self._optimize_bytes(source, data)
+        self._optimized[source] = (signature, result)
+        return result
+
+    def _optimize_bytes(self, source: Path, data: bytes) -> Path:
+        from PIL import Image
+
+        try:
+            image = Image.open(BytesIO(data))
+            image_format = image.format
+        except Exception as e:
+            if self.config.verbose:
+                print(f"  Warning: Cannot read image {source}: {e}")
+            return source
+
+        if image_format not in OPTIMIZED_FORMATS:
+            return source
+
+        digest = hashlib.sha256()
+        for part in (OPTIMIZER_VERSION, str(self.max_width), str(self.config.images.jpeg_quality)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(data)
+        target = self.cache_dir / f"{digest.hexdigest()}{OPTIMIZED_FORMATS[image_format]}"
+        if self._touch(target):
+            return target
+
+        encoded = self._encode(image, image_format)
+        if encoded is None or (len(encoded) >= len(data) and image.width <= self.max_width):
+            # Nothing gained, but the copy still shares one URL between duplicates
+            encoded = data
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Render and daemon worker processes share the cache directory
+        temp = target.with_suffix(f".{os.getpid()}.{next(_temp_ids)}.tmp")
+        try:
+            temp.write_bytes(encoded)
+            temp.replace(target)
+        except OSError:
+            temp.unlink(missing_ok=True)
+            raise
+
+        if self.config.verbose and encoded is not data:
+            print(f"  Optimized {source.name}: {len(data) // 1024} KiB -> {len(encoded) // 1024} KiB")
+
+        return target
+
+    def is_cached_copy(self, path: Path) -> bool:
+        """Whether `path` is an optimized copy, named by a hash of its content."""
+        return path.parent == self.cache_dir
+
+    def evict(self) -> int:
+        """Remove least recently used copies until under CacheConfig.max_bytes.
+
+        Returns the number of copies removed.
+        """
+        removed = evict_lru(self.cache_dir, "*", self.config.cache.max_bytes)
+        if removed and self.config.verbose:
+            print(f"  Evicted {removed} optimized image(s)")
+        return removed
+
+    @staticmethod
+    def _touch(path: Path) -> bool:
+        """Mark a cached copy as used; False if it no longer exists."""
+        try:
+            os.utime(path)
+        except OSError:
+            return False
+        return True
+
+    def _encode(self, image: "Image.Image", image_format: str) -> Optional[bytes]:
+        """Downsample to the content width if wider, then re-encode."""
+        from PIL import Image, ImageOps
+
+        try:
+            # Apply the EXIF orientation WeasyPrint would, since EXIF is dropped
+            image = ImageOps.exif_transpose(image)
+
+            if image.width > self.max_width:
+                height = max(1, round(image.height * self.max_width / image.width))
+                if image.mode == "P":
+                    # Palette images would be resized with nearest-neighbour
+                    image = image.convert("RGBA")
+                image = image.resize((self.max_width, height), Image.Resampling.LANCZOS)
+
+            output = BytesIO()
+            if image_format == "JPEG":
+                image.save(
+                    output,
+                    "JPEG",
+                    quality=self.config.images.jpeg_quality,
+                    optimize=True,
+                )
+            else:
+                image.save(output, "PNG", optimize=True)
+            return output.getvalue()
+        except Exception as e:
+            if self.config.verbose:
+                print(f"  Warning: Cannot optimize image: {e}")
+            return None
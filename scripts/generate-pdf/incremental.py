@@ -0,0 +1,549 @@
+"""
+Incremental PDF builds from cached, separately rendered chunks.
+
+The document is split into chunks that can be laid out independently:
+the front matter (cover, table of contents, introduction), the Technical
+Documentation divider, one chunk per project (cover page plus its pages)
+and the blog section. Each chunk is rendered to its own PDF and cached
+under output/cache/pdf, keyed by its HTML and starting page number, then
+the chunks are merged with pypdf.
+
+Page numbers are kept correct by starting each chunk's page counter at
+its offset in the final document, and the table of contents is rendered
+last with page numbers taken from the other chunks. Its links to other
+chunks are resolved to their named destinations when merging. Because the front
+matter's own length determines every other offset, its page count from
+the previous run is used as a first guess and corrected if it changed.
+If it still changes after MAX_FRONT_PASSES passes (its length depending
+on the page numbers it lists), the build fails rather than merge chunks
+laid out at the wrong offsets.
+
+A chunk is re-rendered only if its content changed or an earlier chunk
+changed length, shifting its page numbers. Editing a blog post, which is
+the last chunk, re-renders just the blog section.
+
+With Config.render_jobs above 1 the content chunks are laid out in
+parallel worker processes. A chunk's page count does not depend on its
+starting page (only its footer numbers do), so every chunk is rendered at
+once at an offset guessed from the previous run's page counts, and chunks
+whose guess was wrong are rendered again at their real offset.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+from urllib.parse import unquote
+
+from config import Config
+from extractors.base import ContentSection
+from images import IMG_SRC_PATTERN
+from pdf_builder import CHUNK_LINK_SCHEME, PDFBuilder
+from profiling import Profiler
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.generic import NameObject, TextStringObject
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+
+# Maximum attempts to settle the front matter page count
+MAX_FRONT_PASSES = 3
+
+# Parallel rendering passes before falling back to sequential offsets
+MAX_PARALLEL_PASSES = 2
+
+
+@dataclass
+class Chunk:
+    """A part of the document that is rendered to its own PDF."""
+    name: str
+    body_html: str
+    sections: list[ContentSection] = field(default_factory=list)
+
+
+@dataclass
+class RenderedChunk:
+    """A chunk rendered to PDF, as stored in the chunk cache."""
+    name: str
+    pdf_path: Path
+    page_count: int
+    # Anchor id -> 0-based page index within the chunk
+    anchors: dict[str, int]
+
+
+def get_anchor_pages(reader: "PdfReader") -> dict[str, int]:
+    """Map named destinations (HTML ids) to 0-based page indexes."""
+    return {
+        name: reader.get_destination_page_number(dest)
+        for name, dest in reader.named_destinations.items()
+    }
+
+
+def page_offsets(page_counts: list[int], start: int = 0) -> list[int]:
+    """Return the 0-based starting page of each chunk, given their lengths."""
+    offsets = []
+    offset = start
+    for count in page_counts:
+        offsets.append(offset)
+        offset += count
+    return offsets
+
+
+# Per-process builder used by worker processes in _render_many()
+_worker_builder: Optional[PDFBuilder] = None
+
+
+def _init_render_worker(config: Config, draft: bool, offline: bool) -> None:
+    """Create the builder (and its fonts) a worker reuses for all its chunks."""
+    global _worker_builder
+    _worker_builder = PDFBuilder(config, draft=draft, offline=offline)
+
+
+def _render_in_worker(html: str) -> bytes:
+    """Render a chunk's HTML to PDF bytes inside a worker process."""
+    return _worker_builder._render(html)
+
+
+class IncrementalPDFBuilder(PDFBuilder):
+    """Build the PDF from cached per-chunk renders merged with pypdf."""
+
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        draft: bool = False,
+        offline: bool = False,
+        profiler: Optional[Profiler] = None,
+    ):
+        super().__init__(config, draft=draft, offline=offline, profiler=profiler)
+
+        if not PYPDF_AVAILABLE:
+            raise ImportError(
+                "pypdf is required for incremental builds. "
+                "Install with: pip install pypdf"
+            )
+
+        self.chunk_dir = self.config.paths.cache_dir / "pdf"
+        self.state_path = self.chunk_dir / "state.json"
+        self.rendered_count = 0
+        # Chunk name -> page count from the previous run, for parallel offsets
+        self.known_page_counts: dict[str, int] = {}
+
+    @property
+    def render_jobs(self) -> int:
+        """Number of render worker processes (resolves 0 to the CPU count)."""
+        jobs = self.config.render_jobs
+        if jobs <= 0:
+            return os.cpu_count() or 1
+        return jobs
+
+    def build(
+        self,
+        blog_sections: Iterable[ContentSection],
+        docs_sections: Iterable[ContentSection],
+        screenshots: dict[str, Path],
+        output_path: Optional[Path] = None,
+    ) -> Path:
+        """Build the complete PDF, re-rendering only chunks that changed."""
+        # Chunks and page numbers are planned from the whole document
+        blog_sections = list(blog_sections)
+        docs_sections = list(docs_sections)
+        output_path = output_path or self.config.paths.output_path
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.chunk_dir.mkdir(parents=True, exist_ok=True)
+        self.rendered_count = 0
+
+        if self.config.verbose:
+            print("\nBuilding PDF incrementally from cached chunks...")
+
+        with self.profiler.stage("html"):
+            chunks = self._plan_chunks(blog_sections, docs_sections)
+        state = self._load_state()
+        front_pages = state.get("front_pages", 1)
+        self.known_page_counts = state.get("page_counts", {})
+
+        for _ in range(MAX_FRONT_PASSES):
+            rendered = self._render_content_chunks(chunks, front_pages)
+
+            page_numbers = {
+                anchor: offset + page + 1
+                for chunk, offset in zip(rendered, page_offsets(
+                    [c.page_count for c in rendered], front_pages
+                ))
+                for anchor, page in chunk.anchors.items()
+            }
+            front = self._render_chunk(
+                Chunk("front", self._build_front_html(
+                    blog_sections, docs_sections, screenshots, page_numbers
+                )),
+                offset=0,
+            )
+
+            if front.page_count == front_pages:
+                break
+            front_pages = front.page_count
+        else:
+            # The content was laid out after a front matter of another length,
+            # so merging it now would put every page number out of place
+            raise RuntimeError(
+                f"Front matter page count did not settle after {MAX_FRONT_PASSES} passes "
+                f"(now {front.page_count} pages); build without --incremental"
+            )
+
+        all_chunks = [front] + rendered
+        with self.profiler.stage("merge+bookmarks"):
+            self._merge(all_chunks, output_path, blog_sections, docs_sections)
+
+        self._save_state({
+            "front_pages": front_pages,
+            "page_counts": {chunk.name: chunk.page_count for chunk in rendered},
+        })
+        self._remove_stale_chunks(all_chunks)
+        self.images.evict()
+
+        if self.config.verbose:
+            print(f"  Rendered {self.rendered_count} chunk(s), {len(all_chunks)} in document")
+            print(f"\nPDF generated: {output_path}")
+
+        return output_path
+
+    def _plan_chunks(
+        self,
+        blog_sections: list[ContentSection],
+        docs_sections: list[ContentSection],
+    ) -> list[Chunk]:
+        """Split the content after the front matter into independent chunks."""
+        chunks = []
+
+        if docs_sections:
+            chunks.append(Chunk(
+                "docs",
+                self._build_section_divider_html("Technical Documentation", bookmark=True),
+            ))
+            for project, sections in self._group_by_project(docs_sections):
+                chunks.append(Chunk(
+                    f"docs-{project}",
+                    self._build_project_html(project, sections),
+                    sections,
+                ))
+
+        if blog_sections:
+            chunks.append(Chunk(
+                "blog",
+                self._build_section_divider_html("Blog Posts", bookmark=True)
+                + self._build_sections_html(blog_sections, bookmark_level=2),
+                blog_sections,
+            ))
+
+        return chunks
+
+    def _build_front_html(
+        self,
+        blog_sections: list[ContentSection],
+        docs_sections: list[ContentSection],
+        screenshots: dict[str, Path],
+        page_numbers: dict[str, int],
+    ) -> str:
+        """Build the cover, table of contents and introduction."""
+        return "\n".join([
+            self._build_cover_html(screenshots),
+            self._build_toc_html(blog_sections, docs_sections, page_numbers),
+            self._build_intro_html(),
+        ])
+
+    def _render_content_chunks(
+        self,
+        chunks: list[Chunk],
+        front_pages: int,
+    ) -> list[RenderedChunk]:
+        """Render (or load from cache) every chunk after the front matter."""
+        if self.render_jobs > 1 and len(chunks) > 1:
+            rendered = self._render_content_chunks_parallel(chunks, front_pages)
+            if rendered is not None:
+                return rendered
+
+        rendered = []
+        offset = front_pages
+        for chunk in chunks:
+            result = self._render_chunk(chunk, offset)
+            rendered.append(result)
+            offset += result.page_count
+        return rendered
+
+    def _render_content_chunks_parallel(
+        self,
+        chunks: list[Chunk],
+        front_pages: int,
+    ) -> Optional[list[RenderedChunk]]:
+        """Render all chunks at once at guessed offsets, then fix wrong guesses.
+
+        Offsets come from the previous run's page counts (one page per
+        chunk when unknown). After a pass the real page counts are known,
+        so a second pass re-renders only the chunks whose offset moved.
+        Returns None if the counts still disagree, e.g. because a chunk's
+        length depends on its page numbers.
+        """
+        counts = [self.known_page_counts.get(chunk.name, 1) for chunk in chunks]
+        for _ in range(MAX_PARALLEL_PASSES):
+            offsets = page_offsets(counts, front_pages)
+            rendered = self._render_chunks(chunks, offsets)
+            actual = [chunk.page_count for chunk in rendered]
+            if actual == counts:
+                return rendered
+            counts = actual
+        return None
+
+    def _render_chunks(self, chunks: list[Chunk], offsets: list[int]) -> list[RenderedChunk]:
+        """Render chunks at the given offsets, missing ones in worker processes."""
+        results: dict[int, RenderedChunk] = {}
+        missing = []
+        for index, (chunk, offset) in enumerate(zip(chunks, offsets)):
+            html = self._chunk_html(chunk, offset)
+            cached = self._load_chunk(chunk, html)
+            if cached:
+                results[index] = cached
+            else:
+                missing.append((index, chunk, html))
+
+        if missing:
+            if self.config.verbose:
+                names = ", ".join(chunk.name for _, chunk, _ in missing)
+                print(f"  Rendering chunks in parallel: {names}")
+            with self.profiler.stage(f"chunks ({min(self.render_jobs, len(missing))} workers)"):
+                pdfs = self._render_many([html for _, _, html in missing])
+            for (index, chunk, html), pdf_bytes in zip(missing, pdfs):
+                results[index] = self._store_chunk(chunk, html, pdf_bytes)
+
+        return [results[index] for index in range(len(chunks))]
+
+    def _render_many(self, htmls: list[str]) -> list[bytes]:
+        """Render documents to PDF bytes in a process pool, in order."""
+        jobs = min(self.render_jobs, len(htmls))
+        if jobs <= 1:
+            return [self._render(html) for html in htmls]
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_render_worker,
+            initargs=(self.config, self.draft, self.offline),
+        ) as executor:
+            return list(executor.map(_render_in_worker, htmls))
+
+    def _chunk_html(self, chunk: Chunk, offset: int) -> str:
+        """Build the standalone document for a chunk starting at page `offset`."""
+        # With counter-reset on the page counter WeasyPrint skips the
+        # implicit increment, so the first page shows exactly this value
+        offset_css = f"@page :first {{ counter-reset: page {offset + 1}; }}" if offset else ""
+        return self._wrap_document(
+            f'<div class="main-content-section">{chunk.body_html}</div>',
+            offset_css,
+        )
+
+    def _render_chunk(self, chunk: Chunk, offset: int) -> RenderedChunk:
+        """Render a chunk to PDF unless an identical render is cached."""
+        html = self._chunk_html(chunk, offset)
+        cached = self._load_chunk(chunk, html)
+        if cached:
+            return cached
+
+        if self.config.verbose:
+            print(f"  Rendering chunk: {chunk.name}")
+
+        with self.profiler.stage(f"chunk {chunk.name}"):
+            pdf_bytes = self._render(html)
+        return self._store_chunk(chunk, html, pdf_bytes)
+
+    def _chunk_paths(self, html: str) -> tuple[Path, Path]:
+        """Cached PDF and metadata paths for a chunk document.
+
+        Local images are read at render time, so an image replaced in place
+        (same URL) changes the key through its size and modification time.
+        Optimized copies are named by their content and are skipped.
+        """
+        digest = hashlib.sha256(html.encode("utf-8"))
+        for match in IMG_SRC_PATTERN.finditer(html):
+            if self.images.is_cached_copy(Path(match.group(2))):
+                continue
+            try:
+                stat = os.stat(match.group(2))
+            except OSError:
+                continue
+            digest.update(f"\0{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"))
+        key = digest.hexdigest()
+        return self.chunk_dir / f"{key}.pdf", self.chunk_dir / f"{key}.json"
+
+    def _load_chunk(self, chunk: Chunk, html: str) -> Optional[RenderedChunk]:
+        """Return the cached render of a chunk document, if there is one."""
+        pdf_path, meta_path = self._chunk_paths(html)
+        if pdf_path.exists() and meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                if self.config.verbose:
+                    print(f"  Reusing chunk: {chunk.name}")
+                return RenderedChunk(chunk.name, pdf_path, meta["page_count"], meta["anchors"])
+            except (OSError, ValueError, KeyError):
+                pass
+        return None
+
+    def _store_chunk(self, chunk: Chunk, html: str, pdf_bytes: bytes) -> RenderedChunk:
+        """Cache a freshly rendered chunk with its page count and anchors."""
+        pdf_path, meta_path = self._chunk_paths(html)
+        reader = PdfReader(BytesIO(pdf_bytes))
+        meta = {
+            "page_count": len(reader.pages),
+            "anchors": get_anchor_pages(reader),
+        }
+
+        pdf_path.write_bytes(pdf_bytes)
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        self.rendered_count += 1
+
+        return RenderedChunk(chunk.name, pdf_path, meta["page_count"], meta["anchors"])
+
+    def _merge(
+        self,
+        chunks: list[RenderedChunk],
+        output_path: Path,
+        blog_sections: list[ContentSection],
+        docs_sections: list[ContentSection],
+    ) -> None:
+        """Concatenate rendered chunks and add the document outline."""
+        writer = PdfWriter()
+        anchor_pages: dict[str, int] = {}
+
+        offsets = page_offsets([chunk.page_count for chunk in chunks])
+        for chunk, offset in zip(chunks, offsets):
+            writer.append(str(chunk.pdf_path), import_outline=False)
+            for anchor, page in chunk.anchors.items():
+                anchor_pages.setdefault(anchor, offset + page)
+
+        self._link_chunk_anchors(writer, anchor_pages)
+        self._write_outline(writer, anchor_pages.get, blog_sections, docs_sections)
+
+        with open(output_path, "wb") as f:
+            writer.write(f)
+
+        if self.config.verbose:
+            print(f"  Merged {len(chunks)} chunk(s) and added bookmarks")
+
+    def _link_chunk_anchors(self, writer: "PdfWriter", anchor_pages: dict[str, int]) -> None:
+        """Point table of contents links into other chunks at their anchors.
+
+        The front chunk writes these as CHUNK_LINK_SCHEME URI links. The
+        anchors are named destinations in the chunk that holds them, which
+        survive the merge, so each link becomes a jump to its destination.
+        Links to anchors missing from the document are removed.
+        """
+        prefix = f"{CHUNK_LINK_SCHEME}:"
+        for page in writer.pages:
+            if "/Annots" not in page:
+                continue
+            annots = page["/Annots"].get_object()
+            for ref in list(annots):
+                annot = ref.get_object()
+                action = annot.get("/A")
+                uri = action.get_object().get("/URI") if action is not None else None
+                if uri is None or not str(uri).startswith(prefix):
+                    continue
+
+                anchor = unquote(str(uri)[len(prefix):])
+                if anchor not in anchor_pages:
+                    annots.remove(ref)
+                    continue
+                del annot["/A"]
+                annot[NameObject("/Dest")] = TextStringObject(anchor)
+
+    def _write_outline(
+        self,
+        writer: "PdfWriter",
+        get_page_for_anchor: Callable[[str], Optional[int]],
+        blog_sections: list[ContentSection],
+        docs_sections: list[ContentSection],
+    ) -> None:
+        """Add the document outline, resolving anchors to 0-based page indexes.
+
+        Each chunk carries WeasyPrint's native bookmarks, but they cannot be
+        nested across chunk boundaries, so the merged document's outline is
+        rebuilt here from the combined anchor map instead.
+        """
+        # Add top-level bookmarks
+        writer.add_outline_item("Cover", 0)
+        writer.add_outline_item("Table of Contents", 1)
+
+        # Add intro section bookmarks
+        intro_page = get_page_for_anchor("intro-about") or 2
+        intro_parent = writer.add_outline_item("Introduction", intro_page)
+        intro_subsections = [
+            ("intro-principles", "Core Principles"),
+            ("intro-tools", "Our Tools"),
+            ("intro-philosophy", "Technical Philosophy"),
+        ]
+        for anchor_id, title in intro_subsections:
+            page = get_page_for_anchor(anchor_id)
+            if page is not None:
+                writer.add_outline_item(title, page, parent=intro_parent)
+
+        # Technical Documentation (before Blog Posts)
+        if docs_sections:
+            # Find first docs page
+            first_docs_page = get_page_for_anchor(docs_sections[0].anchor_id) or 2
+            docs_parent = writer.add_outline_item("Technical Documentation", first_docs_page)
+
+            # Group by project with nested hierarchy
+            current_project = None
+            project_parent = None
+            for section in docs_sections:
+                project = self._extract_project_from_id(section.id)
+                page = get_page_for_anchor(section.anchor_id)
+
+                if project != current_project:
+                    project_title = self._get_project_title(project)
+                    project_page = page if page is not None else first_docs_page
+                    project_parent = writer.add_outline_item(
+                        project_title, project_page, parent=docs_parent
+                    )
+                    current_project = project
+
+                if page is not None and project_parent:
+                    writer.add_outline_item(section.title, page, parent=project_parent)
+
+        # Blog Posts (after Technical Documentation)
+        if blog_sections:
+            # Find first blog page from actual anchor
+            first_blog_page = get_page_for_anchor(blog_sections[0].anchor_id)
+            if first_blog_page is None:
+                # Fallback: estimate based on last docs section
+                if docs_sections:
+                    last_docs_page = get_page_for_anchor(docs_sections[-1].anchor_id) or 2
+                    first_blog_page = last_docs_page + 1
+                else:
+                    first_blog_page = 2
+            blog_parent = writer.add_outline_item("Blog Posts", first_blog_page)
+
+            # Add each blog post as child bookmark
+            for section in blog_sections:
+                page = get_page_for_anchor(section.anchor_id)
+                if page is not None:
+                    writer.add_outline_item(section.title, page, parent=blog_parent)
+
+    def _load_state(self) -> dict:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: dict) -> None:
+        self.state_path.write_text(json.dumps(state), encoding="utf-8")
+
+    def _remove_stale_chunks(self, chunks: list[RenderedChunk]) -> None:
+        """Delete cached chunks that are not part of the current document."""
+        keep = {chunk.pdf_path.stem for chunk in chunks}
+        for path in self.chunk_dir.iterdir():
+            if path.suffix in (".pdf", ".json") and path != self.state_path and path.stem not in keep:
+                path.unlink(missing_ok=True)
@@ -9,6 +9,16 @@ Options:
     --output PATH       Output PDF location (default: output/cleanroom-labs.pdf)
     --server-url URL    Dev server for screenshots (default: http://localhost:3000)
     --skip-screenshots  Use existing screenshots if available
+    --jobs N           Worker processes for page and post extraction (0 = one per CPU)
+    --render-jobs N    Worker processes laying out --incremental chunks (0 = one per CPU)
+    --no-cache         Re-extract every page and re-capture every screenshot
+    --incremental      Re-render only the parts of the PDF that changed
+    --watch            Rebuild on changes to blog posts, docs or config.py
+    --serve            Run a render daemon that keeps WeasyPrint and fonts loaded
+    --daemon           Build through the running daemon (or locally if none)
+    --stop-daemon      Stop the running daemon
+    --offline          Fail instead of fetching anything over the network
+    --profile [PATH]   Write per-stage timing/memory JSON (default: output/profile.json)
     --verbose          Enable verbose output
     --help             Show this help message
 """
@@ -16,18 +26,21 @@ Options:
 import argparse
 import sys
 from pathlib import Path
+from typing import Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Only lightweight modules are imported here. The extractors (BeautifulSoup,
+# Markdown), the PDF builder (WeasyPrint) and the screenshot capture
+# (Playwright) are imported by the stage that uses them, so --help, the
+# daemon client and --skip-screenshots runs start quickly. The import-time
+# budget is checked by tests/test_startup.py.
 from config import Config
-from extractors.blog import BlogExtractor
-from extractors.sphinx import SphinxExtractor
-from screenshot import capture_screenshots, PLAYWRIGHT_AVAILABLE
-from pdf_builder import build_pdf
+from profiling import DUMP_KINDS, Profiler
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
         description="Generate a comprehensive PDF from the Cleanroom Labs website.",
@@ -38,6 +51,10 @@ Examples:
     python -m scripts.generate-pdf --output custom-output.pdf
     python -m scripts.generate-pdf --skip-screenshots
     python -m scripts.generate-pdf --verbose
+    python -m scripts.generate-pdf --jobs 0 --incremental --render-jobs 0
+    python -m scripts.generate-pdf --skip-screenshots --watch
+    python -m scripts.generate-pdf --serve
+    python -m scripts.generate-pdf --daemon --skip-screenshots
 
 Prerequisites:
     1. Build the docs: npm run build-docs
@@ -64,6 +81,82 @@ Prerequisites:
         help="Skip screenshot capture and use existing screenshots",
     )
 
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes for page and post extraction (default: 1, 0 = one per CPU)",
+    )
+
+    parser.add_argument(
+        "--render-jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes that lay out PDF chunks in parallel in --incremental builds "
+             "(default: 1, 0 = one per CPU)",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the extraction and screenshot caches; re-extract and re-capture everything",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Render the PDF in cached chunks and re-render only chunks that changed",
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and rebuild the PDF when blog posts, docs or config.py change",
+    )
+
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a render daemon on a Unix socket that keeps WeasyPrint and fonts loaded",
+    )
+
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Send this build to the running daemon (builds locally if none is running)",
+    )
+
+    parser.add_argument(
+        "--stop-daemon",
+        action="store_true",
+        help="Stop the running render daemon",
+    )
+
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Fail fast if any stylesheet, font or image would be fetched over the network",
+    )
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Record wall time, CPU time and peak RSS per stage as JSON "
+             "(default path: output/profile.json)",
+    )
+
+    parser.add_argument(
+        "--profile-dump",
+        choices=DUMP_KINDS,
+        help="With --profile, also dump cProfile stats or a tracemalloc snapshot "
+             "of the slowest stage",
+    )
+
     parser.add_argument(
         "--verbose",
         "-v",
@@ -77,72 +170,162 @@ Prerequisites:
         help="Add a diagonal DRAFT watermark to every page",
     )
 
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.daemon and (args.serve or args.watch):
+        parser.error("--daemon cannot be combined with --serve or --watch")
+    return args
 
 
-def main() -> int:
+def main(argv: Optional[list[str]] = None) -> int:
     """Main entry point."""
-    args = parse_args()
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_args(argv)
 
     # Create configuration
     config = Config()
+
+    if args.serve or args.daemon or args.stop_daemon:
+        import daemon
+
+        if args.serve:
+            return daemon.serve(config)
+        if args.stop_daemon:
+            try:
+                reply = daemon.send_request(config.paths.daemon_socket, {"command": "stop"})
+            except OSError:
+                print(f"No PDF daemon running on {config.paths.daemon_socket}")
+                return 1
+            print(reply["output"], end="")
+            return 0
+
+        code = daemon.run_client(config, argv)
+        if code is not None:
+            return code
+        print(f"No PDF daemon running on {config.paths.daemon_socket}, building locally\n")
+
     config.verbose = args.verbose
+    config.jobs = args.jobs
+    config.render_jobs = args.render_jobs
+    config.cache.enabled = not args.no_cache
+
+    profiler = Profiler(enabled=args.profile is not None, dump=args.profile_dump)
 
     print("Cleanroom Labs PDF Generator")
     print("=" * 40)
 
-    # Step 1: Capture screenshots
+    try:
+        return run(args, config, profiler)
+    finally:
+        if profiler.enabled:
+            report_path = Path(args.profile) if args.profile else config.paths.output_dir / "profile.json"
+            written = profiler.write(report_path)
+            print(f"\nProfile:\n{profiler.summary()}")
+            for path in written:
+                print(f"   Wrote {path}")
+
+
+def run(args: argparse.Namespace, config: Config, profiler: Profiler) -> int:
+    """Run the pipeline stages."""
+    # Imports nothing heavy; Playwright is loaded when the browser starts
+    from screenshot import select_targets
+
+    # Step 1: Capture the screenshots the PDF templates use
     screenshots = {}
-    if not args.skip_screenshots:
+    capture = None
+    embedded = config.screenshot.embedded
+    needed = select_targets(config, embedded)
+    if not needed:
+        print("\n1. Skipping screenshot capture (not used by the PDF templates)")
+    elif not args.skip_screenshots:
         print("\n1. Capturing screenshots...")
+        from screenshot import PLAYWRIGHT_AVAILABLE, capture_screenshots
 
         if not PLAYWRIGHT_AVAILABLE:
             print("   Warning: Playwright not installed. Skipping screenshots.")
             print("   Install with: pip install playwright && playwright install chromium")
+        elif args.watch:
+            from screenshot import ScreenshotCapture, find_existing_screenshots
+
+            # The watch session keeps the browser open and captures before every
+            # build; the existing screenshots stand in if a capture fails
+            capture = ScreenshotCapture(config)
+            screenshots = find_existing_screenshots(config, embedded)
+            print("   Captured before each build; the browser stays open while watching")
         else:
             try:
-                screenshots = capture_screenshots(config, args.server_url)
+                with profiler.stage("screenshots"):
+                    screenshots = capture_screenshots(config, args.server_url, embedded)
                 print(f"   Captured {len(screenshots)} screenshot(s)")
             except RuntimeError as e:
                 print(f"   Error: {e}")
                 print("   Continuing without screenshots...")
     else:
         print("\n1. Skipping screenshot capture (--skip-screenshots)")
+        from screenshot import find_existing_screenshots
+
         # Check for existing screenshots
-        hero_path = config.paths.screenshots_dir / "hero.png"
-        products_path = config.paths.screenshots_dir / "products.png"
-        if hero_path.exists():
-            screenshots["hero"] = hero_path
-        if products_path.exists():
-            screenshots["products"] = products_path
+        screenshots = find_existing_screenshots(config, embedded)
         if screenshots:
             print(f"   Found {len(screenshots)} existing screenshot(s)")
 
+    if args.watch:
+        from watch import run_watch
+        return run_watch(args, config, profiler, screenshots, capture)
+
     # Step 2: Extract blog posts
     print("\n2. Extracting blog posts...")
-    blog_extractor = BlogExtractor(config)
-    blog_sections = blog_extractor.extract()
+    from extractors.blog import BlogExtractor
+
+    with profiler.stage("extract_blog"):
+        blog_extractor = BlogExtractor(config, profiler)
+        blog_sections = blog_extractor.extract()
     print(f"   Extracted {len(blog_sections)} blog post(s)")
 
     # Step 3: Extract Sphinx documentation
     print("\n3. Extracting technical documentation...")
-    sphinx_extractor = SphinxExtractor(config)
-    docs_sections = sphinx_extractor.extract()
-    print(f"   Extracted {len(docs_sections)} documentation page(s)")
+    from extractors.sphinx import SphinxExtractor
+
+    sphinx_extractor = SphinxExtractor(config, profiler)
+    docs_count = 0
+
+    def stream_docs():
+        nonlocal docs_count
+        for section in sphinx_extractor.iter_extract():
+            docs_count += 1
+            yield section
+
+    if profiler.enabled:
+        # Extract up front so extraction and assembly are timed separately
+        with profiler.stage("extract_docs"):
+            docs_sections = sphinx_extractor.extract()
+        docs_count = len(docs_sections)
+        print(f"   Extracted {docs_count} documentation page(s)")
+    else:
+        # Pages are written into the PDF's HTML as they are extracted
+        docs_sections = stream_docs()
+        print("   Pages are extracted while the PDF is assembled")
 
     # Step 4: Build PDF
     print("\n4. Building PDF...")
+    from pdf_builder import build_pdf
+
     output_path = args.output or config.paths.output_path
 
     try:
-        result_path = build_pdf(
-            blog_sections=blog_sections,
-            docs_sections=docs_sections,
-            screenshots=screenshots,
-            config=config,
-            output_path=output_path,
-            draft=args.draft,
-        )
+        with profiler.stage("build_pdf"):
+            result_path = build_pdf(
+                blog_sections=blog_sections,
+                docs_sections=docs_sections,
+                screenshots=screenshots,
+                config=config,
+                output_path=output_path,
+                draft=args.draft,
+                incremental=args.incremental,
+                offline=args.offline,
+                profiler=profiler,
+            )
+        if not profiler.enabled:
+            print(f"   Extracted {docs_count} documentation page(s)")
         print(f"\nSuccess! PDF generated at: {result_path}")
         return 0
 
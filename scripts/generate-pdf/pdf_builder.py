@@ -2,34 +2,113 @@
 PDF assembly and styling with WeasyPrint.
 
 Generates a single-document PDF with working internal links and page numbers.
+
+The HTML document is streamed piece by piece (one section at a time) into a
+spooled temporary file and handed to WeasyPrint as a file, so the builder
+never holds more than one copy of the document's HTML in memory.
+
+Sections may be passed as iterators that are still extracting (see
+BaseExtractor.iter_extract): each page is written as it arrives and only
+its table of contents entry is kept.
 """
 
+import codecs
+import re
+import tempfile
+from html import escape
+from importlib.util import find_spec
+from itertools import chain, groupby
 from pathlib import Path
-from typing import Optional
+from typing import (
+    TYPE_CHECKING, BinaryIO, Callable, Iterable, NamedTuple, Optional, Sequence, Union,
+)
 
-try:
-    from weasyprint import HTML
-    from weasyprint.text.fonts import FontConfiguration
-    WEASYPRINT_AVAILABLE = True
-except ImportError:
-    WEASYPRINT_AVAILABLE = False
+# WeasyPrint takes most of a second to import, so it is only imported by
+# the builder that renders; importing this module stays cheap
+WEASYPRINT_AVAILABLE = find_spec("weasyprint") is not None
 
-try:
-    from pypdf import PdfReader, PdfWriter
-    PYPDF_AVAILABLE = True
-except ImportError:
-    PYPDF_AVAILABLE = False
+if TYPE_CHECKING:
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
 
 from config import Config, config as default_config
 from extractors.base import ContentSection
+from images import ImageOptimizer
+from profiling import NULL_PROFILER, Profiler
+
+
+# URL schemes that can be resolved without network access
+LOCAL_URL_SCHEMES = ("file", "data")
+
+# URL scheme of table of contents links whose target is in another chunk
+# (incremental builds); the merged PDF points them at named destinations
+CHUNK_LINK_SCHEME = "chunk-anchor"
+
+# Documents larger than this are spooled to a temporary file on disk
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# Read size when copying the spooled content into the document
+COPY_CHUNK_BYTES = 64 * 1024
+
+# Receives the HTML document piece by piece
+Writer = Callable[[str], object]
+
+# Font file extensions to look for, in order of preference
+FONT_EXTENSIONS = (".woff2", ".woff", ".ttf", ".otf")
+
+# Attributes and CSS constructs that make WeasyPrint fetch a resource
+# (plain <a href> links are never fetched, so they are not matched)
+REMOTE_RESOURCE_PATTERN = re.compile(
+    r"""(?:\bsrc(?:set)?\s*=\s*["']?"""
+    r"""|<link\b[^>]*\bhref\s*=\s*["']?"""
+    r"""|url\(\s*["']?"""
+    r"""|@import\s+["'])"""
+    r"""((?:https?:)?//[^\s"')>]+)""",
+    re.IGNORECASE,
+)
+
+
+# FontConfiguration and @font-face stylesheet per font CSS, shared by every
+# builder in the process so font discovery runs once (watch mode and the
+# render daemon's workers build many times)
+_FONT_CACHE: dict[str, tuple["FontConfiguration", "CSS"]] = {}
+
+# Parsed document stylesheet per CSS text (see PDFBuilder._get_static_css),
+# shared the same way so each process parses it once, not once per render
+_STYLESHEET_CACHE: dict[str, "CSS"] = {}
+
+
+class OfflineError(RuntimeError):
+    """Raised when an offline build would fetch a resource over the network."""
+
+
+class TocEntry(NamedTuple):
+    """What the table of contents needs from a section."""
+    id: str
+    anchor_id: str
+    title: str
+
+    @classmethod
+    def of(cls, section: ContentSection) -> "TocEntry":
+        return cls(section.id, section.anchor_id, section.title)
 
 
 class PDFBuilder:
     """Build PDF from extracted content using single-document approach."""
 
-    def __init__(self, config: Optional[Config] = None, draft: bool = False):
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        draft: bool = False,
+        offline: bool = False,
+        profiler: Optional[Profiler] = None,
+    ):
         self.config = config or default_config
         self.draft = draft
+        self.offline = offline
+        self.profiler = profiler or NULL_PROFILER
+        self.blocked_urls: list[str] = []
+        self.images = ImageOptimizer(self.config)
 
         if not WEASYPRINT_AVAILABLE:
             raise ImportError(
@@ -37,18 +116,38 @@ class PDFBuilder:
                 "Install with: pip install weasyprint"
             )
 
-        if not PYPDF_AVAILABLE:
-            raise ImportError(
-                "pypdf is required for PDF bookmarks. "
-                "Install with: pip install pypdf"
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        # Bundled fonts are registered with the font configuration once and
+        # the resulting stylesheet is reused for every render
+        font_css = self._get_font_face_css()
+        if font_css not in _FONT_CACHE:
+            font_config = FontConfiguration()
+            _FONT_CACHE[font_css] = (font_config, CSS(
+                string=font_css,
+                font_config=font_config,
+                url_fetcher=self._make_url_fetcher(),
+            ))
+        self.font_config, self.font_stylesheet = _FONT_CACHE[font_css]
+
+        # The document's own CSS depends only on the configuration (and the
+        # draft flag), so it is passed to WeasyPrint pre-parsed as well
+        static_css = self._get_static_css()
+        if self.offline:
+            self._check_offline(static_css)
+        if static_css not in _STYLESHEET_CACHE:
+            _STYLESHEET_CACHE[static_css] = CSS(
+                string=static_css,
+                font_config=self.font_config,
+                url_fetcher=self._make_url_fetcher(),
             )
-
-        self.font_config = FontConfiguration()
+        self.stylesheets = [self.font_stylesheet, _STYLESHEET_CACHE[static_css]]
 
     def build(
         self,
-        blog_sections: list[ContentSection],
-        docs_sections: list[ContentSection],
+        blog_sections: Iterable[ContentSection],
+        docs_sections: Iterable[ContentSection],
         screenshots: dict[str, Path],
         output_path: Optional[Path] = None,
     ) -> Path:
@@ -61,72 +160,280 @@ class PDFBuilder:
         if self.config.verbose:
             print("\nBuilding PDF as single document...")
 
-        # Build complete HTML document
-        html_content = self._build_complete_document(
-            blog_sections, docs_sections, screenshots
-        )
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+            # Stream the complete HTML document into the spool
+            with self.profiler.stage("html"):
+                self._spool_document(spool, blog_sections, docs_sections, screenshots)
 
-        # Generate PDF from single HTML
-        temp_path = self.config.paths.output_dir / "temp_combined.pdf"
-        document = HTML(string=html_content)
-        document.write_pdf(str(temp_path), font_config=self.font_config)
+            # Render straight to the output file; bookmarks are emitted by
+            # WeasyPrint from the bookmark-level CSS (see _get_bookmark_css)
+            self._render(spool, str(output_path))
+        self.images.evict()
 
         if self.config.verbose:
-            print("  Generated combined PDF")
+            print(f"\nPDF generated: {output_path}")
+
+        return output_path
 
-        # Add bookmarks using pypdf
-        self._add_bookmarks(temp_path, output_path, blog_sections, docs_sections)
+    def _write_document(
+        self,
+        write: Writer,
+        blog_sections: Iterable[ContentSection],
+        docs_sections: Iterable[ContentSection],
+        screenshots: dict[str, Path],
+        check: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Write the complete HTML document with all content, piece by piece.
 
-        # Clean up temp file
-        if temp_path.exists():
-            temp_path.unlink()
+        The content comes after the table of contents, which lists every
+        section, but the sections may still be arriving. So the content is
+        written first, into a temporary file, keeping only the TOC entries;
+        the front matter is written next and the content copied after it.
+        `check` sees every piece once before it is written.
+        """
+        def write_checked(text: str) -> None:
+            if check is not None:
+                check(text)
+            write(text)
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as content:
+            def write_content(text: str) -> None:
+                if check is not None:
+                    check(text)
+                content.write(text.encode("utf-8"))
+
+            # Content sections (Technical Documentation before Blog Posts)
+            docs_entries = self._write_content(
+                write_content, "Technical Documentation", docs_sections
+            )
+            blog_entries = self._write_content(write_content, "Blog Posts", blog_sections)
 
-        if self.config.verbose:
-            print(f"\nPDF generated: {output_path}")
+            write_checked(self._document_start())
 
-        return output_path
+            # Cover page, table of contents and intro sections (About and Our Tools)
+            write_checked(self._build_cover_html(screenshots))
+            self._write_toc(write_checked, blog_entries, docs_entries)
+            write_checked(self._build_intro_html())
+
+            # Already checked; chunks may split a URL, so they bypass `check`
+            content.seek(0)
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            while chunk := content.read(COPY_CHUNK_BYTES):
+                write(decoder.decode(chunk))
+
+        write_checked(self._document_end())
 
     def _build_complete_document(
         self,
-        blog_sections: list[ContentSection],
-        docs_sections: list[ContentSection],
+        blog_sections: Iterable[ContentSection],
+        docs_sections: Iterable[ContentSection],
         screenshots: dict[str, Path],
     ) -> str:
-        """Build complete HTML document with all content."""
-        # Build cover page HTML
-        cover_html = self._build_cover_html(screenshots)
+        """Build complete HTML document with all content as one string."""
+        parts: list[str] = []
+        self._write_document(parts.append, blog_sections, docs_sections, screenshots)
+        return "".join(parts)
+
+    def _spool_document(
+        self,
+        spool: BinaryIO,
+        blog_sections: Iterable[ContentSection],
+        docs_sections: Iterable[ContentSection],
+        screenshots: dict[str, Path],
+    ) -> None:
+        """Write the complete document as UTF-8 into a file and rewind it.
+
+        Offline builds check each piece for network resources as it is
+        written, since the whole document is never held as one string.
+        """
+        def write(text: str) -> None:
+            spool.write(text.encode("utf-8"))
 
-        # Build TOC HTML
-        toc_html = self._build_toc_html(blog_sections, docs_sections)
+        check = self._check_offline if self.offline else None
+        self._write_document(write, blog_sections, docs_sections, screenshots, check)
+        spool.seek(0)
 
-        # Build intro sections (About and Our Tools)
-        intro_html = self._build_intro_html()
+    def _render(self, source: Union[str, BinaryIO], target=None) -> Optional[bytes]:
+        """Render an HTML document to PDF with the shared fonts and fetcher.
 
-        # Build content sections HTML (Technical Documentation before Blog Posts)
-        docs_html = self._build_content_html("Technical Documentation", docs_sections) if docs_sections else ""
-        blog_html = self._build_content_html("Blog Posts", blog_sections) if blog_sections else ""
+        `source` is the HTML as a string or a UTF-8 file positioned at its
+        start (already checked for network resources in offline builds).
+        Returns the PDF bytes when no target is given.
+        """
+        from weasyprint import HTML
+
+        if isinstance(source, str):
+            if self.offline:
+                self._check_offline(source)
+            html = HTML(string=source, url_fetcher=self._make_url_fetcher())
+        else:
+            # An explicit base URL keeps WeasyPrint from deriving one from
+            # the spool's file name (an integer descriptor once on disk)
+            html = HTML(
+                file_obj=source,
+                encoding="utf-8",
+                base_url=str(self.config.paths.output_dir),
+                url_fetcher=self._make_url_fetcher(),
+            )
 
+        self.blocked_urls = []
+        with self.profiler.stage("layout"):
+            document = html.render(
+                stylesheets=self.stylesheets,
+                font_config=self.font_config,
+            )
+
+        # Writing also emits the native bookmarks
+        with self.profiler.stage("write"):
+            pdf = document.write_pdf(target)
+
+        # WeasyPrint logs fetch errors and carries on; offline builds must not
+        if self.blocked_urls:
+            raise OfflineError(
+                f"Blocked network fetch during offline build: {self.blocked_urls[0]}"
+            )
+
+        return pdf
+
+    def _check_offline(self, html_content: str) -> None:
+        """Fail before layout if the document references network resources."""
+        match = REMOTE_RESOURCE_PATTERN.search(html_content)
+        if match:
+            raise OfflineError(
+                f"Offline build references a network resource: {match.group(1)}"
+            )
+
+    def _make_url_fetcher(self):
+        """Create a URL fetcher that refuses network URLs in offline mode."""
+
+        def check(url: str) -> None:
+            scheme = url.split(":", 1)[0].lower()
+            if self.offline and scheme not in LOCAL_URL_SCHEMES:
+                self.blocked_urls.append(url)
+                raise OfflineError(f"Network access disabled (--offline): {url}")
+
+        try:
+            # WeasyPrint 66+: fetchers are URLFetcher subclasses
+            from weasyprint.urls import URLFetcher
+        except ImportError:
+            from weasyprint import default_url_fetcher
+
+            def fetcher(url, *args, **kwargs):
+                check(url)
+                return default_url_fetcher(url, *args, **kwargs)
+
+            return fetcher
+
+        class GuardedURLFetcher(URLFetcher):
+            def fetch(self, url, headers=None):
+                check(url)
+                return super().fetch(url, headers)
+
+        return GuardedURLFetcher()
+
+    def _find_font_file(self, stem: str) -> Optional[Path]:
+        """Find a bundled font file by name, trying each known extension."""
+        for extension in FONT_EXTENSIONS:
+            path = self.config.fonts.font_dir / f"{stem}{extension}"
+            if path.exists():
+                return path
+        return None
+
+    def _get_font_face_css(self) -> str:
+        """Generate @font-face rules for the bundled Inter font files.
+
+        Faces whose files are missing are skipped with a warning, in which
+        case the font stack in Fonts.sans falls back to locally installed
+        fonts. Offline builds fail instead, since their output would then
+        depend on the fonts installed on the machine.
+        """
+        rules = []
+        for weight, stem in self.config.fonts.inter_faces:
+            path = self._find_font_file(stem)
+            if path is None:
+                if self.offline:
+                    raise OfflineError(
+                        f"Bundled font not found (--offline): {stem} in {self.config.fonts.font_dir}"
+                    )
+                print(f"  Warning: Bundled font not found: {stem}")
+                continue
+            rules.append(f"""
+        @font-face {{
+            font-family: "Inter";
+            font-style: normal;
+            font-weight: {weight};
+            src: url("{path.resolve().as_uri()}");
+        }}
+            """)
+        return "\n".join(rules)
+
+    def _wrap_document(self, body_html: str, extra_css: str = "") -> str:
+        """Wrap body HTML in a complete document with all stylesheets."""
+        return self._document_start(extra_css) + body_html + self._document_end()
+
+    def _document_start(self, extra_css: str = "") -> str:
+        """Doctype, head and the opening body tag.
+
+        Only `extra_css` is inlined; the rest comes from _get_static_css(),
+        which _render() passes to WeasyPrint already parsed.
+        """
         return f"""
         <!DOCTYPE html>
         <html>
         <head>
             <meta charset="UTF-8">
             <style>
-                {self._get_base_css()}
-                {self._get_cover_css()}
-                {self._get_toc_css()}
+                {extra_css}
             </style>
         </head>
         <body>
-            {cover_html}
-            {toc_html}
-            {intro_html}
-            {docs_html}
-            {blog_html}
+        """
+
+    def _get_static_css(self) -> str:
+        """Stylesheet shared by every document this builder renders.
+
+        WeasyPrint gives stylesheets passed to render() user origin, below
+        the document's own <style>; none of these rules compete with
+        `extra_css`, and !important still wins over the content's styles.
+        """
+        return "\n".join([
+            self._get_base_css(),
+            self._get_cover_css(),
+            self._get_toc_css(),
+            self._get_bookmark_css(),
+        ])
+
+    def _document_end(self) -> str:
+        """Closing tags matching _document_start()."""
+        return """
         </body>
         </html>
         """
 
+    def _get_bookmark_css(self) -> str:
+        """Generate CSS that drives the PDF outline.
+
+        WeasyPrint bookmarks every heading by default; instead, only
+        elements marked with _bookmark_attrs() appear in the outline.
+        """
+        return """
+        h1, h2, h3, h4, h5, h6 {
+            bookmark-level: none;
+        }
+
+        [data-bookmark-level="1"] { bookmark-level: 1; }
+        [data-bookmark-level="2"] { bookmark-level: 2; }
+        [data-bookmark-level="3"] { bookmark-level: 3; }
+
+        [data-bookmark-level] {
+            bookmark-label: attr(data-bookmark-label);
+        }
+        """
+
+    def _bookmark_attrs(self, level: int, label: str) -> str:
+        """HTML attributes that add an element to the PDF outline."""
+        return f'data-bookmark-level="{level}" data-bookmark-label="{escape(label)}"'
+
     def _get_draft_watermark_css(self) -> str:
         """Generate CSS for DRAFT watermark on all pages.
 
@@ -160,8 +467,6 @@ class PDFBuilder:
         draft_css = self._get_draft_watermark_css()
 
         return f"""
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-
         @page {{
             size: {layout.size};
             margin: {layout.margin_top} {layout.margin_right} {layout.margin_bottom} {layout.margin_left};
@@ -682,9 +987,9 @@ class PDFBuilder:
 
     def _build_cover_html(self, screenshots: dict[str, Path]) -> str:
         """Build HTML for print-friendly cover page with icon."""
-        _ = screenshots  # Screenshots not used in current design
-        return """
-        <div class="cover-page">
+        _ = screenshots  # Screenshots not used in current design (see ScreenshotConfig.embedded)
+        return f"""
+        <div class="cover-page" {self._bookmark_attrs(1, "Cover")}>
             <div class="cover-icon">
                 <div class="cover-icon-backdrop">
                     <svg width="80" height="80" viewBox="0 0 64 64" xmlns="http://www.w3.org/2000/svg">
@@ -715,11 +1020,11 @@ class PDFBuilder:
 
         return f"""
         {section_divider}
-        <div id="intro-about" class="main-content-section">
+        <div id="intro-about" class="main-content-section" {self._bookmark_attrs(1, "Introduction")}>
             <h1 id="intro-about-heading">About Cleanroom Labs</h1>
             <p>Cleanroom Labs builds free, open-source tools for air-gapped development. Our mission is to make privacy-preserving software accessible to everyone, not just security experts.</p>
 
-            <h2 id="intro-principles">Core Principles</h2>
+            <h2 id="intro-principles" {self._bookmark_attrs(2, "Core Principles")}>Core Principles</h2>
 
             <h3 id="intro-privacy">Privacy by Default</h3>
             <p>Every tool we build works without network connectivity. Your data stays on your machine, under your control. We don't collect telemetry, require accounts, or phone home.</p>
@@ -733,7 +1038,7 @@ class PDFBuilder:
             <h3 id="intro-transparency">Transparency</h3>
             <p>All our code is open source under permissive licenses. You can audit every line, build from source, and verify that our tools do exactly what they claim.</p>
 
-            <h2 id="intro-tools">Our Tools</h2>
+            <h2 id="intro-tools" {self._bookmark_attrs(2, "Our Tools")}>Our Tools</h2>
 
             <h3 id="intro-airgap-transfer">AirGap Transfer</h3>
             <p>Secure data transfer for air-gapped systems. Move files between isolated networks using QR codes, with cryptographic verification ensuring data integrity. No USB drives, no network bridges, no compromises.</p>
@@ -744,7 +1049,7 @@ class PDFBuilder:
             <h3 id="intro-cleanroom-whisper">Cleanroom Whisper</h3>
             <p>Private voice transcription powered by local AI. Convert speech to text using OpenAI's Whisper model running entirely on your hardware. No cloud uploads, no API calls, no recordings leaving your machine.</p>
 
-            <h2 id="intro-philosophy">Technical Philosophy</h2>
+            <h2 id="intro-philosophy" {self._bookmark_attrs(2, "Technical Philosophy")}>Technical Philosophy</h2>
 
             <h3 id="intro-rust">Rust-First Approach</h3>
             <p>We build our core tools in Rust for memory safety, performance, and standalone binaries. No runtime dependencies, no garbage collection pauses, no security vulnerabilities from memory corruption.</p>
@@ -833,6 +1138,11 @@ class PDFBuilder:
             right: 0;
         }}
 
+        /* Page numbers resolved ahead of time (chunked rendering) */
+        .toc-entry-title.toc-static::after {{
+            content: attr(data-page);
+        }}
+
         .toc-project-group {{
             margin-left: 1em;
         }}
@@ -851,15 +1161,45 @@ class PDFBuilder:
 
     def _build_toc_html(
         self,
-        blog_sections: list[ContentSection],
-        docs_sections: list[ContentSection],
+        blog_sections: Sequence[ContentSection],
+        docs_sections: Sequence[ContentSection],
+        page_numbers: Optional[dict[str, int]] = None,
     ) -> str:
-        """Build HTML for table of contents with working links."""
-        toc_items = []
+        """Build HTML for table of contents with working links.
+
+        Page numbers normally come from CSS target-counter(). When the
+        document is rendered in separate chunks the targets may live in
+        another chunk, so known numbers can be passed in page_numbers
+        (anchor id -> printed page number) and are written out statically.
+        Those entries link through CHUNK_LINK_SCHEME, since WeasyPrint drops
+        links to anchors outside the document; the chunks' merge resolves them.
+        """
+        parts: list[str] = []
+        self._write_toc(
+            parts.append,
+            [TocEntry.of(section) for section in blog_sections],
+            [TocEntry.of(section) for section in docs_sections],
+            page_numbers,
+        )
+        return "".join(parts)
+
+    def _write_toc(
+        self,
+        write: Writer,
+        blog_sections: Sequence[TocEntry],
+        docs_sections: Sequence[TocEntry],
+        page_numbers: Optional[dict[str, int]] = None,
+    ) -> None:
+        """Write the table of contents one entry at a time (see _build_toc_html)."""
+        write(f"""
+        <div class="toc-page" {self._bookmark_attrs(1, "Table of Contents")}>
+            <div class="toc-container">
+                <h1 class="toc-title">Table of Contents</h1>
+        """)
 
         # Introduction sections
-        toc_items.append('<h2 class="toc-section-heading">Introduction</h2>')
-        toc_items.append('<ul class="toc-list">')
+        write('<h2 class="toc-section-heading">Introduction</h2>')
+        write('<ul class="toc-list">')
         intro_entries = [
             ("intro-about", "About Cleanroom Labs"),
             ("intro-principles", "Core Principles"),
@@ -867,19 +1207,13 @@ class PDFBuilder:
             ("intro-philosophy", "Technical Philosophy"),
         ]
         for anchor_id, title in intro_entries:
-            toc_items.append(f'''
-                <li class="toc-entry">
-                    <a href="#{anchor_id}" class="toc-entry-title">{title}</a>
-                    <span class="toc-leader"></span>
-                    <span class="toc-page-num"></span>
-                </li>
-            ''')
-        toc_items.append('</ul>')
+            write(self._build_toc_entry_html(anchor_id, title, page_numbers))
+        write('</ul>')
 
         # Documentation section (before Blog Posts)
         if docs_sections:
-            toc_items.append('<h2 class="toc-section-heading">Technical Documentation</h2>')
-            toc_items.append('<ul class="toc-list">')
+            write('<h2 class="toc-section-heading">Technical Documentation</h2>')
+            write('<ul class="toc-list">')
 
             current_project = None
             for section in docs_sections:
@@ -888,51 +1222,60 @@ class PDFBuilder:
 
                 if project != current_project:
                     if current_project is not None:
-                        toc_items.append('</ul></div>')
+                        write('</ul></div>')
                     project_title = self._get_project_title(project)
-                    toc_items.append(f'''
+                    write(f'''
                         <div class="toc-project-group">
                             <div class="toc-project-title">{project_title}</div>
                             <ul class="toc-list toc-project-entries">
                     ''')
                     current_project = project
 
-                toc_items.append(f'''
-                    <li class="toc-entry">
-                        <a href="#{section.anchor_id}" class="toc-entry-title">{section.title}</a>
-                        <span class="toc-leader"></span>
-                        <span class="toc-page-num"></span>
-                    </li>
-                ''')
+                write(
+                    self._build_toc_entry_html(section.anchor_id, section.title, page_numbers)
+                )
 
             if current_project is not None:
-                toc_items.append('</ul></div>')
-            toc_items.append('</ul>')
+                write('</ul></div>')
+            write('</ul>')
 
         # Blog section (after Technical Documentation)
         if blog_sections:
-            toc_items.append('<h2 class="toc-section-heading">Blog Posts</h2>')
-            toc_items.append('<ul class="toc-list">')
+            write('<h2 class="toc-section-heading">Blog Posts</h2>')
+            write('<ul class="toc-list">')
             for section in blog_sections:
-                toc_items.append(f'''
-                    <li class="toc-entry">
-                        <a href="#{section.anchor_id}" class="toc-entry-title">{section.title}</a>
-                        <span class="toc-leader"></span>
-                        <span class="toc-page-num"></span>
-                    </li>
-                ''')
-            toc_items.append('</ul>')
-
-        toc_html = "\n".join(toc_items)
+                write(
+                    self._build_toc_entry_html(section.anchor_id, section.title, page_numbers)
+                )
+            write('</ul>')
 
-        return f"""
-        <div class="toc-page">
-            <div class="toc-container">
-                <h1 class="toc-title">Table of Contents</h1>
-                {toc_html}
+        write("""
             </div>
         </div>
-        """
+        """)
+
+    def _build_toc_entry_html(
+        self,
+        anchor_id: str,
+        title: str,
+        page_numbers: Optional[dict[str, int]] = None,
+    ) -> str:
+        """Build HTML for a single table of contents entry."""
+        if page_numbers and anchor_id in page_numbers:
+            link = (
+                f'<a href="{CHUNK_LINK_SCHEME}:{anchor_id}" class="toc-entry-title toc-static" '
+                f'data-page="{page_numbers[anchor_id]}">{title}</a>'
+            )
+        else:
+            link = f'<a href="#{anchor_id}" class="toc-entry-title">{title}</a>'
+
+        return f'''
+                <li class="toc-entry">
+                    {link}
+                    <span class="toc-leader"></span>
+                    <span class="toc-page-num"></span>
+                </li>
+            '''
 
     def _get_project_title(self, project: str) -> str:
         """Get display title for a project."""
@@ -1038,7 +1381,7 @@ class PDFBuilder:
         subtitle = self._get_project_subtitle(project)
 
         return f'''
-            <div class="project-cover-page section-break">
+            <div class="project-cover-page section-break" {self._bookmark_attrs(2, title)}>
                 <div class="project-cover-content">
                     <div class="project-cover-icon">{icon_svg}</div>
                     <h1 class="project-cover-title">{title}</h1>
@@ -1047,8 +1390,8 @@ class PDFBuilder:
             </div>
         '''
 
-    def _build_section_divider_html(self, title: str) -> str:
-        """Build HTML for a section divider page."""
+    def _build_section_divider_html(self, title: str, bookmark: bool = False) -> str:
+        """Build HTML for a section divider page, optionally as an outline entry."""
         colors = self.config.colors
 
         # Concentric dotted circles decoration
@@ -1063,8 +1406,10 @@ class PDFBuilder:
             </svg>
         '''
 
+        bookmark_attrs = self._bookmark_attrs(1, title) if bookmark else ""
+
         return f'''
-            <div class="section-divider-page section-break">
+            <div class="section-divider-page section-break" {bookmark_attrs}>
                 <div class="section-divider-content">
                     <div class="section-divider-decoration">{decoration_svg}</div>
                     <h1 class="section-divider-title">{title}</h1>
@@ -1090,142 +1435,121 @@ class PDFBuilder:
     def _build_content_html(
         self,
         section_title: str,
-        sections: list[ContentSection],
+        sections: Iterable[ContentSection],
     ) -> str:
         """Build HTML for a content section (blog or docs)."""
-        content_parts = []
-
-        # Add section divider for the main section
-        section_divider = self._build_section_divider_html(section_title)
-        content_parts.append(section_divider)
+        parts: list[str] = []
+        self._write_content(parts.append, section_title, sections)
+        return "".join(parts)
 
-        # Track current project for docs to insert project cover pages
-        current_project = None
-        is_docs = section_title == "Technical Documentation"
+    def _write_content(
+        self,
+        write: Writer,
+        section_title: str,
+        sections: Iterable[ContentSection],
+    ) -> list[TocEntry]:
+        """Write a content section (blog or docs) one page at a time, as pages arrive.
 
-        for section in sections:
-            if is_docs:
-                # Detect project from ID and add project cover when it changes
-                project = self._extract_project_from_id(section.id)
-                if project != current_project:
-                    content_parts.append(self._build_project_cover_html(project))
-                    current_project = project
+        Returns the pages' table of contents entries. Nothing is written
+        when there are no pages.
+        """
+        entries: list[TocEntry] = []
 
-            content_parts.append(f'''
-                <div id="{section.anchor_id}" class="content-section">
-                    {section.html_content}
-                </div>
-            ''')
+        def recorded():
+            for section in sections:
+                entries.append(TocEntry.of(section))
+                yield section
 
-        content_html = "\n".join(content_parts)
+        pages = recorded()
+        first = next(pages, None)
+        if first is None:
+            return entries
+        pages = chain([first], pages)
 
-        return f"""
-        <div class="main-content-section">
-            {content_html}
-        </div>
-        """
+        write('<div class="main-content-section">')
 
-    def _add_bookmarks(
+        # Add section divider for the main section
+        write(self._build_section_divider_html(section_title, bookmark=True))
+
+        if section_title == "Technical Documentation":
+            # Insert a project cover page whenever the project changes
+            for project, project_sections in groupby(
+                pages, key=lambda section: self._extract_project_from_id(section.id)
+            ):
+                write(self._build_project_cover_html(project))
+                self._write_sections(write, project_sections, bookmark_level=3)
+        else:
+            self._write_sections(write, pages, bookmark_level=2)
+
+        write("</div>")
+        return entries
+
+    def _group_by_project(
         self,
-        input_path: Path,
-        output_path: Path,
-        blog_sections: list[ContentSection],
         docs_sections: list[ContentSection],
-    ) -> None:
-        """Add bookmarks to the generated PDF using named destinations."""
-        reader = PdfReader(str(input_path))
-        writer = PdfWriter()
-
-        # Copy all pages
-        for page in reader.pages:
-            writer.add_page(page)
-
-        # Get named destinations from PDF (WeasyPrint creates these from HTML id attributes)
-        destinations = reader.named_destinations
-
-        def get_page_for_anchor(anchor_id: str) -> int | None:
-            """Find page number for a named destination."""
-            dest = destinations.get(anchor_id)
-            if dest:
-                return reader.get_destination_page_number(dest)
-            return None
-
-        # Add top-level bookmarks
-        writer.add_outline_item("Cover", 0)
-        writer.add_outline_item("Table of Contents", 1)
-
-        # Add intro section bookmarks
-        intro_page = get_page_for_anchor("intro-about") or 2
-        intro_parent = writer.add_outline_item("Introduction", intro_page)
-        intro_subsections = [
-            ("intro-principles", "Core Principles"),
-            ("intro-tools", "Our Tools"),
-            ("intro-philosophy", "Technical Philosophy"),
-        ]
-        for anchor_id, title in intro_subsections:
-            page = get_page_for_anchor(anchor_id)
-            if page is not None:
-                writer.add_outline_item(title, page, parent=intro_parent)
-
-        # Technical Documentation (before Blog Posts)
-        if docs_sections:
-            # Find first docs page
-            first_docs_page = get_page_for_anchor(docs_sections[0].anchor_id) or 2
-            docs_parent = writer.add_outline_item("Technical Documentation", first_docs_page)
-
-            # Group by project with nested hierarchy
-            current_project = None
-            project_parent = None
-            for section in docs_sections:
-                project = self._extract_project_from_id(section.id)
-                page = get_page_for_anchor(section.anchor_id)
-
-                if project != current_project:
-                    project_title = self._get_project_title(project)
-                    project_page = page if page is not None else first_docs_page
-                    project_parent = writer.add_outline_item(
-                        project_title, project_page, parent=docs_parent
-                    )
-                    current_project = project
-
-                if page is not None and project_parent:
-                    writer.add_outline_item(section.title, page, parent=project_parent)
-
-        # Blog Posts (after Technical Documentation)
-        if blog_sections:
-            # Find first blog page from actual anchor
-            first_blog_page = get_page_for_anchor(blog_sections[0].anchor_id)
-            if first_blog_page is None:
-                # Fallback: estimate based on last docs section
-                if docs_sections:
-                    last_docs_page = get_page_for_anchor(docs_sections[-1].anchor_id) or 2
-                    first_blog_page = last_docs_page + 1
-                else:
-                    first_blog_page = 2
-            blog_parent = writer.add_outline_item("Blog Posts", first_blog_page)
-
-            # Add each blog post as child bookmark
-            for section in blog_sections:
-                page = get_page_for_anchor(section.anchor_id)
-                if page is not None:
-                    writer.add_outline_item(section.title, page, parent=blog_parent)
+    ) -> list[tuple[str, list[ContentSection]]]:
+        """Split docs sections into consecutive runs belonging to one project."""
+        groups: list[tuple[str, list[ContentSection]]] = []
+        for section in docs_sections:
+            project = self._extract_project_from_id(section.id)
+            if not groups or groups[-1][0] != project:
+                groups.append((project, []))
+            groups[-1][1].append(section)
+        return groups
+
+    def _build_project_html(self, project: str, sections: list[ContentSection]) -> str:
+        """Build HTML for a project cover page followed by its pages."""
+        return self._build_project_cover_html(project) + self._build_sections_html(
+            sections, bookmark_level=3
+        )
 
-        # Write final PDF
-        with open(output_path, "wb") as f:
-            writer.write(f)
+    def _build_sections_html(self, sections: list[ContentSection], bookmark_level: int) -> str:
+        """Build HTML for a run of content sections, each an outline entry."""
+        parts: list[str] = []
+        self._write_sections(parts.append, sections, bookmark_level)
+        return "".join(parts)
 
-        if self.config.verbose:
-            print(f"  Added bookmarks to PDF")
+    def _write_sections(
+        self,
+        write: Writer,
+        sections: Iterable[ContentSection],
+        bookmark_level: int,
+    ) -> None:
+        """Write a run of content sections, pointing images at optimized copies."""
+        for section in sections:
+            write(
+                f'\n<div id="{section.anchor_id}" class="content-section" '
+                f'{self._bookmark_attrs(bookmark_level, section.title)}>\n'
+            )
+            write(self.images.rewrite_html(section.html_content))
+            write("\n</div>\n")
 
 
 def build_pdf(
-    blog_sections: list[ContentSection],
-    docs_sections: list[ContentSection],
+    blog_sections: Iterable[ContentSection],
+    docs_sections: Iterable[ContentSection],
     screenshots: dict[str, Path],
     config: Optional[Config] = None,
     output_path: Optional[Path] = None,
     draft: bool = False,
+    incremental: bool = False,
+    offline: bool = False,
+    profiler: Optional[Profiler] = None,
 ) -> Path:
-    """Convenience function to build PDF."""
-    builder = PDFBuilder(config, draft=draft)
+    """Convenience function to build PDF.
+
+    Parallel rendering (config.render_jobs above 1) only applies to
+    incremental builds, whose cross-chunk TOC entries are not clickable, so
+    it is ignored with a warning unless `incremental` is set. The sections
+    may be iterators; the incremental builder collects them before planning
+    chunks.
+    """
+    config = config or default_config
+    if config.render_jobs != 1 and not incremental:
+        print("  Warning: --render-jobs only applies to --incremental builds; rendering in one pass")
+    if incremental:
+        from incremental import IncrementalPDFBuilder
+        builder = IncrementalPDFBuilder(config, draft=draft, offline=offline, profiler=profiler)
+    else:
+        builder = PDFBuilder(config, draft=draft, offline=offline, profiler=profiler)
     return builder.build(blog_sections, docs_sections, screenshots, output_path)
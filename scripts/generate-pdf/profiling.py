@@ -0,0 +1,221 @@
+"""
+Stage-level timing and memory profiling for the PDF generator.
+
+Records wall time, CPU time and peak RSS for each pipeline stage and its
+sub-stages and writes them to a JSON report, so runs can be compared as
+the docs tree grows. Optionally keeps a cProfile or tracemalloc dump of
+the slowest top-level stage.
+"""
+
+import cProfile
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+DUMP_KINDS = ("cprofile", "tracemalloc")
+
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+def read_peak_rss() -> int:
+    """Return the process's peak resident set size in bytes."""
+    try:
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss() -> bool:
+    """Reset the peak RSS high-water mark, where the OS allows it (Linux).
+
+    Returns False when per-stage peaks are not available, in which case
+    each stage reports the process-wide peak so far.
+    """
+    try:
+        _PROC_CLEAR_REFS.write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+@dataclass
+class Stage:
+    """Measurements for one stage; children are its sub-stages."""
+    name: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    children_cpu_s: float = 0.0
+    peak_rss_bytes: int = 0
+    traced_peak_bytes: Optional[int] = None
+    children: list["Stage"] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        data = {
+            "name": self.name,
+            "wall_s": round(self.wall_s, 6),
+            "cpu_s": round(self.cpu_s, 6),
+            "children_cpu_s": round(self.children_cpu_s, 6),
+            "peak_rss_bytes": self.peak_rss_bytes,
+        }
+        if self.traced_peak_bytes is not None:
+            data["traced_peak_bytes"] = self.traced_peak_bytes
+        if self.children:
+            data["stages"] = [child.to_dict() for child in self.children]
+        return data
+
+
+class Profiler:
+    """Collects nested stage measurements.
+
+    A disabled profiler (the default everywhere a profiler is optional)
+    makes stage() a no-op, so callers can instrument unconditionally.
+    """
+
+    def __init__(self, enabled: bool = True, dump: Optional[str] = None):
+        if dump is not None and dump not in DUMP_KINDS:
+            raise ValueError(f"Unknown profile dump kind: {dump}")
+
+        self.enabled = enabled
+        self.dump = dump if enabled else None
+        self.stages: list[Stage] = []
+        self._stack: list[Stage] = []
+        self._peak_resettable = False
+        self._slowest: Optional[tuple[Stage, object]] = None
+
+        if self.dump == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Optional[Stage]]:
+        """Measure the enclosed block as a stage (nested inside any open stage)."""
+        if not self.enabled:
+            yield None
+            return
+
+        stage = Stage(name)
+        parent = self._stack[-1] if self._stack else None
+        (parent.children if parent else self.stages).append(stage)
+
+        # Fold the peak so far into every open stage before resetting it
+        current_peak = read_peak_rss()
+        for open_stage in self._stack:
+            open_stage.peak_rss_bytes = max(open_stage.peak_rss_bytes, current_peak)
+        self._peak_resettable = reset_peak_rss()
+
+        top_level = parent is None
+        cprofile = cProfile.Profile() if top_level and self.dump == "cprofile" else None
+        tracing = self.dump == "tracemalloc"
+        if tracing:
+            tracemalloc.reset_peak()
+
+        self._stack.append(stage)
+        children_cpu = resource.getrusage(resource.RUSAGE_CHILDREN)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if cprofile:
+            cprofile.enable()
+
+        try:
+            yield stage
+        finally:
+            if cprofile:
+                cprofile.disable()
+            stage.wall_s = time.perf_counter() - wall_start
+            stage.cpu_s = time.process_time() - cpu_start
+
+            # CPU used by worker processes that exited during the stage
+            children_end = resource.getrusage(resource.RUSAGE_CHILDREN)
+            stage.children_cpu_s = (
+                (children_end.ru_utime + children_end.ru_stime)
+                - (children_cpu.ru_utime + children_cpu.ru_stime)
+            )
+
+            stage.peak_rss_bytes = max(stage.peak_rss_bytes, read_peak_rss())
+            if tracing:
+                stage.traced_peak_bytes = tracemalloc.get_traced_memory()[1]
+
+            self._stack.pop()
+            if parent:
+                parent.peak_rss_bytes = max(parent.peak_rss_bytes, stage.peak_rss_bytes)
+
+            if top_level and self.dump:
+                self._keep_if_slowest(stage, cprofile)
+
+    def _keep_if_slowest(self, stage: Stage, cprofile: Optional[cProfile.Profile]) -> None:
+        """Retain the dump data of the slowest top-level stage only."""
+        if self._slowest and self._slowest[0].wall_s >= stage.wall_s:
+            return
+        data = cprofile if self.dump == "cprofile" else tracemalloc.take_snapshot()
+        self._slowest = (stage, data)
+
+    def to_dict(self) -> dict:
+        """Build the machine-readable report."""
+        return {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "per_stage_peak_rss": self._peak_resettable,
+            "wall_s": round(sum(stage.wall_s for stage in self.stages), 6),
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+    def write(self, report_path: Path) -> list[Path]:
+        """Write the JSON report (and any dump); return the files written."""
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report = self.to_dict()
+        written = [report_path]
+
+        if self._slowest:
+            stage, data = self._slowest
+            suffix = ".prof" if self.dump == "cprofile" else ".tracemalloc"
+            dump_path = report_path.with_name(f"{report_path.stem}-{stage.name}{suffix}")
+            if self.dump == "cprofile":
+                data.dump_stats(str(dump_path))
+            else:
+                data.dump(str(dump_path))
+            report["dump"] = {"kind": self.dump, "stage": stage.name, "path": str(dump_path)}
+            written.append(dump_path)
+
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        return written
+
+    def summary(self) -> str:
+        """Format a human-readable summary table of the recorded stages."""
+        lines = [f"{'Stage':<40} {'Wall':>9} {'CPU':>9} {'Peak RSS':>10}"]
+
+        def add(stage: Stage, depth: int) -> None:
+            label = ("  " * depth + stage.name)[:40]
+            lines.append(
+                f"{label:<40} {stage.wall_s:>8.2f}s {stage.cpu_s + stage.children_cpu_s:>8.2f}s "
+                f"{stage.peak_rss_bytes / (1024 * 1024):>7.1f} MB"
+            )
+            for child in stage.children:
+                add(child, depth + 1)
+
+        for stage in self.stages:
+            add(stage, 0)
+        return "\n".join(lines)
+
+
+# Shared disabled profiler used when none is passed in
+NULL_PROFILER = Profiler(enabled=False)
@@ -1,18 +1,101 @@
 """
 Screenshot capture using Playwright.
+
+All targets are captured concurrently, each in its own browser context and
+page, sharing a single Chromium instance. The browser and the event loop it
+runs on are kept open by ScreenshotCapture until close(), so repeated
+captures (e.g. in watch mode) pay the launch cost once.
+
+Each target element's rendered DOM and computed styles are fingerprinted
+and recorded in output/screenshots/manifest.json; the PNG is only
+re-captured when the fingerprint changes.
 """
 
 import asyncio
+import hashlib
+import json
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Optional
+from urllib.parse import urljoin
+
+# Playwright is only imported when a browser is launched, so runs that
+# skip screenshots don't pay for it
+PLAYWRIGHT_AVAILABLE = find_spec("playwright") is not None
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Page
+
+from config import Config, ScreenshotTarget, config as default_config
+
+
+# Bump to invalidate every stored fingerprint
+FINGERPRINT_VERSION = "1"
+
+MANIFEST_NAME = "manifest.json"
+
+# Serializes what an element looks like: its markup, the computed style of
+# it and every descendant, resolved image sources and its rendered size
+FINGERPRINT_SCRIPT = """
+(element) => {
+    const parts = [element.outerHTML];
+    for (const node of [element, ...element.querySelectorAll("*")]) {
+        const style = getComputedStyle(node);
+        const declarations = [];
+        for (let i = 0; i < style.length; i++) {
+            declarations.push(style[i] + ":" + style.getPropertyValue(style[i]));
+        }
+        parts.push(declarations.join(";"));
+        if (node.currentSrc) {
+            parts.push(node.currentSrc);
+        }
+    }
+    const rect = element.getBoundingClientRect();
+    parts.push(rect.width + "x" + rect.height);
+    return parts.join("\\n");
+}
+"""
+
+
+def screenshot_path(config: Config, target: ScreenshotTarget) -> Path:
+    """Return where a target's screenshot is saved."""
+    return config.paths.screenshots_dir / f"{target.name}.png"
+
+
+def load_manifest(config: Config) -> dict[str, dict]:
+    """Load the stored fingerprints, keyed by target name."""
+    try:
+        manifest_path = config.paths.screenshots_dir / MANIFEST_NAME
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
 
-try:
-    from playwright.async_api import async_playwright, Browser, Page
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+def save_manifest(config: Config, manifest: dict[str, dict]) -> None:
+    """Store fingerprints next to the screenshots."""
+    manifest_path = config.paths.screenshots_dir / MANIFEST_NAME
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
 
-from config import Config, config as default_config
+
+def select_targets(config: Config, names: Optional[Iterable[str]] = None) -> tuple[ScreenshotTarget, ...]:
+    """Return the configured targets, limited to `names` when given."""
+    if names is None:
+        return tuple(config.screenshot.targets)
+    wanted = set(names)
+    return tuple(target for target in config.screenshot.targets if target.name in wanted)
+
+
+def find_existing_screenshots(
+    config: Config,
+    names: Optional[Iterable[str]] = None,
+) -> dict[str, Path]:
+    """Return previously captured screenshots for the configured targets."""
+    screenshots = {}
+    for target in select_targets(config, names):
+        path = screenshot_path(config, target)
+        if path.exists():
+            screenshots[target.name] = path
+    return screenshots
 
 
 class ScreenshotCapture:
@@ -27,114 +110,192 @@ class ScreenshotCapture:
                 "Install with: pip install playwright && playwright install chromium"
             )
 
-    async def capture_all(self, server_url: Optional[str] = None) -> dict[str, Path]:
-        """Capture all required screenshots."""
+        # Persistent browser pool: one loop, one Playwright driver, one browser
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._playwright = None
+        self._browser: Optional["Browser"] = None
+
+    def __enter__(self) -> "ScreenshotCapture":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    async def _get_browser(self) -> "Browser":
+        """Launch Chromium on first use, or reconnect if it went away."""
+        if self._browser and self._browser.is_connected():
+            return self._browser
+
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        if self.config.verbose:
+            print("  Launching Chromium...")
+        self._browser = await self._playwright.chromium.launch()
+        return self._browser
+
+    async def _close_browser(self) -> None:
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def capture_all(
+        self,
+        server_url: Optional[str] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> dict[str, Path]:
+        """Capture the configured targets (or just `names`) concurrently."""
         server_url = server_url or self.config.screenshot.server_url
+        targets = select_targets(self.config, names)
+        if not targets:
+            return {}
 
         # Ensure screenshots directory exists
         self.config.paths.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
-        screenshots = {}
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            page = await browser.new_page(
-                viewport={
-                    "width": self.config.screenshot.viewport_width,
-                    "height": self.config.screenshot.viewport_height,
-                }
-            )
+        browser = await self._get_browser()
+        limit = asyncio.Semaphore(max(1, self.config.screenshot.concurrency))
+        manifest = load_manifest(self.config) if self.config.cache.enabled else {}
+
+        async def capture(target: ScreenshotTarget) -> Optional[Path]:
+            async with limit:
+                return await self._capture_target(browser, server_url, target, manifest)
+
+        results = await asyncio.gather(*(capture(target) for target in targets))
+
+        # Written once after all captures, which update `manifest` in place
+        save_manifest(self.config, manifest)
+
+        return {
+            target.name: path
+            for target, path in zip(targets, results)
+            if path is not None
+        }
+
+    async def _capture_target(
+        self,
+        browser: "Browser",
+        server_url: str,
+        target: ScreenshotTarget,
+        manifest: dict[str, dict],
+    ) -> Optional[Path]:
+        """Load the target's page in a fresh context and capture its element."""
+        url = urljoin(server_url.rstrip("/") + "/", target.path.lstrip("/"))
+        context = await browser.new_context(
+            viewport={
+                "width": self.config.screenshot.viewport_width,
+                "height": self.config.screenshot.viewport_height,
+            }
+        )
+        try:
+            page = await context.new_page()
 
-            # Navigate to homepage
             if self.config.verbose:
-                print(f"  Loading {server_url}...")
+                print(f"  Loading {url} for {target.name}...")
 
             try:
-                await page.goto(server_url, wait_until="networkidle", timeout=30000)
+                await page.goto(url, wait_until="networkidle", timeout=self.config.screenshot.timeout_ms)
             except Exception as e:
-                await browser.close()
                 raise RuntimeError(
                     f"Failed to connect to {server_url}. "
                     "Make sure the dev server is running (npm run dev)."
                 ) from e
 
-            # Capture hero section
-            hero_path = await self._capture_hero(page)
-            if hero_path:
-                screenshots["hero"] = hero_path
+            return await self._capture_element(page, target, manifest)
+        finally:
+            await context.close()
 
-            # Capture products section
-            products_path = await self._capture_products(page)
-            if products_path:
-                screenshots["products"] = products_path
-
-            await browser.close()
-
-        return screenshots
-
-    async def _capture_hero(self, page: Page) -> Optional[Path]:
-        """Capture the hero section screenshot."""
-        output_path = self.config.paths.screenshots_dir / "hero.png"
+    async def _capture_element(
+        self,
+        page: "Page",
+        target: ScreenshotTarget,
+        manifest: dict[str, dict],
+    ) -> Optional[Path]:
+        """Capture a target element once it has stopped moving, unless unchanged."""
+        output_path = screenshot_path(self.config, target)
 
         try:
-            # Find the hero section (first section element)
-            hero = await page.query_selector(self.config.screenshot.hero_selector)
-            if not hero:
+            element = await page.query_selector(target.selector)
+            if not element:
                 if self.config.verbose:
-                    print("  Warning: Hero section not found")
+                    print(f"  Warning: {target.name} element not found ({target.selector})")
                 return None
 
-            # Capture screenshot
-            await hero.screenshot(path=str(output_path))
-
-            if self.config.verbose:
-                print(f"  Captured hero: {output_path}")
+            if target.scroll_into_view:
+                await element.scroll_into_view_if_needed()
 
-            return output_path
+            # Wait for entry animations to finish instead of a fixed sleep:
+            # "stable" means the bounding box is unchanged across two frames
+            await element.wait_for_element_state("stable", timeout=self.config.screenshot.timeout_ms)
 
-        except Exception as e:
-            if self.config.verbose:
-                print(f"  Error capturing hero: {e}")
-            return None
-
-    async def _capture_products(self, page: Page) -> Optional[Path]:
-        """Capture the products/Our Tools section screenshot."""
-        output_path = self.config.paths.screenshots_dir / "products.png"
-
-        try:
-            # Scroll to products section to ensure it's rendered
-            products = await page.query_selector(self.config.screenshot.products_selector)
-            if not products:
+            fingerprint = self._fingerprint(target, await element.evaluate(FINGERPRINT_SCRIPT))
+            stored = manifest.get(target.name, {})
+            if stored.get("fingerprint") == fingerprint and output_path.exists():
                 if self.config.verbose:
-                    print("  Warning: Products section not found")
-                return None
-
-            # Scroll into view
-            await products.scroll_into_view_if_needed()
-            await page.wait_for_timeout(500)  # Wait for animations
+                    print(f"  Unchanged {target.name}: {output_path}")
+                return output_path
 
-            # Capture screenshot
-            await products.screenshot(path=str(output_path))
+            await element.screenshot(path=str(output_path))
+            manifest[target.name] = {"fingerprint": fingerprint, "file": output_path.name}
 
             if self.config.verbose:
-                print(f"  Captured products: {output_path}")
+                print(f"  Captured {target.name}: {output_path}")
 
             return output_path
 
         except Exception as e:
             if self.config.verbose:
-                print(f"  Error capturing products: {e}")
+                print(f"  Error capturing {target.name}: {e}")
             return None
 
-    def capture_sync(self, server_url: Optional[str] = None) -> dict[str, Path]:
-        """Synchronous wrapper for capture_all."""
-        return asyncio.run(self.capture_all(server_url))
+    def _fingerprint(self, target: ScreenshotTarget, rendered: str) -> str:
+        """Hash an element's rendered state with everything else that affects its PNG."""
+        digest = hashlib.sha256()
+        for part in (
+            FINGERPRINT_VERSION,
+            target.selector,
+            target.path,
+            str(self.config.screenshot.viewport_width),
+            str(self.config.screenshot.viewport_height),
+            rendered,
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def capture_sync(
+        self,
+        server_url: Optional[str] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> dict[str, Path]:
+        """Synchronous wrapper for capture_all, reusing the browser between calls."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.capture_all(server_url, names))
+
+    def close(self) -> None:
+        """Shut down the browser and its event loop."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            self._loop.run_until_complete(self._close_browser())
+        finally:
+            self._loop.close()
+            self._loop = None
 
 
 def capture_screenshots(
     config: Optional[Config] = None,
     server_url: Optional[str] = None,
+    names: Optional[Iterable[str]] = None,
 ) -> dict[str, Path]:
-    """Convenience function to capture all screenshots."""
-    capture = ScreenshotCapture(config)
-    return capture.capture_sync(server_url)
+    """Convenience function to capture all screenshots (or just `names`)."""
+    config = config or default_config
+    if not select_targets(config, names):
+        return {}
+    with ScreenshotCapture(config) as capture:
+        return capture.capture_sync(server_url, names)
@@ -11,7 +11,10 @@ MODULE_DIR = Path(__file__).resolve().parent.parent
 if str(MODULE_DIR) not in sys.path:
     sys.path.insert(0, str(MODULE_DIR))
 
-from config import Config, Paths, Colors, Fonts, PageLayout, Selectors, DocOrder, ScreenshotConfig
+from config import (
+    Config, Paths, Colors, Fonts, PageLayout, Selectors, DocOrder, ScreenshotConfig, CacheConfig,
+    ImageConfig,
+)
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
@@ -36,13 +39,25 @@ def config(tmp_path):
     cfg.selectors = Selectors()
     cfg.doc_order = DocOrder()
     cfg.screenshot = ScreenshotConfig()
+    cfg.cache = CacheConfig()
+    cfg.images = ImageConfig()
     cfg.verbose = False
+    cfg.jobs = 1
+    cfg.render_jobs = 1
+    cfg.daemon_workers = 1
+    cfg.markdown_backend = "python-markdown"
+    cfg.html_parser = "html.parser"
+    cfg.html_engine = "dom"
+    cfg.docs_source = "html"
     cfg.repo_root = tmp_path
     cfg.paths = Paths()
     cfg.paths.docs_dir = tmp_path / "docs"
+    cfg.paths.docs_json_dir = tmp_path / "docs-json"
     cfg.paths.blog_dir = tmp_path / "blog"
     cfg.paths.output_dir = tmp_path / "output"
     cfg.paths.screenshots_dir = tmp_path / "output" / "screenshots"
+    cfg.paths.cache_dir = tmp_path / "output" / "cache"
+    cfg.paths.daemon_socket = tmp_path / "output" / "pdf-daemon.sock"
     return cfg
 
 
@@ -1,10 +1,16 @@
 """Tests for BaseExtractor HTML processing methods."""
 
+import sys
 from pathlib import Path
 
+import pytest
 from bs4 import BeautifulSoup
 
-from extractors.base import BaseExtractor, ContentSection
+import extractors.base as base
+from extractors.base import (
+    HTML_PARSERS, IN_FLIGHT_PER_WORKER, BaseExtractor, ContentSection, available_html_parsers,
+    resolve_html_parser,
+)
 from config import Config
 
 
@@ -136,3 +142,59 @@ class TestCleanHtml:
 
         soup = BeautifulSoup(result, "html.parser")
         assert soup.find("p").get_text() == "multiple spaces here"
+
+
+class TestHtmlParser:
+    def test_auto_prefers_lxml(self):
+        expected = "lxml" if "lxml" in available_html_parsers() else "html.parser"
+        assert resolve_html_parser("auto") == expected
+
+    def test_parser_library_imported_when_chosen(self, monkeypatch):
+        """Availability comes from find_spec; a broken install fails on first use."""
+        monkeypatch.setattr(base, "HTML5LIB_AVAILABLE", True)
+        monkeypatch.setitem(sys.modules, "html5lib", None)  # Makes the import fail
+        with pytest.raises(ImportError, match="pip install html5lib"):
+            resolve_html_parser("html5lib")
+        assert resolve_html_parser("html.parser") == "html.parser"
+
+    def test_unknown_parser_rejected(self):
+        with pytest.raises(ValueError, match="Unknown HTML parser"):
+            resolve_html_parser("regex")
+
+    @pytest.mark.parametrize("parser", HTML_PARSERS)
+    def test_clean_html_same_on_every_parser(self, config, parser):
+        """Fragments are not wrapped in <html><body> by lxml or html5lib."""
+        if parser not in available_html_parsers():
+            pytest.skip(f"{parser} not installed")
+        html = "<h2>Title</h2>\n<p>a   b</p><p> </p><pre><code>  x  </code></pre>"
+
+        expected = ConcreteExtractor(config).clean_html(html)
+        config.html_parser = parser
+        assert ConcreteExtractor(config).clean_html(html) == expected
+
+
+class JobExtractor(ConcreteExtractor):
+    def _touch(self, path: str) -> str:
+        Path(path).touch()
+        return Path(path).name
+
+
+class TestIterJobs:
+    def test_results_in_order(self, config, tmp_path):
+        config.jobs = 2
+        tasks = [(str(tmp_path / str(i)),) for i in range(30)]
+
+        assert list(JobExtractor(config).iter_jobs("_touch", tasks)) == [str(i) for i in range(30)]
+
+    def test_only_a_window_is_submitted(self, config, tmp_path):
+        """A consumer that stops after one result leaves most tasks unrun."""
+        config.jobs = 2
+        task_dir = tmp_path / "tasks"
+        task_dir.mkdir()
+        tasks = [(str(task_dir / str(i)),) for i in range(100)]
+
+        results = JobExtractor(config).iter_jobs("_touch", tasks)
+        assert next(results) == "0"
+        results.close()
+
+        assert len(list(task_dir.iterdir())) <= 2 * IN_FLIGHT_PER_WORKER + 1
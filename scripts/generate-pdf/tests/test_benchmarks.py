@@ -0,0 +1,37 @@
+"""Tests for the synthetic benchmark suite."""
+
+from benchmarks.bench_pipeline import compare_results, run_scale
+from benchmarks.synthetic import generate_blog_dir, generate_docs_tree
+from extractors.blog import BlogExtractor
+from extractors.sphinx import SphinxExtractor
+
+
+def test_synthetic_trees_are_fully_extracted(config):
+    generate_docs_tree(config.paths.docs_dir, 25)
+    generate_blog_dir(config.paths.blog_dir, 12)
+
+    docs = SphinxExtractor(config).extract()
+    blog = BlogExtractor(config).extract()
+
+    assert len(docs) == 25
+    assert len(blog) == 12
+    assert blog[0].title == "Synthetic Post 0"  # newest first
+
+
+def test_run_scale_times_each_stage():
+    timings = run_scale(5, repeat=1)
+    assert {"extract_docs", "extract_blog", "build_document"} <= set(timings)
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_compare_results_flags_slowdowns():
+    baseline = {"timings": {"100": {"extract_docs": 1.0, "extract_blog": 0.5, "build_document": 0.001}}}
+    current = {"timings": {
+        "100": {"extract_docs": 1.5, "extract_blog": 0.55, "build_document": 0.005},
+        "1000": {"extract_docs": 10.0},
+    }}
+
+    regressions = compare_results(baseline, current, threshold=1.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("extract_docs @ 100 pages")
@@ -2,6 +2,8 @@
 
 import shutil
 
+from benchmarks.synthetic import generate_blog_dir
+from extractors.base import PostMetadata
 from extractors.blog import BlogExtractor
 
 
@@ -82,3 +84,73 @@ def test_build_metadata_html_with_tags(config):
     html = ext._build_metadata_html("Title", "", "", ["testing", "ci"], "")
     assert '<span class="blog-tag">testing</span>' in html
     assert '<span class="blog-tag">ci</span>' in html
+
+
+def test_extract_keeps_frontmatter_as_metadata(config, blog_dir_with_post):
+    """Parsed frontmatter is kept on the section as structured fields."""
+    config.paths.blog_dir = blog_dir_with_post
+    metadata = BlogExtractor(config).extract()[0].metadata
+
+    assert metadata == PostMetadata(
+        date="2026-01-15",
+        author="Test Author",
+        tags=["testing", "ci"],
+        slug="test-post",
+        excerpt="A test blog post for CI.",
+    )
+
+
+def test_unquoted_yaml_date_is_normalized(config, tmp_path):
+    """An unquoted date (parsed by YAML as a date object) sorts and renders as text."""
+    blog_dir = tmp_path / "blog"
+    blog_dir.mkdir()
+    (blog_dir / "post.mdx").write_text('---\ntitle: "Unquoted"\ndate: 2025-03-04\n---\nBody.\n')
+
+    config.paths.blog_dir = blog_dir
+    section = BlogExtractor(config).extract()[0]
+
+    assert section.metadata.date == "2025-03-04"
+    assert "March 04, 2025" in section.html_content
+
+
+def test_empty_tags_are_no_tags(config, tmp_path):
+    """An empty `tags:` key (parsed by YAML as None) is treated as no tags."""
+    blog_dir = tmp_path / "blog"
+    blog_dir.mkdir()
+    (blog_dir / "post.mdx").write_text('---\ntitle: "Untagged"\ntags:\n---\nBody.\n')
+
+    config.paths.blog_dir = blog_dir
+    section = BlogExtractor(config).extract()[0]
+
+    assert section.metadata.tags == []
+    assert section.title == "Untagged"
+
+
+def test_sort_posts_does_not_read_files(config, tmp_path):
+    """Sorting uses metadata only, so it works after the files are gone."""
+    blog_dir = tmp_path / "blog"
+    blog_dir.mkdir()
+    for day in ("01", "03", "02"):
+        (blog_dir / f"post-{day}.mdx").write_text(
+            f'---\ntitle: "Post {day}"\ndate: "2026-01-{day}"\n---\nBody.\n'
+        )
+
+    config.paths.blog_dir = blog_dir
+    ext = BlogExtractor(config)
+    posts = [ext._extract_post(path) for path in ext.list_posts()]
+    shutil.rmtree(blog_dir)
+
+    assert [p.title for p in ext.sort_posts(posts)] == ["Post 03", "Post 02", "Post 01"]
+
+
+def test_parallel_extraction_matches_sequential(config, tmp_path):
+    """Extracting posts in a process pool gives the same sorted result."""
+    config.paths.blog_dir = tmp_path / "blog"
+    generate_blog_dir(config.paths.blog_dir, 8)
+    config.cache.enabled = False
+
+    sequential = BlogExtractor(config).extract()
+    config.jobs = 2
+    parallel = BlogExtractor(config).extract()
+
+    assert [p.to_dict() for p in parallel] == [p.to_dict() for p in sequential]
@@ -1,6 +1,8 @@
 """Tests for ContentSection dataclass."""
 
-from extractors.base import ContentSection
+from pathlib import Path
+
+from extractors.base import ContentSection, PostMetadata
 
 
 def test_anchor_id_uses_explicit_anchor():
@@ -31,3 +33,14 @@ def test_default_level_is_1():
 def test_children_default_empty():
     section = ContentSection(id="x", title="T", html_content="")
     assert section.children == []
+
+
+def test_dict_round_trip_keeps_post_metadata():
+    section = ContentSection(
+        id="blog-post",
+        title="Post",
+        html_content="<p>Body</p>",
+        source_path=Path("/blog/post.mdx"),
+        metadata=PostMetadata(date="2026-01-15", tags=["a", "b"], slug="post"),
+    )
+    assert ContentSection.from_dict(section.to_dict()) == section
@@ -0,0 +1,127 @@
+"""Tests for the render daemon's socket protocol (builds are faked)."""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from daemon import RenderDaemon, is_running, run_build, run_client, send_request
+
+
+@pytest.fixture
+def running_daemon(config):
+    """A daemon whose builds echo their arguments, served on a thread."""
+    calls = []
+
+    def fake_build(argv, cwd):
+        calls.append((argv, cwd))
+        return (3 if "--fail" in argv else 0), f"built {' '.join(argv)}\n"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        server = RenderDaemon(config.paths.daemon_socket, executor, runner=fake_build)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server, calls
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+def test_client_forwards_build_and_relays_result(config, running_daemon, capsys):
+    _, calls = running_daemon
+
+    assert run_client(config, ["--daemon", "--skip-screenshots"]) == 0
+    assert capsys.readouterr().out == "built --skip-screenshots\n"
+    assert calls == [(["--skip-screenshots"], os.getcwd())]
+
+    assert run_client(config, ["--fail"]) == 3
+
+
+def test_ping_and_stop(config, running_daemon):
+    server, _ = running_daemon
+    assert is_running(config.paths.daemon_socket)
+
+    reply = send_request(config.paths.daemon_socket, {"command": "stop"})
+
+    assert reply["exit"] == 0
+    server.server_close()
+    assert not config.paths.daemon_socket.exists()
+
+
+def test_refuses_second_daemon_on_same_socket(config, running_daemon):
+    with pytest.raises(RuntimeError, match="already listening"):
+        RenderDaemon(config.paths.daemon_socket, ThreadPoolExecutor(max_workers=1))
+
+
+def test_client_without_daemon_builds_locally(config):
+    assert run_client(config, ["--daemon"]) is None
+
+
+def test_stale_socket_is_replaced(config):
+    """A socket file left by a killed daemon doesn't block a new one."""
+    import socket
+
+    config.paths.daemon_socket.parent.mkdir(parents=True)
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(str(config.paths.daemon_socket))
+    stale.close()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        server = RenderDaemon(config.paths.daemon_socket, executor)
+        server.server_close()
+
+
+def test_run_build_captures_cli_output():
+    code, output = run_build(["--help"], os.getcwd())
+
+    assert code == 0
+    assert "--daemon" in output
+
+
+def test_builds_sharing_paths_run_one_at_a_time(config, tmp_path):
+    """Builds writing the same cache wait for each other; other checkouts don't."""
+    running = {}
+    overlaps = []
+    guard = threading.Lock()
+
+    def slow_build(argv, cwd):
+        with guard:
+            if running.get(cwd):
+                overlaps.append(cwd)
+            running[cwd] = running.get(cwd, 0) + 1
+            others = sum(1 for key, count in running.items() if count and key != cwd)
+        threading.Event().wait(0.1)
+        with guard:
+            running[cwd] -= 1
+        return 0, f"{others}\n"
+
+    first, second = tmp_path / "first", tmp_path / "second"
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        server = RenderDaemon(config.paths.daemon_socket, executor, runner=slow_build)
+        messages = [
+            {"command": "build", "argv": [], "cwd": str(first)},
+            {"command": "build", "argv": ["--output", "other.pdf"], "cwd": str(first)},
+            {"command": "build", "argv": [], "cwd": str(second)},
+        ]
+        with ThreadPoolExecutor(max_workers=3) as clients:
+            replies = list(clients.map(server.handle_request_message, messages))
+        server.server_close()
+
+    assert overlaps == []
+    assert all(reply["exit"] == 0 for reply in replies)
+    # The other checkout's build ran alongside one from the first
+    assert replies[2]["output"] == "1\n"
+
+
+def test_build_paths_follow_output_and_cwd(config, tmp_path):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        server = RenderDaemon(config.paths.daemon_socket, executor, paths=config.paths)
+        server.server_close()
+
+    assert server.build_paths(["--output", "out.pdf", "--incremental"], str(tmp_path)) == [
+        (tmp_path / "out.pdf").resolve(),
+        (tmp_path / config.paths.cache_dir).resolve(),
+    ]
@@ -0,0 +1,105 @@
+"""Tests for the on-disk extraction cache."""
+
+import os
+
+from extractors.blog import BlogExtractor
+from extractors.cache import ExtractionCache
+from extractors.sphinx import SphinxExtractor
+
+
+def test_unchanged_page_loads_from_cache(config, sphinx_html_file, monkeypatch):
+    """A second extraction of an unchanged file skips parsing entirely."""
+    config.paths.docs_dir = sphinx_html_file.parent.parent
+    first = SphinxExtractor(config)._extract_page(sphinx_html_file, "testproject")
+
+    ext = SphinxExtractor(config)
+    monkeypatch.setattr(ext, "strip_elements", lambda soup: 1 / 0)
+    second = ext._extract_page(sphinx_html_file, "testproject")
+
+    assert second == first
+
+
+def test_changed_page_misses_cache(config, sphinx_html_file):
+    config.paths.docs_dir = sphinx_html_file.parent.parent
+    SphinxExtractor(config)._extract_page(sphinx_html_file, "testproject")
+
+    sphinx_html_file.write_text(
+        sphinx_html_file.read_text().replace("Test Page Title", "Edited Title")
+    )
+    section = SphinxExtractor(config)._extract_page(sphinx_html_file, "testproject")
+
+    assert section.title == "Edited Title"
+
+
+def test_page_is_not_cached_while_an_image_is_missing(config, sphinx_html_file):
+    """A page extracted before its image existed resolves the image once it appears."""
+    config.paths.docs_dir = sphinx_html_file.parent.parent
+    sphinx_html_file.write_text(
+        sphinx_html_file.read_text().replace("</h1>", '</h1><img src="_images/late.png">', 1)
+    )
+    image = sphinx_html_file.parent / "_images" / "late.png"
+
+    before = SphinxExtractor(config)._extract_page(sphinx_html_file, "testproject")
+    image.parent.mkdir()
+    image.write_bytes(b"png")
+    after = SphinxExtractor(config)._extract_page(sphinx_html_file, "testproject")
+    image.unlink()
+    removed = SphinxExtractor(config)._extract_page(sphinx_html_file, "testproject")
+
+    assert 'src="_images/late.png"' in before.html_content
+    assert f'src="file://{image}"' in after.html_content
+    assert 'src="_images/late.png"' in removed.html_content
+
+
+def test_key_depends_on_selectors_and_version(config, tmp_path):
+    source = tmp_path / "page.html"
+    data = b"<p>content</p>"
+    key = ExtractionCache(config, "SphinxExtractor", "1").key(source, data)
+
+    assert ExtractionCache(config, "SphinxExtractor", "2").key(source, data) != key
+
+    config.selectors.strip = config.selectors.strip + (".extra",)
+    assert ExtractionCache(config, "SphinxExtractor", "1").key(source, data) != key
+
+
+def test_blog_post_loads_from_cache(config, blog_dir_with_post):
+    config.paths.blog_dir = blog_dir_with_post
+    first = BlogExtractor(config).extract()
+    second = BlogExtractor(config).extract()
+
+    assert second == first
+    assert len(list((config.paths.cache_dir / "extract").glob("*.json"))) == 1
+
+
+def test_disabled_cache_writes_nothing(config, sphinx_html_file):
+    config.cache.enabled = False
+    config.paths.docs_dir = sphinx_html_file.parent.parent
+    SphinxExtractor(config)._extract_page(sphinx_html_file, "testproject")
+
+    assert not config.paths.cache_dir.exists()
+
+
+def test_evict_removes_oldest_entries_over_cap(config):
+    cache = ExtractionCache(config, "SphinxExtractor", "1")
+    for i in range(4):
+        cache.put(f"key{i}", {"payload": "x" * 1000})
+        entry = cache.cache_dir / f"key{i}.json"
+        os.utime(entry, (i, i))
+
+    config.cache.max_bytes = 2500
+    removed = cache.evict()
+
+    remaining = sorted(p.stem for p in cache.cache_dir.glob("*.json"))
+    assert removed == 2
+    assert remaining == ["key2", "key3"]
+
+
+def test_verbose_reports_hits_and_misses(config, sphinx_html_file, capsys):
+    config.verbose = True
+    config.paths.docs_dir = sphinx_html_file.parent.parent
+    SphinxExtractor(config)._extract_page(sphinx_html_file, "testproject")
+    SphinxExtractor(config)._extract_page(sphinx_html_file, "testproject")
+
+    out = capsys.readouterr().out
+    assert "Cache miss: sample.html" in out
+    assert "Cache hit: sample.html" in out
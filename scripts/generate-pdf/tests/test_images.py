@@ -0,0 +1,114 @@
+"""Tests for image optimization before rendering."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from images import ImageOptimizer, content_width_px
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _save_image(path, size, image_format="PNG"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A gradient, so the image doesn't compress to nothing
+    image = Image.linear_gradient("L").resize(size).convert("RGB")
+    image.save(path, image_format)
+    return path
+
+
+def test_content_width_for_a4_at_150_dpi(config):
+    # 210mm - 2 * 20mm margins = 170mm = 6.69in
+    assert content_width_px(config) == 1004
+
+    config.images.dpi = 50  # Never below the CSS pixel density
+    assert content_width_px(config) == 643
+
+
+def test_wide_image_is_downsampled_to_content_width(config, tmp_path):
+    source = _save_image(tmp_path / "docs" / "_images" / "diagram.png", (3000, 1500))
+    optimizer = ImageOptimizer(config)
+
+    optimized = optimizer.optimize(source)
+
+    assert optimized.parent == config.paths.cache_dir / "images"
+    assert optimized.stat().st_size < source.stat().st_size
+    with Image.open(optimized) as image:
+        assert image.size == (1004, 502)
+
+
+def test_identical_images_share_one_file(config, tmp_path):
+    first = _save_image(tmp_path / "a" / "photo.jpg", (2000, 1000), "JPEG")
+    second = tmp_path / "b" / "copy.jpg"
+    second.parent.mkdir()
+    second.write_bytes(first.read_bytes())
+
+    html = f'<p><img alt="a" src="file://{first}"></p><img src="file://{second}"/>'
+    rewritten = ImageOptimizer(config).rewrite_html(html)
+
+    optimized = list((config.paths.cache_dir / "images").iterdir())
+    assert len(optimized) == 1
+    assert rewritten.count(f'src="file://{optimized[0]}"') == 2
+
+
+def test_changed_image_gets_new_url(config, tmp_path):
+    source = _save_image(tmp_path / "img.png", (1200, 600))
+    optimizer = ImageOptimizer(config)
+    before = optimizer.optimize(source)
+
+    _save_image(source, (1300, 600))
+    after = optimizer.optimize(source)
+
+    assert before != after
+
+
+def test_untouched_sources(config, tmp_path):
+    """Remote, missing and non-raster images keep their original URL."""
+    svg = tmp_path / "figure.svg"
+    svg.write_text('<svg xmlns="http://www.w3.org/2000/svg"></svg>')
+    html = (
+        '<img src="https://example.com/a.png">'
+        f'<img src="file://{tmp_path / "missing.png"}">'
+        f'<img src="file://{svg}">'
+    )
+
+    assert ImageOptimizer(config).rewrite_html(html) == html
+
+    config.images.enabled = False
+    png = _save_image(tmp_path / "big.png", (3000, 100))
+    disabled = f'<img src="file://{png}">'
+    assert ImageOptimizer(config).rewrite_html(disabled) == disabled
+
+
+def test_evict_keeps_recently_used_copies(config, tmp_path):
+    optimizer = ImageOptimizer(config)
+    sources = [_save_image(tmp_path / f"{i}.png", (2000 + i, 1000)) for i in range(3)]
+    copies = [optimizer.optimize(source) for source in sources]
+    for i, copy in enumerate(copies):
+        os.utime(copy, (i, i))
+
+    # Reusing the oldest copy marks it as recently used
+    assert ImageOptimizer(config).optimize(sources[0]) == copies[0]
+    config.cache.max_bytes = copies[0].stat().st_size
+
+    assert optimizer.evict() == 2
+    assert sorted(optimizer.cache_dir.iterdir()) == [copies[0]]
+
+
+def test_temporary_files_are_unique_per_write(config, tmp_path, monkeypatch):
+    """Writers never share a temporary file, even in one process."""
+    temps = []
+    original = Path.write_bytes
+
+    def write_bytes(self, data):
+        temps.append(self.name)
+        return original(self, data)
+
+    monkeypatch.setattr(Path, "write_bytes", write_bytes)
+    for i in range(2):
+        ImageOptimizer(config).optimize(_save_image(tmp_path / f"{i}.png", (2000, 1000 + i)))
+
+    temps = [name for name in temps if name.endswith(".tmp")]
+    assert len(temps) == 2 and len(set(temps)) == 2
+    assert all(f".{os.getpid()}." in name for name in temps)
@@ -0,0 +1,274 @@
+"""Tests for chunk planning and rendering in incremental PDF builds."""
+
+import itertools
+import re
+from io import BytesIO
+
+import pytest
+
+from extractors.base import ContentSection
+from images import ImageOptimizer
+from pdf_builder import PDFBuilder
+from incremental import Chunk, IncrementalPDFBuilder, RenderedChunk, page_offsets
+from profiling import NULL_PROFILER
+
+
+@pytest.fixture
+def builder(config):
+    """IncrementalPDFBuilder without WeasyPrint (rendering is not exercised)."""
+    b = object.__new__(IncrementalPDFBuilder)
+    b.config = config
+    b.draft = False
+    b.offline = False
+    b.profiler = NULL_PROFILER
+    b.chunk_dir = config.paths.cache_dir / "pdf"
+    b.chunk_dir.mkdir(parents=True)
+    b.state_path = b.chunk_dir / "state.json"
+    b.rendered_count = 0
+    b.known_page_counts = {}
+    b.images = ImageOptimizer(config)
+    return b
+
+
+def _section(section_id, title="Page"):
+    return ContentSection(id=section_id, title=title, html_content=f"<p>{title}</p>", anchor=section_id)
+
+
+def test_chunk_key_changes_when_an_image_is_replaced(builder, tmp_path):
+    image = tmp_path / "diagram.svg"
+    image.write_text("<svg/>")
+    html = f'<p><img alt="" src="file://{image}"/></p>'
+    before = builder._chunk_paths(html)
+
+    image.write_text("<svg><rect/></svg>")
+
+    assert builder._chunk_paths(html) != before
+    assert builder._chunk_paths("<p>no images</p>") == builder._chunk_paths("<p>no images</p>")
+
+
+def test_page_offsets():
+    assert page_offsets([3, 1, 4], start=2) == [2, 5, 6]
+    assert page_offsets([]) == []
+
+
+def test_plan_chunks_one_per_project_then_blog(builder):
+    docs = [_section("meta-principles"), _section("airgap-transfer-index"), _section("airgap-transfer-api")]
+    blog = [_section("blog-a"), _section("blog-b")]
+
+    chunks = builder._plan_chunks(blog, docs)
+
+    assert [c.name for c in chunks] == ["docs", "docs-meta", "docs-airgap-transfer", "blog"]
+    assert [s.id for s in chunks[2].sections] == ["airgap-transfer-index", "airgap-transfer-api"]
+    assert "project-cover-page" in chunks[2].body_html
+
+
+def test_blog_edit_only_changes_blog_chunk(builder):
+    docs = [_section("meta-principles")]
+    before = builder._plan_chunks([_section("blog-a", "Old")], docs)
+    after = builder._plan_chunks([_section("blog-a", "New")], docs)
+
+    changed = [b.name for b, a in zip(before, after) if b.body_html != a.body_html]
+    assert changed == ["blog"]
+
+
+def test_chunk_html_starts_page_counter_at_offset(builder):
+    html = builder._chunk_html(Chunk("blog", "<p>x</p>"), offset=12)
+    assert "counter-reset: page 13" in html
+
+    assert "counter-reset: page" not in builder._chunk_html(Chunk("front", "<p>x</p>"), offset=0)
+
+
+def test_toc_uses_static_page_numbers_when_known(builder):
+    docs = [_section("meta-principles", "Principles")]
+    html = builder._build_toc_html([], docs, {"meta-principles": 7})
+
+    assert 'class="toc-entry-title toc-static" data-page="7"' in html
+    # WeasyPrint drops links to anchors outside the chunk; the merge restores them
+    assert 'href="chunk-anchor:meta-principles"' in html
+    # Intro anchors live in the same chunk and keep using target-counter()
+    assert '<a href="#intro-about" class="toc-entry-title">' in html
+
+
+def _fake_pdf(html: str) -> bytes:
+    """A blank PDF with one page per section, standing in for WeasyPrint."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for _ in range(1 + html.count('class="content-section"')):
+        writer.add_blank_page(width=100, height=100)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_parallel_render_fixes_offsets_like_sequential(builder, monkeypatch):
+    """Chunks rendered at guessed offsets are re-rendered at their real ones."""
+    pytest.importorskip("pypdf")
+    docs = [_section("meta-a"), _section("meta-b"), _section("airgap-deploy-api")]
+    blog = [_section("blog-a"), _section("blog-b"), _section("blog-c")]
+    chunks = builder._plan_chunks(blog, docs)
+
+    rendered_at = []
+
+    def render_many(htmls):
+        rendered_at.extend(re.search(r"counter-reset: page (\d+)", html).group(1) for html in htmls)
+        return [_fake_pdf(html) for html in htmls]
+
+    monkeypatch.setattr(builder, "_render", _fake_pdf)
+    sequential = builder._render_content_chunks(chunks, front_pages=3)
+
+    builder.config.render_jobs = 4
+    monkeypatch.setattr(builder, "_render_many", render_many)
+    for path in builder.chunk_dir.iterdir():
+        path.unlink()
+    parallel = builder._render_content_chunks(chunks, front_pages=3)
+
+    assert [(c.name, c.page_count, c.pdf_path.name) for c in parallel] == [
+        (c.name, c.page_count, c.pdf_path.name) for c in sequential
+    ]
+    # One page per chunk is guessed at first; then only the moved chunks re-render
+    assert rendered_at == ["4", "5", "6", "7", "8", "10"]
+
+
+def test_parallel_render_uses_previous_page_counts(builder, monkeypatch):
+    """With last run's page counts every offset is right on the first pass."""
+    pytest.importorskip("pypdf")
+    chunks = builder._plan_chunks([_section("blog-a")], [_section("meta-a"), _section("meta-b")])
+    builder.config.render_jobs = 4
+    builder.known_page_counts = {"docs": 1, "docs-meta": 3, "blog": 2}
+
+    batches = []
+
+    def render_many(htmls):
+        batches.append(len(htmls))
+        return [_fake_pdf(html) for html in htmls]
+
+    monkeypatch.setattr(builder, "_render_many", render_many)
+    rendered = builder._render_content_chunks(chunks, front_pages=2)
+
+    assert batches == [3]
+    assert [c.page_count for c in rendered] == [1, 3, 2]
+
+
+def _fake_front(front_page_counts):
+    """Render the front matter with the given page counts, pass by pass."""
+    counts = iter(front_page_counts)
+
+    def render(html):
+        from pypdf import PdfWriter
+
+        if "counter-reset: page" in html:
+            return _fake_pdf(html)
+        writer = PdfWriter()
+        for _ in range(next(counts)):
+            writer.add_blank_page(width=100, height=100)
+        buffer = BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    return render
+
+
+def test_content_is_laid_out_after_the_settled_front_matter(builder, monkeypatch):
+    pytest.importorskip("pypdf")
+    passes = itertools.count()
+    monkeypatch.setattr(builder, "_build_front_html", lambda *args: f"<p>pass {next(passes)}</p>")
+    monkeypatch.setattr(builder, "_render", _fake_front([3, 3]))
+    merged = []
+    monkeypatch.setattr(builder, "_merge", lambda chunks, *args: merged.extend(chunks))
+
+    builder.build([_section("blog-a")], [], {}, builder.config.paths.output_path)
+
+    # Guessed one front page, found three, then laid the blog out after them
+    blog = builder._plan_chunks([_section("blog-a")], [])[0]
+    assert merged[1].pdf_path == builder._chunk_paths(builder._chunk_html(blog, offset=3))[0]
+    assert builder._load_state()["front_pages"] == 3
+
+
+def test_unsettled_front_matter_fails_instead_of_merging(builder, monkeypatch):
+    pytest.importorskip("pypdf")
+    passes = itertools.count()
+    monkeypatch.setattr(builder, "_build_front_html", lambda *args: f"<p>pass {next(passes)}</p>")
+    # The table of contents keeps changing length with its own page numbers
+    monkeypatch.setattr(builder, "_render", _fake_front([2, 3, 2]))
+    output_path = builder.config.paths.output_path
+
+    with pytest.raises(RuntimeError, match="did not settle"):
+        builder.build([_section("blog-a")], [], {}, output_path)
+
+    assert not output_path.exists()
+
+
+def _link_targets(path):
+    """(page index, target page index) of every internal link in a PDF."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    page_ids = [page.indirect_reference.idnum for page in reader.pages]
+    targets = []
+    for index, page in enumerate(reader.pages):
+        for annot in page.get("/Annots", []):
+            annot = annot.get_object()
+            action = annot.get("/A")
+            dest = annot.get("/Dest")
+            if dest is None and action is not None:
+                dest = action.get_object().get("/D")
+            if dest is None:
+                continue
+            if isinstance(dest, str):
+                target = reader.get_destination_page_number(reader.named_destinations[dest])
+            else:
+                target = page_ids.index(dest[0].idnum)
+            targets.append((index, target))
+    return sorted(targets)
+
+
+def test_merge_points_toc_links_at_other_chunks(builder, tmp_path):
+    pytest.importorskip("pypdf")
+    from pypdf import PdfWriter
+    from pypdf.annotations import Link
+
+    front = PdfWriter()
+    front.add_blank_page(width=100, height=100)
+    for anchor in ("blog-b", "gone"):
+        front.add_annotation(0, Link(rect=(0, 0, 10, 10), url=f"chunk-anchor:{anchor}"))
+    front.write(tmp_path / "front.pdf")
+
+    blog = PdfWriter()
+    for _ in range(3):
+        blog.add_blank_page(width=100, height=100)
+    blog.add_named_destination("blog-a", 0)
+    blog.add_named_destination("blog-b", 2)
+    blog.write(tmp_path / "blog.pdf")
+
+    chunks = [
+        RenderedChunk("front", tmp_path / "front.pdf", 1, {}),
+        RenderedChunk("blog", tmp_path / "blog.pdf", 3, {"blog-a": 0, "blog-b": 2}),
+    ]
+    output_path = tmp_path / "merged.pdf"
+    builder._merge(chunks, output_path, [_section("blog-a"), _section("blog-b")], [])
+
+    # The link into the blog chunk jumps to its anchor; the dangling one is gone
+    assert _link_targets(output_path) == [(0, 3)]
+
+
+def test_incremental_build_matches_full_build(config, tmp_path):
+    """Same pages, footer and TOC page numbers and TOC link targets."""
+    pytest.importorskip("weasyprint")
+    from pypdf import PdfReader
+
+    body = "".join(f"<p>Paragraph {i} of a page long enough to wrap.</p>" for i in range(60))
+    docs = [
+        ContentSection(id=section_id, title=section_id, html_content=body, anchor=section_id)
+        for section_id in ("meta-principles", "airgap-deploy-index", "airgap-deploy-api")
+    ]
+    blog = [ContentSection(id="blog-a", title="Post", html_content=body, anchor="blog-a")]
+
+    full = PDFBuilder(config).build(blog, docs, {}, tmp_path / "full.pdf")
+    incremental = IncrementalPDFBuilder(config).build(blog, docs, {}, tmp_path / "incremental.pdf")
+
+    full_pages = [page.extract_text() for page in PdfReader(full).pages]
+    incremental_pages = [page.extract_text() for page in PdfReader(incremental).pages]
+    assert len(incremental_pages) == len(full_pages)
+    assert incremental_pages == full_pages
+    assert _link_targets(incremental) == _link_targets(full)
@@ -0,0 +1,167 @@
+"""Tests for the docs tree manifest."""
+
+import os
+import shutil
+from pathlib import Path
+
+import extractors.base as base
+from extractors.manifest import DocsManifest
+from extractors.sphinx import MANIFEST_FILENAME, SphinxExtractor
+
+
+def make_tree(root: Path) -> None:
+    for name in ["index.html", "b.html", "a.html", "notes.txt", "sub/c.html", "sub/img/x.png"]:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+
+
+def test_scan_records_files_and_dirs(tmp_path):
+    make_tree(tmp_path)
+
+    manifest = DocsManifest.scan(tmp_path)
+
+    assert manifest.dirs == {"", "sub", "sub/img"}
+    assert manifest.files["sub/c.html"][1] == len("sub/c.html")
+    assert manifest.is_file(tmp_path / "sub" / ".." / "a.html")
+    assert not manifest.is_file(tmp_path / "sub")
+    assert manifest.is_dir(tmp_path / "sub" / "img")
+    assert not manifest.symlinks
+
+
+def test_scan_missing_root(tmp_path):
+    manifest = DocsManifest.scan(tmp_path / "missing")
+
+    assert manifest.files == {} and manifest.dirs == set()
+    assert not manifest.is_dir(tmp_path / "missing")
+
+
+def test_files_in_matches_sorted_glob(tmp_path):
+    make_tree(tmp_path)
+    manifest = DocsManifest.scan(tmp_path)
+
+    for directory in (tmp_path, tmp_path / "sub", tmp_path / "nope"):
+        assert manifest.files_in(directory, ".html") == sorted(directory.glob("*.html"))
+
+
+def test_symlinks_fall_back_to_the_filesystem(tmp_path):
+    make_tree(tmp_path / "docs")
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "d.html").write_text("d")
+    os.symlink(tmp_path / "shared", tmp_path / "docs" / "shared")
+
+    manifest = DocsManifest.scan(tmp_path / "docs")
+
+    assert manifest.symlinks
+    assert manifest.is_file(tmp_path / "docs" / "shared" / "d.html")
+    assert manifest.resolve(tmp_path / "docs" / "shared" / "d.html") == tmp_path / "shared" / "d.html"
+
+
+def test_save_load_and_changes(tmp_path):
+    make_tree(tmp_path / "docs")
+    path = tmp_path / "manifest.json"
+    manifest = DocsManifest.scan(tmp_path / "docs")
+    manifest.record_key(tmp_path / "docs" / "a.html", "key-a", [tmp_path / "docs" / "sub" / "img" / "x.png"])
+    manifest.save(path, "fp")
+
+    assert DocsManifest.load(path, tmp_path / "docs", "other") is None
+    assert DocsManifest.load(path, tmp_path / "elsewhere", "fp") is None
+    previous = DocsManifest.load(path, tmp_path / "docs", "fp")
+    assert previous.files == manifest.files
+    assert previous.images == {"a.html": [str(tmp_path / "docs" / "sub" / "img" / "x.png")]}
+
+    (tmp_path / "docs" / "b.html").write_text("changed")
+    (tmp_path / "docs" / "new.html").write_text("new")
+    (tmp_path / "docs" / "notes.txt").unlink()
+    current = DocsManifest.scan(tmp_path / "docs")
+
+    assert current.changes(previous) == {
+        tmp_path / "docs" / name for name in ["b.html", "new.html", "notes.txt"]
+    }
+    assert previous.cached_key(tmp_path / "docs" / "a.html", current) == "key-a"
+    assert previous.cached_key(tmp_path / "docs" / "b.html", current) is None
+
+
+def test_unchanged_pages_are_not_read_again(config, tmp_path, fixtures_dir, monkeypatch):
+    project_dir = tmp_path / "docs" / "proj"
+    project_dir.mkdir(parents=True)
+    for name in ["index.html", "other.html"]:
+        shutil.copy(fixtures_dir / "sample-sphinx.html", project_dir / name)
+    config.doc_order.projects = ["proj"]
+
+    first = SphinxExtractor(config).extract()
+    assert (config.paths.cache_dir / MANIFEST_FILENAME).exists()
+
+    (project_dir / "other.html").write_text(
+        (fixtures_dir / "sample-sphinx.html").read_text(encoding="utf-8") + "\n"
+    )
+    read = []
+    original = SphinxExtractor._extract_keyed
+
+    def extract_keyed(self, html_file, project):
+        read.append(html_file.name)
+        return original(self, html_file, project)
+
+    monkeypatch.setattr(SphinxExtractor, "_extract_keyed", extract_keyed)
+    second = SphinxExtractor(config).extract()
+
+    assert read == ["other.html"]
+    assert [section.to_dict() for section in second] == [section.to_dict() for section in first]
+
+
+def test_pages_are_read_again_when_their_images_change(config, tmp_path, fixtures_dir, monkeypatch):
+    project_dir = tmp_path / "docs" / "proj"
+    (project_dir / "_images").mkdir(parents=True)
+    image = project_dir / "_images" / "diagram.png"
+    image.write_bytes(b"png")
+    html = (fixtures_dir / "sample-sphinx.html").read_text(encoding="utf-8")
+    (project_dir / "index.html").write_text(
+        html.replace("</h1>", '</h1><img src="_images/diagram.png">', 1)
+    )
+    (project_dir / "other.html").write_text(html)
+    config.doc_order.projects = ["proj"]
+
+    first = SphinxExtractor(config).extract()
+    assert first[0].images == [image]
+
+    image.write_bytes(b"a larger png")
+    read = []
+    original = SphinxExtractor._extract_keyed
+
+    def extract_keyed(self, html_file, project):
+        read.append(html_file.name)
+        return original(self, html_file, project)
+
+    monkeypatch.setattr(SphinxExtractor, "_extract_keyed", extract_keyed)
+    SphinxExtractor(config).extract()
+
+    assert read == ["index.html"]
+
+
+def test_workers_reuse_the_parent_manifest(config, sphinx_html_file, monkeypatch):
+    parent = SphinxExtractor(config)
+    state = parent.worker_state()
+
+    def no_scan(root):
+        raise AssertionError("rescanned in a worker")
+
+    monkeypatch.setattr(DocsManifest, "scan", staticmethod(no_scan))
+    base._init_worker(SphinxExtractor, config, state)
+
+    assert base._worker_extractor.manifest.files == parent.manifest.files
+
+
+def test_images_resolve_from_the_manifest(config, sphinx_html_file, monkeypatch):
+    image = sphinx_html_file.parent / "_images" / "x.png"
+    image.parent.mkdir()
+    image.write_bytes(b"png")
+    extractor = SphinxExtractor(config)
+    extractor.manifest  # Scan before resolve() is disabled
+
+    def no_resolve(self, strict=False):
+        raise AssertionError("resolve() called")
+
+    monkeypatch.setattr(Path, "resolve", no_resolve)
+
+    assert extractor.image_source("sub/../_images/x.png", sphinx_html_file) == f"file://{image}"
+    assert extractor.image_source("_images/missing.png", sphinx_html_file) == "_images/missing.png"
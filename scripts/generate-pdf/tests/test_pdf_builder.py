@@ -0,0 +1,247 @@
+"""Tests for PDFBuilder HTML and CSS generation (no rendering)."""
+
+import pytest
+
+from images import ImageOptimizer
+from pdf_builder import OfflineError, PDFBuilder
+
+
+@pytest.fixture
+def builder(config):
+    """PDFBuilder without WeasyPrint (rendering is not exercised)."""
+    b = object.__new__(PDFBuilder)
+    b.config = config
+    b.draft = False
+    b.offline = False
+    b.blocked_urls = []
+    b.images = ImageOptimizer(config)
+    return b
+
+
+def test_base_css_does_not_fetch_google_fonts(builder):
+    assert "fonts.googleapis.com" not in builder._get_base_css()
+
+
+def test_static_css_is_not_inlined(builder):
+    """Base, cover, TOC and bookmark CSS are passed to WeasyPrint pre-parsed."""
+    static = builder._get_static_css()
+    for css in (builder._get_base_css(), builder._get_cover_css(),
+                builder._get_toc_css(), builder._get_bookmark_css()):
+        assert css in static
+    start = builder._document_start("@page :first { counter-reset: page 5; }")
+    assert "counter-reset: page 5" in start
+    assert builder._get_base_css() not in start
+
+
+def test_builders_share_parsed_stylesheets(config):
+    pytest.importorskip("weasyprint")
+    first, second = PDFBuilder(config), PDFBuilder(config)
+    assert first.stylesheets[1] is second.stylesheets[1]
+    assert PDFBuilder(config, draft=True).stylesheets[1] is not first.stylesheets[1]
+
+
+def test_font_face_uses_bundled_files(builder, tmp_path):
+    font_dir = tmp_path / "fonts"
+    font_dir.mkdir()
+    (font_dir / "Inter-Regular.woff2").write_bytes(b"")
+    (font_dir / "Inter-Bold.ttf").write_bytes(b"")
+    builder.config.fonts.font_dir = font_dir
+
+    css = builder._get_font_face_css()
+
+    assert css.count("@font-face") == 2
+    assert f'url("{(font_dir / "Inter-Regular.woff2").as_uri()}")' in css
+    assert "font-weight: 700" in css
+    assert "file://" in css
+
+
+def test_font_face_empty_without_font_files(builder, tmp_path, capsys):
+    builder.config.fonts.font_dir = tmp_path / "missing"
+    assert builder._get_font_face_css() == ""
+    assert "Bundled font not found: Inter-Regular" in capsys.readouterr().out
+
+
+def test_missing_font_fails_offline_build(builder, tmp_path):
+    builder.config.fonts.font_dir = tmp_path / "missing"
+    builder.offline = True
+    with pytest.raises(OfflineError, match="Inter-Regular"):
+        builder._get_font_face_css()
+
+
+def test_bundled_fonts_are_committed(builder, config):
+    """Every configured face ships in fonts/, along with the OFL license."""
+    font_dir = config.fonts.font_dir
+    for _, stem in config.fonts.inter_faces:
+        assert builder._find_font_file(stem) is not None, stem
+    assert (font_dir / "LICENSE.txt").exists()
+
+
+@pytest.mark.parametrize("html", [
+    '<img src="https://example.com/logo.png">',
+    "<img srcset='//cdn.example.com/a.png 2x'>",
+    '<link rel="stylesheet" href="http://example.com/a.css">',
+    "<style>@import url('https://fonts.googleapis.com/css2?family=Inter');</style>",
+    '<div style="background: url(https://example.com/bg.png)"></div>',
+])
+def test_offline_check_rejects_network_resources(builder, html):
+    with pytest.raises(OfflineError):
+        builder._check_offline(html)
+
+
+def test_offline_check_allows_local_resources_and_links(builder):
+    html = (
+        '<a href="https://example.com">external link</a>'
+        '<img src="file:///tmp/diagram.png">'
+        '<img src="data:image/png;base64,AAAA">'
+        '<svg xmlns="http://www.w3.org/2000/svg"></svg>'
+    )
+    builder._check_offline(html)
+
+
+def test_complete_document_passes_offline_check(builder):
+    html = builder._build_complete_document([], [], {})
+    builder._check_offline(html)
+
+
+def test_outline_entries_in_document_order(builder):
+    """Elements marked for WeasyPrint's native outline mirror the PDF structure."""
+    from bs4 import BeautifulSoup
+
+    from extractors.base import ContentSection
+
+    docs = [
+        ContentSection(id="meta-principles", title="Principles", html_content="<h1>P</h1>"),
+        ContentSection(id="airgap-deploy-api", title="API", html_content="<h1>A</h1>"),
+    ]
+    blog = [ContentSection(id="blog-post", title='Post "One"', html_content="<h1>B</h1>")]
+
+    soup = BeautifulSoup(builder._build_complete_document(blog, docs, {}), "html.parser")
+    outline = [
+        (int(el["data-bookmark-level"]), el["data-bookmark-label"])
+        for el in soup.select("[data-bookmark-level]")
+    ]
+
+    assert outline == [
+        (1, "Cover"),
+        (1, "Table of Contents"),
+        (1, "Introduction"),
+        (2, "Core Principles"),
+        (2, "Our Tools"),
+        (2, "Technical Philosophy"),
+        (1, "Technical Documentation"),
+        (2, "Cross-Project Information"),
+        (3, "Principles"),
+        (2, "AirGap Deploy"),
+        (3, "API"),
+        (1, "Blog Posts"),
+        (2, 'Post "One"'),
+    ]
+
+
+def test_headings_do_not_create_bookmarks(builder):
+    assert "bookmark-level: none" in builder._get_bookmark_css()
+
+
+def test_spooled_document_matches_string_build(builder, tmp_path):
+    import tempfile
+
+    from extractors.base import ContentSection
+
+    docs = [ContentSection(id="meta-principles", title="Principles", html_content="<h1>P ✓</h1>")]
+    blog = [ContentSection(id="blog-post", title="Post", html_content="<h1>B</h1>")]
+
+    with tempfile.SpooledTemporaryFile() as spool:
+        builder._spool_document(spool, blog, docs, {})
+        spooled = spool.read().decode("utf-8")
+
+    assert spooled == builder._build_complete_document(blog, docs, {})
+
+
+def test_sections_can_be_consumed_as_they_arrive(builder):
+    """Generators give the same document as lists, and are read only once."""
+    import tempfile
+
+    from extractors.base import ContentSection
+
+    docs = [
+        ContentSection(id="meta-principles", title="Principles", html_content="<h1>P</h1>"),
+        ContentSection(id="airgap-deploy-api", title="API", html_content="<h1>A ✓</h1>"),
+    ]
+    blog = [ContentSection(id="blog-post", title="Post", html_content="<h1>B</h1>")]
+
+    with tempfile.SpooledTemporaryFile() as spool:
+        builder._spool_document(spool, iter(blog), (section for section in docs), {})
+        streamed = spool.read().decode("utf-8")
+
+    assert streamed == builder._build_complete_document(blog, docs, {})
+    assert streamed.index('href="#airgap-deploy-api"') < streamed.index('id="meta-principles"')
+
+
+def test_spooled_offline_check_rejects_network_resources(builder):
+    import tempfile
+
+    from extractors.base import ContentSection
+
+    builder.offline = True
+    docs = [ContentSection(id="meta-a", title="A", html_content='<img src="https://x.test/a.png">')]
+
+    with tempfile.SpooledTemporaryFile() as spool, pytest.raises(OfflineError):
+        builder._spool_document(spool, [], docs, {})
+
+
+def test_spooling_memory_stays_flat_as_docs_grow(builder, monkeypatch):
+    """Peak memory while assembling the document doesn't scale with its size."""
+    import tempfile
+    import tracemalloc
+
+    import pdf_builder
+    from extractors.base import ContentSection
+
+    monkeypatch.setattr(pdf_builder, "SPOOL_MAX_BYTES", 256 * 1024)
+    page_html = "<p>" + "x" * 20_000 + "</p>"
+
+    def peak_while_spooling(pages: int) -> int:
+        docs = [
+            ContentSection(id=f"meta-page-{i}", title=f"Page {i}", html_content=page_html)
+            for i in range(pages)
+        ]
+        tracemalloc.start()
+        try:
+            with tempfile.SpooledTemporaryFile(max_size=pdf_builder.SPOOL_MAX_BYTES) as spool:
+                builder._spool_document(spool, [], docs, {})
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    small = peak_while_spooling(50)    # ~1 MB of page HTML
+    large = peak_while_spooling(400)   # ~8 MB of page HTML
+
+    assert large < 1024 * 1024
+    assert large < small * 2
+
+
+@pytest.mark.parametrize("incremental, expected", [(False, "PDFBuilder"), (True, "IncrementalPDFBuilder")])
+def test_render_jobs_need_incremental(config, monkeypatch, capsys, incremental, expected):
+    """--render-jobs alone keeps the single-pass build and its clickable TOC."""
+    import incremental as incremental_module
+    import pdf_builder
+
+    built = []
+
+    def recording(name):
+        class Builder:
+            def __init__(self, config, **kwargs):
+                built.append(name)
+
+            def build(self, *args):
+                return None
+        return Builder
+
+    monkeypatch.setattr(pdf_builder, "PDFBuilder", recording("PDFBuilder"))
+    monkeypatch.setattr(incremental_module, "IncrementalPDFBuilder", recording("IncrementalPDFBuilder"))
+    config.render_jobs = 4
+
+    pdf_builder.build_pdf([], [], {}, config=config, incremental=incremental)
+
+    assert built == [expected]
+    assert ("only applies to --incremental" in capsys.readouterr().out) is not incremental
@@ -0,0 +1,76 @@
+"""Tests for stage-level profiling."""
+
+import json
+import shutil
+
+import pytest
+
+from extractors.sphinx import SphinxExtractor
+from profiling import NULL_PROFILER, Profiler
+
+
+def test_nested_stages_are_recorded(tmp_path):
+    profiler = Profiler()
+    with profiler.stage("extract"):
+        with profiler.stage("meta"):
+            sum(range(10000))
+        with profiler.stage("transfer"):
+            pass
+    with profiler.stage("build"):
+        pass
+
+    assert [s.name for s in profiler.stages] == ["extract", "build"]
+    extract = profiler.stages[0]
+    assert [c.name for c in extract.children] == ["meta", "transfer"]
+    assert extract.wall_s >= extract.children[0].wall_s
+    assert extract.peak_rss_bytes >= extract.children[0].peak_rss_bytes > 0
+
+
+def test_report_is_json(tmp_path):
+    profiler = Profiler()
+    with profiler.stage("extract"):
+        with profiler.stage("meta"):
+            pass
+
+    report_path = tmp_path / "profile.json"
+    assert profiler.write(report_path) == [report_path]
+
+    report = json.loads(report_path.read_text())
+    stage = report["stages"][0]
+    assert stage["name"] == "extract"
+    assert set(stage) >= {"wall_s", "cpu_s", "children_cpu_s", "peak_rss_bytes", "stages"}
+    assert stage["stages"][0]["name"] == "meta"
+
+
+@pytest.mark.parametrize("dump,suffix", [("cprofile", ".prof"), ("tracemalloc", ".tracemalloc")])
+def test_dump_written_for_slowest_stage(tmp_path, dump, suffix):
+    profiler = Profiler(dump=dump)
+    with profiler.stage("fast"):
+        pass
+    with profiler.stage("slow"):
+        [str(i) for i in range(200000)]
+
+    written = profiler.write(tmp_path / "profile.json")
+
+    assert written[1] == tmp_path / f"profile-slow{suffix}"
+    assert written[1].stat().st_size > 0
+    assert json.loads(written[0].read_text())["dump"]["stage"] == "slow"
+
+
+def test_disabled_profiler_records_nothing():
+    with NULL_PROFILER.stage("anything") as stage:
+        assert stage is None
+    assert NULL_PROFILER.stages == []
+
+
+def test_sphinx_extraction_profiles_each_project(config, tmp_path, fixtures_dir):
+    for project in ["meta", "transfer"]:
+        project_dir = tmp_path / "docs" / project
+        project_dir.mkdir(parents=True)
+        shutil.copy(fixtures_dir / "sample-sphinx.html", project_dir / "principles.html")
+    config.paths.docs_dir = tmp_path / "docs"
+
+    profiler = Profiler()
+    SphinxExtractor(config, profiler).extract()
+
+    assert [s.name for s in profiler.stages] == list(config.doc_order.projects)
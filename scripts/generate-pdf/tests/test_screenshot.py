@@ -0,0 +1,111 @@
+"""Tests for screenshot targets and the fingerprint cache (no browser required)."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from config import ScreenshotTarget
+from screenshot import (
+    ScreenshotCapture, capture_screenshots, find_existing_screenshots, load_manifest,
+    save_manifest, screenshot_path, select_targets,
+)
+
+
+def test_default_targets_cover_hero_and_products(config):
+    names = [target.name for target in config.screenshot.targets]
+    assert names == ["hero", "products"]
+
+
+def test_screenshot_path_uses_target_name(config):
+    target = ScreenshotTarget("pricing", "#pricing", path="/pricing")
+    assert screenshot_path(config, target) == config.paths.screenshots_dir / "pricing.png"
+
+
+def test_find_existing_screenshots_only_returns_configured_targets(config):
+    config.paths.screenshots_dir.mkdir(parents=True)
+    (config.paths.screenshots_dir / "hero.png").write_bytes(b"png")
+    (config.paths.screenshots_dir / "stale.png").write_bytes(b"png")
+
+    assert find_existing_screenshots(config) == {
+        "hero": config.paths.screenshots_dir / "hero.png",
+    }
+
+
+def test_select_targets_filters_by_name(config):
+    assert [t.name for t in select_targets(config, ["products"])] == ["products"]
+    assert select_targets(config, ()) == ()
+    assert len(select_targets(config)) == len(config.screenshot.targets)
+
+
+def test_no_capture_when_builder_uses_no_screenshots(config):
+    # Returns before Playwright is needed, so this passes without it installed
+    assert config.screenshot.embedded == ()
+    assert capture_screenshots(config, names=config.screenshot.embedded) == {}
+
+
+class FakeElement:
+    """Stands in for a Playwright ElementHandle with fixed rendered state."""
+
+    def __init__(self, rendered):
+        self.rendered = rendered
+        self.captures = 0
+
+    async def scroll_into_view_if_needed(self):
+        pass
+
+    async def wait_for_element_state(self, state, timeout=None):
+        pass
+
+    async def evaluate(self, script):
+        return self.rendered
+
+    async def screenshot(self, path):
+        self.captures += 1
+        Path(path).write_bytes(b"png")
+
+
+class FakePage:
+    def __init__(self, element):
+        self.element = element
+
+    async def query_selector(self, selector):
+        return self.element
+
+
+@pytest.fixture
+def capture(config):
+    capture = object.__new__(ScreenshotCapture)
+    capture.config = config
+    config.paths.screenshots_dir.mkdir(parents=True)
+    return capture
+
+
+def test_unchanged_element_is_not_recaptured(capture, config):
+    target = config.screenshot.targets[0]
+    element = FakeElement("<section>Hero</section>")
+    manifest = {}
+
+    first = asyncio.run(capture._capture_element(FakePage(element), target, manifest))
+    second = asyncio.run(capture._capture_element(FakePage(element), target, manifest))
+
+    assert first == second == screenshot_path(config, target)
+    assert element.captures == 1
+    assert manifest[target.name]["file"] == "hero.png"
+
+
+def test_changed_element_is_recaptured(capture, config):
+    target = config.screenshot.targets[0]
+    manifest = {}
+
+    asyncio.run(capture._capture_element(FakePage(FakeElement("color:red")), target, manifest))
+    changed = FakeElement("color:blue")
+    asyncio.run(capture._capture_element(FakePage(changed), target, manifest))
+
+    assert changed.captures == 1
+
+
+def test_manifest_round_trip(config):
+    config.paths.screenshots_dir.mkdir(parents=True)
+    save_manifest(config, {"hero": {"fingerprint": "abc", "file": "hero.png"}})
+    assert load_manifest(config) == {"hero": {"fingerprint": "abc", "file": "hero.png"}}
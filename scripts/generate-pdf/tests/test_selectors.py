@@ -0,0 +1,82 @@
+"""Tests for the compiled strip-selector matcher."""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from benchmarks.synthetic import make_sphinx_page
+from config import Selectors
+from extractors.selectors import SimpleSelector, StripMatcher, compile_strip_selectors
+
+
+def strip_one_by_one(soup: BeautifulSoup, selectors: tuple) -> None:
+    """Reference behaviour: one select() pass per selector."""
+    for selector in selectors:
+        for element in soup.select(selector):
+            element.decompose()
+
+
+def test_matches_per_selector_stripping(fixtures_dir):
+    """The configured strip list removes exactly what separate selects did."""
+    selectors = Selectors().strip
+    pages = [
+        (fixtures_dir / "sample-sphinx.html").read_text(encoding="utf-8"),
+        make_sphinx_page(10).replace("</h1>", '</h1><div id="quality-bar"><nav>x</nav></div>'),
+    ]
+    for html in pages:
+        expected = BeautifulSoup(html, "html.parser")
+        strip_one_by_one(expected, selectors)
+
+        soup = BeautifulSoup(html, "html.parser")
+        compile_strip_selectors(selectors).strip(soup)
+
+        assert str(soup) == str(expected)
+
+
+def test_simple_selector_forms():
+    matcher = StripMatcher(("NAV", ".note", "#bar", "a.headerlink", "div#x"))
+    soup = BeautifulSoup(
+        '<nav></nav><p class="note tip"></p><p id="bar"></p>'
+        '<a class="headerlink"></a><span class="headerlink"></span><div id="x"></div><p id="x"></p>',
+        "html.parser",
+    )
+
+    found = sorted(str(element) for element in matcher.select(soup))
+
+    assert matcher.fallback is None
+    assert found == sorted([
+        "<nav></nav>", '<p class="note tip"></p>', '<p id="bar"></p>',
+        '<a class="headerlink"></a>', '<div id="x"></div>',
+    ])
+
+
+def test_complex_selectors_use_fallback():
+    """Attribute selectors and combinators are still honoured."""
+    matcher = StripMatcher(("script", '[role="navigation"]', "div > span"))
+    soup = BeautifulSoup(
+        '<div role="navigation"><span>a</span></div><div><span>b</span></div>'
+        "<span>keep</span><script>x</script>",
+        "html.parser",
+    )
+
+    matcher.strip(soup)
+
+    assert matcher.fallback is not None
+    assert str(soup) == "<div></div><span>keep</span>"
+
+
+def test_compiled_once_per_selector_list():
+    selectors = ("nav", "footer")
+    assert compile_strip_selectors(selectors) is compile_strip_selectors(selectors)
+
+
+def test_simple_selector_forms_without_a_tree():
+    attrs = {"class": ["rst-content", "wide"], "id": "main", "role": "main"}
+    matching = ['[role="main"]', "[role=main]", "[role]", "div[role='main']",
+                ".rst-content", "div.wide", "#main", "DIV"]
+    for selector in matching:
+        assert SimpleSelector(selector).matches_tag("div", attrs), selector
+    for selector in ['[role="nav"]', "[hidden]", "span[role=main]", ".rst", "#other"]:
+        assert not SimpleSelector(selector).matches_tag("div", attrs), selector
+
+    with pytest.raises(ValueError):
+        SimpleSelector("div > p")
@@ -2,6 +2,9 @@
 
 import shutil
 
+import pytest
+
+from extractors.base import HTML_PARSERS, available_html_parsers
 from extractors.sphinx import SphinxExtractor
 
 
@@ -140,3 +143,110 @@ def test_section_id_generation(config, sphinx_html_file):
 
     assert section is not None
     assert section.id == "testproject-sample"
+
+
+def test_extract_page_parses_once(config, sphinx_html_file, monkeypatch):
+    """The page is parsed a single time; later passes reuse the same tree."""
+    import extractors.base
+    import extractors.sphinx
+    from bs4 import BeautifulSoup
+
+    calls = []
+
+    def counting_soup(*args, **kwargs):
+        calls.append(args)
+        return BeautifulSoup(*args, **kwargs)
+
+    monkeypatch.setattr(extractors.sphinx, "BeautifulSoup", counting_soup)
+    monkeypatch.setattr(extractors.base, "BeautifulSoup", counting_soup)
+
+    config.paths.docs_dir = sphinx_html_file.parent.parent
+    ext = SphinxExtractor(config)
+    section = ext._extract_page(sphinx_html_file, "testproject")
+
+    assert section is not None
+    assert len(calls) == 1
+
+
+def test_extract_page_matches_three_parse_pipeline(config, tmp_path):
+    """Single-parse output is identical to the previous re-parsing pipeline."""
+    from benchmarks.bench_extract_page import legacy_extract_html, make_sphinx_page
+
+    page = tmp_path / "docs" / "proj" / "page.html"
+    page.parent.mkdir(parents=True)
+    page.write_text(make_sphinx_page(5).replace("</h1>", "</h1><p>a <script>x</script> b</p>"))
+
+    config.paths.docs_dir = tmp_path / "docs"
+    ext = SphinxExtractor(config)
+    section = ext._extract_page(page, "proj")
+
+    assert section.html_content == legacy_extract_html(ext, page)
+
+
+@pytest.mark.parametrize("parser", HTML_PARSERS)
+def test_extract_same_sections_on_every_parser(config, tmp_path, fixtures_dir, parser):
+    """Every HTML parser extracts exactly what html.parser does."""
+    if parser not in available_html_parsers():
+        pytest.skip(f"{parser} not installed")
+    from benchmarks.synthetic import make_sphinx_page
+
+    project_dir = tmp_path / "docs" / "transfer"
+    project_dir.mkdir(parents=True)
+    shutil.copy(fixtures_dir / "sample-sphinx.html", project_dir / "index.html")
+    (project_dir / "synthetic.html").write_text(make_sphinx_page(20), encoding="utf-8")
+    config.paths.docs_dir = tmp_path / "docs"
+    config.cache.enabled = False
+
+    expected = [section.to_dict() for section in SphinxExtractor(config).extract()]
+    config.html_parser = parser
+    sections = [section.to_dict() for section in SphinxExtractor(config).extract()]
+
+    assert len(sections) == 2
+    assert sections == expected
+
+
+def test_extract_parallel_matches_sequential_order(config, tmp_path, fixtures_dir):
+    """A process pool returns the same sections in the same order."""
+    docs_dir = tmp_path / "docs"
+    for project in ["transfer", "deploy"]:
+        project_dir = docs_dir / project
+        for subdir in ["readme", "design"]:
+            (project_dir / subdir).mkdir(parents=True)
+            for name in ["b.html", "a.html"]:
+                shutil.copy(fixtures_dir / "sample-sphinx.html", project_dir / subdir / name)
+        shutil.copy(fixtures_dir / "sample-sphinx.html", project_dir / "index.html")
+
+    config.paths.docs_dir = docs_dir
+    # Otherwise the second run is served from the cache without starting workers
+    config.cache.enabled = False
+    sequential = SphinxExtractor(config).extract()
+
+    config.jobs = 2
+    parallel = SphinxExtractor(config).extract()
+
+    assert [s.id for s in parallel] == [s.id for s in sequential]
+    assert [s.html_content for s in parallel] == [s.html_content for s in sequential]
+    assert parallel[0].id == "transfer-index"
+
+
+def test_iter_extract_is_lazy(config, tmp_path, fixtures_dir, monkeypatch):
+    """Each page is extracted only when the consumer asks for it."""
+    project_dir = tmp_path / "docs" / "proj"
+    project_dir.mkdir(parents=True)
+    for name in ["index.html", "a.html", "b.html"]:
+        shutil.copy(fixtures_dir / "sample-sphinx.html", project_dir / name)
+    config.doc_order.projects = ["proj"]
+
+    extracted = []
+    original = SphinxExtractor._extract_keyed
+
+    def extract_keyed(self, html_file, project):
+        extracted.append(html_file.name)
+        return original(self, html_file, project)
+
+    monkeypatch.setattr(SphinxExtractor, "_extract_keyed", extract_keyed)
+    sections = SphinxExtractor(config).iter_extract()
+
+    assert next(sections).id == "proj-index"
+    assert extracted == ["index.html"]
+    assert [section.id for section in sections] == ["proj-a", "proj-b"]
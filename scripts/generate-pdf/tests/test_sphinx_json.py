@@ -0,0 +1,168 @@
+"""Tests for reading Sphinx's json builder output."""
+
+import json
+
+import pytest
+
+from extractors.sphinx import SphinxExtractor, page_uri, resolve_page_link
+
+
+BODY = (
+    '<section id="design"><h1>Design<a class="headerlink" href="#design">¶</a></h1>'
+    '<p>See <a class="reference internal" href="{link}">the architecture</a> and '
+    '<a href="https://example.com">elsewhere</a>.</p><p> </p>'
+    '<img alt="diagram" src="{image}"/></section>'
+)
+
+
+def write_page(json_dir, docname, body="<p>Body</p>", title="Title", next_link=None):
+    page = json_dir / f"{docname}.fjson"
+    page.parent.mkdir(parents=True, exist_ok=True)
+    context = {
+        "body": body,
+        "title": title,
+        "current_page_name": docname,
+        "next": {"link": next_link, "title": "Next"} if next_link else None,
+    }
+    page.write_text(json.dumps(context), encoding="utf-8")
+    return page
+
+
+@pytest.fixture
+def json_config(config):
+    config.docs_source = "json"
+    return config
+
+
+def test_page_uri(tmp_path):
+    assert page_uri(tmp_path / "index.fjson", tmp_path) == ""
+    assert page_uri(tmp_path / "a" / "index.fjson", tmp_path) == "a/"
+    assert page_uri(tmp_path / "a" / "b.fjson", tmp_path) == "a/b/"
+
+
+def test_resolve_page_link(tmp_path):
+    arch = write_page(tmp_path, "proj/design/arch")
+    design = write_page(tmp_path, "proj/design/index")
+    readme = write_page(tmp_path, "proj/readme")
+
+    assert resolve_page_link(design, "arch/#layers", tmp_path) == arch
+    assert resolve_page_link(arch, "../", tmp_path) == design
+    assert resolve_page_link(arch, "../../readme/", tmp_path) == readme
+    assert resolve_page_link(arch, "#layers", tmp_path) is None
+    assert resolve_page_link(arch, "https://example.com/", tmp_path) is None
+    assert resolve_page_link(arch, "../../../../outside/", tmp_path) is None
+    assert resolve_page_link(arch, "../../_downloads/x.zip", tmp_path) is None
+
+
+def test_pages_follow_the_toctree(json_config):
+    """Order comes from the next links, not from directory names."""
+    json_dir = json_config.paths.docs_json_dir
+    json_config.doc_order.projects = ["transfer", "meta"]
+
+    write_page(json_dir, "index", next_link="meta/licensing/")
+    write_page(json_dir, "meta/licensing", next_link="../principles/")
+    write_page(json_dir, "meta/principles")
+    write_page(json_dir, "meta/orphan")
+    write_page(json_dir, "transfer/index", next_link="design/")
+    write_page(json_dir, "transfer/design/index", next_link="arch/")
+    write_page(json_dir, "transfer/design/arch", next_link="../../readme/")
+    write_page(json_dir, "transfer/readme", next_link="../")  # Loops back to the index
+
+    pages = SphinxExtractor(json_config).list_pages()
+
+    assert [(str(path.relative_to(json_dir)), project) for path, project in pages] == [
+        ("transfer/index.fjson", "transfer"),
+        ("transfer/design/index.fjson", "transfer"),
+        ("transfer/design/arch.fjson", "transfer"),
+        ("transfer/readme.fjson", "transfer"),
+        ("meta/licensing.fjson", "meta"),
+        ("meta/principles.fjson", "meta"),
+    ]
+
+
+def test_toctree_walk_reads_each_page_once(json_config, monkeypatch):
+    """Projects share one walk, which stops once it leaves the project."""
+    json_dir = json_config.paths.docs_json_dir
+    json_config.doc_order.projects = ["meta", "transfer"]
+
+    write_page(json_dir, "index", next_link="meta/licensing/")
+    write_page(json_dir, "meta/licensing", next_link="../principles/")
+    write_page(json_dir, "meta/principles", next_link="../transfer/")
+    write_page(json_dir, "transfer/index", next_link="readme/")
+    write_page(json_dir, "transfer/readme", next_link="../later/")
+    write_page(json_dir, "later/index", next_link="../meta/late/")
+    write_page(json_dir, "meta/late")
+
+    read = []
+    original = SphinxExtractor._read_context
+
+    def read_context(self, page):
+        read.append(str(page.relative_to(json_dir)))
+        return original(self, page)
+
+    monkeypatch.setattr(SphinxExtractor, "_read_context", read_context)
+    pages = SphinxExtractor(json_config).list_pages()
+
+    assert [str(path.relative_to(json_dir)) for path, _ in pages] == [
+        "meta/licensing.fjson",
+        "meta/principles.fjson",
+        "transfer/index.fjson",
+        "transfer/readme.fjson",
+    ]
+    assert sorted(read) == sorted(set(read))
+    assert "later/index.fjson" not in read
+
+
+def test_json_page_matches_html_page(config, json_config):
+    """A page read from the json builder extracts like the same page rendered as HTML."""
+    docs_dir = config.paths.docs_dir
+    json_dir = config.paths.docs_json_dir
+    for root in (docs_dir, json_dir):
+        (root / "_images").mkdir(parents=True)
+        (root / "_images" / "diagram.png").write_bytes(b"png")
+
+    html_page = docs_dir / "proj" / "design" / "index.html"
+    html_page.parent.mkdir(parents=True)
+    html_page.write_text(
+        "<!DOCTYPE html><html><head><title>Design</title></head><body>"
+        '<nav class="wy-nav-side">Menu</nav><div role="main" class="document">'
+        + BODY.format(link="arch.html#layers", image="../../_images/diagram.png")
+        + "</div></body></html>",
+        encoding="utf-8",
+    )
+    write_page(json_dir, "proj/design/arch")
+    json_page = write_page(
+        json_dir, "proj/design/index", BODY.format(link="arch/#layers", image="../../_images/diagram.png")
+    )
+
+    config.docs_source = "html"
+    from_html = SphinxExtractor(config)._extract_page(html_page, "proj")
+    config.docs_source = "json"
+    from_json = SphinxExtractor(config)._extract_page(json_page, "proj")
+
+    assert from_json.title == from_html.title == "Design"
+    assert from_json.id == from_html.id == "proj-design-index"
+    assert from_json.html_content == from_html.html_content.replace(str(docs_dir), str(json_dir))
+    assert 'href="#arch#layers"' in from_json.html_content
+
+
+def test_json_page_title_falls_back_to_context(json_config):
+    page = write_page(
+        json_config.paths.docs_json_dir, "proj/notes", title="Notes &amp; <em>caveats</em>"
+    )
+
+    section = SphinxExtractor(json_config)._extract_page(page, "proj")
+
+    assert section.title == "Notes & caveats"
+
+
+def test_json_page_without_body_is_skipped(json_config):
+    page = write_page(json_config.paths.docs_json_dir, "proj/empty", body="")
+
+    assert SphinxExtractor(json_config)._extract_page(page, "proj") is None
+
+
+def test_unknown_docs_source(config):
+    config.docs_source = "xml"
+    with pytest.raises(ValueError, match="Unknown docs source"):
+        SphinxExtractor(config)
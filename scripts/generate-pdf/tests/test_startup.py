@@ -0,0 +1,83 @@
+"""Startup cost of the CLI, measured with `python -X importtime`."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+MODULE_DIR = Path(__file__).resolve().parent.parent
+
+# Modules only the pipeline stages need; none may load before a stage runs
+HEAVY_MODULES = (
+    "weasyprint", "playwright", "pypdf", "PIL", "bs4", "lxml", "html5lib",
+    "markdown", "markdown_it", "mistune", "frontmatter", "watchdog",
+)
+
+# Cumulative import time of main.py, in microseconds. It takes well under
+# 100ms; importing the stage modules eagerly costs several times that even
+# without WeasyPrint installed.
+IMPORT_BUDGET_US = 250_000
+
+
+def import_times(*args: str) -> dict[str, int]:
+    """Run the interpreter with -X importtime; map module -> cumulative µs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=MODULE_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def heavy(modules: dict[str, int]) -> list[str]:
+    return sorted(name for name in modules if name.split(".")[0] in HEAVY_MODULES)
+
+
+def test_importing_main_is_cheap():
+    times = import_times("-c", "import main")
+
+    assert heavy(times) == []
+    assert times["main"] < IMPORT_BUDGET_US
+
+
+def test_help_loads_no_stage_modules():
+    times = import_times("main.py", "--help")
+
+    assert "config" in times
+    assert heavy(times) == []
+
+
+# Runs the CLI until the extraction stage starts: with the extractors
+# package blocked, its first import raises and ends the run there
+RUN_UNTIL_EXTRACTION = """
+import sys
+sys.modules["extractors"] = None
+import main
+try:
+    main.main(["--skip-screenshots"])
+except ImportError:
+    print("reached extraction")
+"""
+
+
+def test_skip_screenshots_run_loads_nothing_before_extraction():
+    """Step 1 of a --skip-screenshots (or cache-hit) run imports no stage dependencies."""
+    times = import_times("-c", RUN_UNTIL_EXTRACTION)
+
+    assert "screenshot" in times
+    assert "pdf_builder" not in times
+    assert heavy(times) == []
+
+
+def test_stage_modules_import_without_optional_dependencies():
+    """Importing the builder and screenshot modules doesn't load WeasyPrint or Playwright."""
+    times = import_times("-c", "import pdf_builder, screenshot, images")
+
+    assert not [name for name in times if name.split(".")[0] in ("weasyprint", "playwright", "PIL")]
@@ -0,0 +1,111 @@
+"""Tests for the streaming (tree-free) page cleaner."""
+
+import random
+import shutil
+
+import pytest
+
+from benchmarks.synthetic import make_sphinx_page
+from config import Selectors
+from extractors.sphinx import SphinxExtractor
+
+
+def extract_both(config, html_file):
+    """Extract a page with the DOM engine and the stream engine."""
+    config.cache.enabled = False
+    dom = SphinxExtractor(config)._extract_page(html_file, "testproject")
+    config.html_engine = "stream"
+    stream = SphinxExtractor(config)._extract_page(html_file, "testproject")
+    config.html_engine = "dom"
+    return dom, stream
+
+
+@pytest.fixture
+def page_file(config, tmp_path):
+    docs_dir = tmp_path / "docs" / "testproject"
+    docs_dir.mkdir(parents=True)
+    (docs_dir / "diagram.png").write_bytes(b"png")
+    config.paths.docs_dir = tmp_path / "docs"
+    return docs_dir / "page.html"
+
+
+def test_matches_dom_engine_on_sample_pages(config, page_file, fixtures_dir):
+    shutil.copy(fixtures_dir / "sample-sphinx.html", page_file)
+    dom, stream = extract_both(config, page_file)
+    assert stream.to_dict() == dom.to_dict()
+
+    page_file.write_text(make_sphinx_page(20), encoding="utf-8")
+    dom, stream = extract_both(config, page_file)
+    assert stream.to_dict() == dom.to_dict()
+
+
+@pytest.mark.parametrize("body", [
+    # Text around a stripped element is merged before whitespace is collapsed...
+    "<p>a <nav>x</nav> b</p>",
+    # ...but text around a removed empty paragraph is not
+    "<div>a <p> </p> b</div>",
+    # Only text whose own parent is <pre>/<code> keeps its whitespace
+    "<pre>  a  <span>  b  </span></pre><code>  c  </code>",
+    # External links get an arrow unless their only text already has one
+    '<a href="https://x.org">x</a><a href="https://x.org">x ↗</a>'
+    '<a href="https://x.org"><b>↗</b> y</a><a href="../other/page.html#s">in</a>',
+    # Collapsed comments turn into text, unchanged ones stay comments
+    "<p>a<!--  b  --><!--c--></p>",
+    # Attributes are sorted, list attributes normalized, and quotes kept valid
+    '<p title=\'say "hi"\' class=" x  y " id="p">&lt;&amp;&gt; &copy;</p>',
+    '<p><img src="diagram.png"><br></br>text</p><p><img src="diagram.png"></p>',
+    "<h2>Unclosed <em>tags",
+])
+def test_matches_dom_engine_on_edge_cases(config, page_file, body):
+    page_file.write_text(
+        f'<html><head><title>Page</title></head><body><div role="main">'
+        f'<h1>Title<a class="headerlink" href="#t">¶</a></h1>{body}</div></body></html>',
+        encoding="utf-8",
+    )
+    dom, stream = extract_both(config, page_file)
+    assert stream.to_dict() == dom.to_dict()
+
+
+def test_matches_dom_engine_on_random_markup(config, page_file):
+    """Seeded random (often malformed) markup, including the fallback content selector."""
+    rng = random.Random(1234)
+    tags = ["div", "p", "span", "a", "pre", "code", "h1", "nav", "b", "img", "br", "td", "title"]
+    attrs = ["", ' class="headerlink"', ' role="main"', ' class="rst-content"',
+             ' href="https://x.org"', ' href="../a/b.html"', ' src="diagram.png"', " disabled"]
+    texts = ["", " ", " \n ", "text", " a  b ", "↗", "&amp;", "a < b", "<!-- c -->", "<br/>"]
+
+    def markup(depth=0):
+        parts = []
+        for _ in range(rng.randint(0, 4)):
+            if rng.random() < 0.4 or depth > 4:
+                parts.append(rng.choice(texts))
+            elif rng.random() < 0.1:
+                parts.append(f"</{rng.choice(tags)}>")
+            else:
+                tag = rng.choice(tags)
+                parts.append(f"<{tag}{rng.choice(attrs)}>{markup(depth + 1)}</{tag}>")
+        return "".join(parts)
+
+    for _ in range(300):
+        page_file.write_text(
+            f"<html><head><title>T</title></head><body>{markup()}</body></html>", encoding="utf-8"
+        )
+        dom, stream = extract_both(config, page_file)
+        assert (stream and stream.to_dict()) == (dom and dom.to_dict())
+
+
+def test_rejects_selectors_that_need_a_tree(config):
+    config.html_engine = "stream"
+    config.selectors = Selectors(strip=("nav", "div > span"))
+    with pytest.raises(ValueError, match="div > span"):
+        SphinxExtractor(config)
+
+    config.selectors = Selectors(content="main p")
+    with pytest.raises(ValueError, match="main p"):
+        SphinxExtractor(config)
+
+
+def test_unknown_engine_rejected(config):
+    config.html_engine = "sax"
+    with pytest.raises(ValueError, match="Unknown HTML engine"):
+        SphinxExtractor(config)
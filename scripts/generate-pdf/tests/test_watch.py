@@ -0,0 +1,162 @@
+"""Tests for watch mode change detection and selective re-extraction."""
+
+import os
+
+import pytest
+
+from benchmarks.synthetic import generate_blog_dir, generate_docs_tree
+from extractors.blog import BlogExtractor
+from extractors.sphinx import SphinxExtractor
+from profiling import NULL_PROFILER
+from watch import ChangeWatcher, WatchSession, diff_snapshots, snapshot
+
+
+class RecordingBuilder:
+    """Records what would be rendered instead of running WeasyPrint."""
+
+    def __init__(self):
+        self.builds = []
+        self.screenshots = []
+
+    def build(self, blog_sections, docs_sections, screenshots, output_path):
+        self.builds.append((blog_sections, docs_sections))
+        self.screenshots.append(screenshots)
+        return output_path
+
+
+class FakeCapture:
+    """Stands in for a ScreenshotCapture with an open browser."""
+
+    def __init__(self, results):
+        self.results = iter(results)
+        self.calls = []
+        self.closed = False
+
+    def capture_sync(self, server_url=None, names=None):
+        self.calls.append((server_url, names))
+        result = next(self.results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def session(config):
+    generate_docs_tree(config.paths.docs_dir, 6)
+    generate_blog_dir(config.paths.blog_dir, 3)
+
+    session = object.__new__(WatchSession)
+    session.config = config
+    session.screenshots = {}
+    session.output_path = config.paths.output_path
+    session.profiler = NULL_PROFILER
+    session.blog_by_path = {}
+    session.docs_by_path = {}
+    session.blog_extractor = BlogExtractor(config)
+    session.sphinx_extractor = SphinxExtractor(config)
+    session.builder = RecordingBuilder()
+    session.capture = None
+    session.server_url = None
+    return session
+
+
+def test_snapshot_diff_reports_added_modified_and_removed(tmp_path):
+    kept, edited, removed = (tmp_path / name for name in ("kept", "edited", "removed"))
+    for path in (kept, edited, removed):
+        path.write_text("a")
+    before = snapshot([tmp_path])
+
+    edited.write_text("changed")
+    removed.unlink()
+    added = tmp_path / "added"
+    added.write_text("new")
+
+    assert diff_snapshots(before, snapshot([tmp_path])) == {edited, removed, added}
+
+
+def test_polling_watcher_debounces_a_burst_into_one_batch(tmp_path):
+    watched = tmp_path / "watched"
+    watched.mkdir()
+    (tmp_path / "ignored.txt").write_text("x")
+
+    with ChangeWatcher([watched], debounce=0.3, poll_interval=0.05, polling=True) as watcher:
+        for i in range(3):
+            (watched / f"post-{i}.mdx").write_text("draft")
+        changed = watcher.wait(timeout=5)
+
+    assert changed == {(watched / f"post-{i}.mdx").resolve() for i in range(3)}
+
+
+def test_only_changed_files_are_re_extracted(session, config, capsys):
+    session.build()
+    first_blog, first_docs = session.builder.builds[-1]
+    assert (len(first_blog), len(first_docs)) == (3, 6)
+
+    post = sorted(config.paths.blog_dir.glob("*.mdx"))[0]
+    post.write_text(post.read_text().replace("Synthetic Post", "Edited Post"))
+    session.build({post})
+
+    assert "Re-extracted 1 blog post(s) and 0 documentation page(s)" in capsys.readouterr().out
+    blog, docs = session.builder.builds[-1]
+    assert sum(section.title.startswith("Edited Post") for section in blog) == 1
+    assert [s.id for s in docs] == [s.id for s in first_docs]
+
+
+def test_deleted_post_is_dropped(session, config):
+    session.build()
+    post = sorted(config.paths.blog_dir.glob("*.mdx"))[0]
+    os.remove(post)
+
+    session.build({post})
+
+    blog, _ = session.builder.builds[-1]
+    assert len(blog) == 2
+
+
+def test_image_change_re_extracts_pages_that_reference_it(session, config, capsys):
+    page = config.paths.docs_dir / "transfer" / "index.html"
+    page.write_text(page.read_text().replace("</h1>", '</h1><img src="_images/late.png">', 1))
+    image = page.parent / "_images" / "late.png"
+    session.build()
+    assert 'src="_images/late.png"' in session.docs_by_path[page].html_content
+
+    image.parent.mkdir()
+    image.write_bytes(b"png")
+    capsys.readouterr()
+    assert session.build({image}) is not None
+
+    assert "Re-extracted 0 blog post(s) and 1 documentation page(s)" in capsys.readouterr().out
+    assert f'src="file://{image}"' in session.docs_by_path[page].html_content
+
+
+def test_unrelated_changes_do_not_rebuild(session, config):
+    session.build()
+    stylesheet = config.paths.docs_dir / "_static" / "theme.css"
+
+    assert session.build({stylesheet}) is None
+    assert len(session.builder.builds) == 1
+
+
+def test_open_browser_re_captures_before_each_rebuild(session, config, tmp_path, capsys):
+    config.screenshot.embedded = ("hero",)
+    first, second = tmp_path / "first.png", tmp_path / "second.png"
+    capture = FakeCapture([{"hero": first}, RuntimeError("dev server down"), {"hero": second}])
+    session.capture = capture
+    session.server_url = "http://localhost:4000"
+    post = sorted(config.paths.blog_dir.glob("*.mdx"))[0]
+
+    session.build()
+    session.build({post})
+    assert "Keeping the previous screenshots" in capsys.readouterr().out
+    session.build({post})
+    # Nothing to rebuild, so nothing to capture
+    session.build({config.paths.docs_dir / "_static" / "theme.css"})
+
+    assert capture.calls == [("http://localhost:4000", ("hero",))] * 3
+    assert session.builder.screenshots == [{"hero": first}, {"hero": first}, {"hero": second}]
+
+    session.close()
+    assert capture.closed and session.capture is None
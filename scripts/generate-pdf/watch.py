@@ -0,0 +1,457 @@
+"""
+Watch mode: rebuild the PDF whenever its sources change.
+
+Watches the blog directory, the built docs and config.py, using inotify
+through watchdog when it is installed and polling file modification times
+otherwise. Bursts of changes (an editor save, a Sphinx rebuild) are
+debounced into one rebuild.
+
+The extractors, the PDF builder and its WeasyPrint FontConfiguration stay
+alive between rebuilds. Only the blog posts and docs pages whose files
+changed are re-extracted, along with the pages that reference a changed
+image, and with pypdf installed the PDF is rebuilt incrementally, so only
+the chunks containing them are re-rendered. A change to config.py reloads
+the configuration and starts over from a full build.
+
+When screenshots are captured, the ScreenshotCapture (its event loop and
+Chromium) also stays open. Each rebuild re-checks the embedded targets
+and re-captures only those whose rendering changed, and the browser is
+closed when watching stops.
+"""
+
+import argparse
+import importlib
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+import config as config_module
+from config import Config
+from extractors.base import BaseExtractor, ContentSection
+from extractors.blog import BlogExtractor
+from extractors.sphinx import SphinxExtractor
+from incremental import PYPDF_AVAILABLE, IncrementalPDFBuilder
+from pdf_builder import PDFBuilder
+from profiling import NULL_PROFILER, Profiler
+
+if TYPE_CHECKING:
+    from screenshot import ScreenshotCapture
+
+
+# Quiet period that ends a burst of changes
+DEBOUNCE_SECONDS = 0.3
+
+# How often the polling fallback rescans the watched paths
+POLL_INTERVAL_SECONDS = 1.0
+
+CONFIG_PATH = Path(config_module.__file__).resolve()
+
+
+def snapshot(paths: list[Path]) -> dict[Path, tuple[int, int]]:
+    """Map every file under the given files/directories to (mtime_ns, size)."""
+    files = {}
+    for root in paths:
+        if root.is_file():
+            try:
+                stat = root.stat()
+            except OSError:
+                continue
+            files[root] = (stat.st_mtime_ns, stat.st_size)
+            continue
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def diff_snapshots(
+    before: dict[Path, tuple[int, int]],
+    after: dict[Path, tuple[int, int]],
+) -> set[Path]:
+    """Return files that were added, removed or modified between snapshots."""
+    return {
+        path for path in before.keys() | after.keys()
+        if before.get(path) != after.get(path)
+    }
+
+
+class ChangeWatcher:
+    """Collect changed files under a set of watched files and directories."""
+
+    def __init__(
+        self,
+        paths: list[Path],
+        debounce: float = DEBOUNCE_SECONDS,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        polling: bool = False,
+    ):
+        self.paths = [path.resolve() for path in paths]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.backend = "polling" if polling or not WATCHDOG_AVAILABLE else "inotify"
+
+        self._changes: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._observer = None
+        self._poller: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ChangeWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def is_watched(self, path: Path) -> bool:
+        """Whether a path is one of the watched files or inside a watched directory."""
+        return any(path == root or root in path.parents for root in self.paths)
+
+    def start(self) -> None:
+        if self.backend == "polling":
+            # Snapshot before returning so changes made right after start() count
+            initial = snapshot(self.paths)
+            self._poller = threading.Thread(target=self._poll, args=(initial,), daemon=True)
+            self._poller.start()
+            return
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                for attr in ("src_path", "dest_path"):
+                    path = getattr(event, attr, "")
+                    if path:
+                        watcher._report(Path(os.fsdecode(path)))
+
+        self._observer = Observer()
+        handler = Handler()
+        for root in self.paths:
+            if root.is_dir():
+                self._observer.schedule(handler, str(root), recursive=True)
+            elif root.parent.is_dir():
+                # Files are watched through their directory, then filtered
+                self._observer.schedule(handler, str(root.parent), recursive=False)
+        self._observer.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._poller:
+            self._poller.join()
+            self._poller = None
+
+    def _report(self, path: Path) -> None:
+        if self.is_watched(path):
+            self._changes.put(path)
+
+    def _poll(self, previous: dict[Path, tuple[int, int]]) -> None:
+        while not self._stop.wait(self.poll_interval):
+            current = snapshot(self.paths)
+            for path in diff_snapshots(previous, current):
+                self._report(path)
+            previous = current
+
+    def wait(self, timeout: Optional[float] = None) -> set[Path]:
+        """Block until files change, then return them once changes settle.
+
+        Returns an empty set if nothing changed within `timeout` seconds.
+        """
+        try:
+            changed = {self._changes.get(timeout=timeout)}
+        except queue.Empty:
+            return set()
+
+        while True:
+            try:
+                changed.add(self._changes.get(timeout=self.debounce))
+            except queue.Empty:
+                return changed
+
+
+class WatchSession:
+    """Warm extractors and builder that rebuild the PDF from changed files."""
+
+    def __init__(
+        self,
+        config: Config,
+        screenshots: dict[str, Path],
+        output_path: Path,
+        draft: bool = False,
+        offline: bool = False,
+        profiler: Optional[Profiler] = None,
+        capture: Optional["ScreenshotCapture"] = None,
+        server_url: Optional[str] = None,
+    ):
+        self.config = config
+        self.screenshots = screenshots
+        self.output_path = output_path
+        self.draft = draft
+        self.offline = offline
+        self.profiler = profiler or NULL_PROFILER
+        # Open browser that re-captures the screenshots before each build
+        self.capture = capture
+        self.server_url = server_url
+
+        # Source file -> extracted section (None if extraction failed)
+        self.blog_by_path: dict[Path, Optional[ContentSection]] = {}
+        self.docs_by_path: dict[Path, Optional[ContentSection]] = {}
+
+        self._create_workers()
+
+    def _create_workers(self) -> None:
+        self.blog_extractor = BlogExtractor(self.config, self.profiler)
+        self.sphinx_extractor = SphinxExtractor(self.config, self.profiler)
+
+        builder_class = IncrementalPDFBuilder if PYPDF_AVAILABLE else PDFBuilder
+        self.builder = builder_class(
+            self.config, draft=self.draft, offline=self.offline, profiler=self.profiler
+        )
+
+    def watch_paths(self) -> list[Path]:
+        """Files and directories whose changes trigger a rebuild."""
+        return [self.config.paths.blog_dir, self.sphinx_extractor.source_dir, CONFIG_PATH]
+
+    def reload_config(self) -> None:
+        """Re-import config.py and recreate everything that depends on it."""
+        importlib.reload(config_module)
+        config = config_module.Config()
+
+        # Keep the command line overrides
+        config.verbose = self.config.verbose
+        config.jobs = self.config.jobs
+        config.render_jobs = self.config.render_jobs
+        config.cache.enabled = self.config.cache.enabled
+
+        self.config = config
+        if self.capture is not None:
+            self.capture.config = config
+        self.blog_by_path.clear()
+        self.docs_by_path.clear()
+        self._create_workers()
+
+    def build(self, changed: Optional[set[Path]] = None) -> Optional[Path]:
+        """Re-extract what changed (everything if `changed` is None) and rebuild.
+
+        Returns the PDF path, or None when none of the changes affect it.
+        """
+        if changed is not None:
+            changed = {path.resolve() for path in changed}
+            if CONFIG_PATH in changed:
+                print("   config.py changed, reloading configuration")
+                self.reload_config()
+                changed = None
+
+        if changed is None:
+            blog_changed = docs_changed = None
+        else:
+            blog_changed = self._under(changed, self.config.paths.blog_dir, ".mdx")
+            docs_changed = self._under(
+                changed, self.sphinx_extractor.source_dir, self.sphinx_extractor.source_suffix
+            ) | self._referencing(changed, self.docs_by_path)
+            if not blog_changed and not docs_changed:
+                return None
+
+        posts = [(path,) for path in self._list_posts()]
+        self.blog_by_path, blog_count = self._refresh(
+            self.blog_extractor, "_extract_post", posts, self.blog_by_path, blog_changed
+        )
+        docs_exist = self.sphinx_extractor.source_dir.exists()
+        pages = self.sphinx_extractor.list_pages() if docs_exist else []
+        self.docs_by_path, docs_count = self._refresh(
+            self.sphinx_extractor, "_extract_page", pages, self.docs_by_path, docs_changed
+        )
+        print(f"   Re-extracted {blog_count} blog post(s) and {docs_count} documentation page(s)")
+
+        blog_sections = self.blog_extractor.sort_posts(
+            [section for section in self.blog_by_path.values() if section]
+        )
+        docs_sections = [section for section in self.docs_by_path.values() if section]
+
+        self._capture_screenshots()
+
+        return self.builder.build(
+            blog_sections, docs_sections, self.screenshots, self.output_path
+        )
+
+    def close(self) -> None:
+        """Shut down the screenshot browser, if one is open."""
+        if self.capture is not None:
+            self.capture.close()
+            self.capture = None
+
+    def _capture_screenshots(self) -> None:
+        """Re-capture the embedded targets whose rendering changed."""
+        if self.capture is None:
+            return
+        try:
+            with self.profiler.stage("screenshots"):
+                self.screenshots = self.capture.capture_sync(
+                    self.server_url, self.config.screenshot.embedded
+                )
+        except RuntimeError as e:
+            print(f"   Screenshot error: {e}")
+            print("   Keeping the previous screenshots...")
+
+    def _list_posts(self) -> list[Path]:
+        if not self.config.paths.blog_dir.exists():
+            return []
+        return self.blog_extractor.list_posts()
+
+    @staticmethod
+    def _under(changed: set[Path], root: Path, suffix: str) -> set[Path]:
+        root = root.resolve()
+        return {path for path in changed if path.suffix == suffix and root in path.parents}
+
+    @staticmethod
+    def _referencing(
+        changed: set[Path], sections: dict[Path, Optional[ContentSection]]
+    ) -> set[Path]:
+        """Source files whose sections reference a changed file (an image)."""
+        return {
+            path.resolve()
+            for path, section in sections.items()
+            if section and any(image.resolve() in changed for image in section.images)
+        }
+
+    @staticmethod
+    def _refresh(
+        extractor: BaseExtractor,
+        method_name: str,
+        items: list[tuple],
+        previous: dict[Path, Optional[ContentSection]],
+        changed: Optional[set[Path]],
+    ) -> tuple[dict[Path, Optional[ContentSection]], int]:
+        """Re-extract stale items and reuse the rest, keeping `items` order.
+
+        Items are argument tuples for `method_name` whose first element is
+        the source path. Returns the new path -> section map and how many
+        items were re-extracted.
+        """
+        stale = [
+            item for item in items
+            if changed is None or item[0].resolve() in changed or item[0] not in previous
+        ]
+        fresh = dict(zip(
+            (item[0] for item in stale),
+            extractor.map_jobs(method_name, stale),
+        ))
+        if stale:
+            extractor.cache.evict()
+
+        sections = {
+            item[0]: fresh[item[0]] if item[0] in fresh else previous[item[0]]
+            for item in items
+        }
+        return sections, len(stale)
+
+
+def run_watch(
+    args: argparse.Namespace,
+    config: Config,
+    profiler: Profiler,
+    screenshots: dict[str, Path],
+    capture: Optional["ScreenshotCapture"] = None,
+) -> int:
+    """Build once, then rebuild on every change until interrupted.
+
+    The session takes over `capture` and closes it when watching stops.
+    """
+    print("\n2. Building PDF (watch mode)...")
+    try:
+        session = WatchSession(
+            config,
+            screenshots,
+            args.output or config.paths.output_path,
+            draft=args.draft,
+            offline=args.offline,
+            profiler=profiler,
+            capture=capture,
+            server_url=args.server_url,
+        )
+    except Exception as e:
+        if capture is not None:
+            capture.close()
+        print(f"\nError building PDF: {e}")
+        if config.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+    try:
+        return _watch(session, profiler)
+    finally:
+        session.close()
+
+
+def _watch(session: WatchSession, profiler: Profiler) -> int:
+    """Run the first build and the rebuild loop of a watch session."""
+    try:
+        with profiler.stage("watch build"):
+            result_path = session.build()
+    except Exception as e:
+        print(f"\nError building PDF: {e}")
+        if session.config.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+    print(f"   PDF generated at: {result_path}")
+
+    watcher = ChangeWatcher(session.watch_paths())
+    watcher.start()
+    print(f"\nWatching for changes ({watcher.backend}). Press Ctrl+C to stop.")
+
+    try:
+        while True:
+            changed = watcher.wait()
+            if not changed:
+                continue
+
+            print(f"\n{len(changed)} file(s) changed, rebuilding...")
+            start = time.perf_counter()
+            try:
+                with profiler.stage("watch rebuild"):
+                    result_path = session.build(changed)
+            except Exception as e:
+                print(f"   Error rebuilding PDF: {e}")
+                if session.config.verbose:
+                    import traceback
+                    traceback.print_exc()
+                continue
+
+            if result_path is None:
+                print("   No changes affecting the PDF")
+            else:
+                print(f"   Rebuilt {result_path} in {time.perf_counter() - start:.1f}s")
+
+            # The docs or blog location may have moved with a config change
+            if [path.resolve() for path in session.watch_paths()] != watcher.paths:
+                watcher.close()
+                watcher = ChangeWatcher(session.watch_paths())
+                watcher.start()
+
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+        return 0
+
+    finally:
+        watcher.close()